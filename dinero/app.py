@@ -8,7 +8,8 @@ and provides various features including:
     1. Stock Performance Overview: Allows users to visualize
         the stock performance of selected companies.
     2. Explore Stock Technical Indicators: Provides insights into
-        technical indicators such as Moving Average, RSI, ROC, and BBP.
+        technical indicators such as Moving Average, RSI, ROC, BBP,
+        EMA, MACD, ATR, Stochastic and VWAP.
     3. Latest News Headlines and Articles: Displays news headlines
         related to selected stocks and their sentiment analysis.
     4. Explore More Tickers or Update Data: Allows users to add
@@ -27,8 +28,13 @@ import pandas as pd
 
 from backend.visualization import plot_stock_price
 from backend.visualization import plot_kpis
+from backend.visualization import plot_indicator_view
+from backend.visualization import get_view_start_date, TIME_BUTTONS
+from backend.indicator_registry import list_indicators
 from backend.stock_data_manager import (
     download_stock_data,
+    bulk_download_stock_data,
+    parse_ticker_symbols,
     update_stock_data,
     get_existing_tickers,
     get_last_n_days
@@ -88,7 +94,33 @@ kpi_description_mapping = {
             {HIGHLIGHT_COLOR_BLUE}'><i> hinting at oversold conditions</i></span>.
             Conversely, values close to 100 indicate the price is near the upper
             band, potentially <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>
-            suggesting overbought conditions.</i></span>'''
+            suggesting overbought conditions.</i></span>''',
+    "EMA": f'''The <span style='color:{NEGATIVE_COLOR}'><b>Exponential Moving Average
+            (EMA)</b></span> is a moving average that <span style='color:{HIGHLIGHT_COLOR_BLUE}'>
+            <i>gives more weight to the latest prices,</i></span> so it
+            <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>reacts faster to new trends</i></span>
+            than the simple Moving Average of the same length.''',
+    "MACD": f'''The <span style='color:{NEGATIVE_COLOR}'><b>Moving Average Convergence Divergence
+            (MACD)</b></span> is the difference between a <span style='color:{HIGHLIGHT_COLOR_BLUE}'>
+            <i>fast and a slow EMA</i></span> (12 and 26 days for a length of 12).
+            Its <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>signal line</i></span> is a 9 day EMA of
+            the MACD, and the <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>histogram</i></span> is the
+            gap between the two: it shows <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>how momentum
+            is building or fading.</i></span>''',
+    "ATR": f'''The <span style='color:{NEGATIVE_COLOR}'><b>Average True Range (ATR)</b></span>
+            measures <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>how much a stock
+            typically moves in a day,</i></span> gaps from the previous close included.
+            A <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>higher ATR means higher
+            volatility.</i></span>''',
+    "STOCH": f'''The <span style='color:{NEGATIVE_COLOR}'><b>Stochastic Oscillator
+            (STOCH)</b></span> tells you <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>where the close sits within the
+            highest high and lowest low</i></span> of the period, from 0 to 100. The
+            %D line is a 3 day average of %K that <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>smooths
+            out the noise.</i></span>''',
+    "VWAP": f'''The <span style='color:{NEGATIVE_COLOR}'><b>Volume Weighted Average Price
+            (VWAP)</b></span> is the <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>average price of the
+            period weighted by the traded volume,</i></span> so days with
+            <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>heavy trading count more.</i></span>'''
 }
 
 kpi_chart_info_mapping = {
@@ -136,7 +168,30 @@ kpi_chart_info_mapping = {
         {HIGHLIGHT_COLOR_BLUE}'><i> oversold condition.</i></span>
         Values <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>close to
         0.5</i></span> suggest the price is near the middle band, indicating a
-        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i> lack of strong trend.</i></span>'''
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i> lack of strong trend.</i></span>''',
+"EMA": f'''As with the Moving Average, a <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>price above
+        the EMA</i></span> suggests an <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>upward
+        trend</i></span> and a price below it a downtrend. The EMA turns
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>sooner</i></span> when the trend changes.''',
+"MACD": f'''A <span style='color:{NEGATIVE_COLOR}'><b>MACD</b></span> crossing
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>above its signal line</i></span> (histogram turning
+        positive) can signal a <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>potential buy,</i></span>
+        crossing <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>below it</i></span> a
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>potential sell.</i></span>''',
+"ATR": f'''An <span style='color:{NEGATIVE_COLOR}'><b>ATR</b></span> value is in price units:
+        a <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>rising ATR</i></span> means
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>larger daily swings,</i></span> a falling one a
+        calmer market. It says nothing about the direction of the price.''',
+"STOCH": f'''A <span style='color:{NEGATIVE_COLOR}'><b>Stochastic</b></span> value
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>above 80</i></span> can indicate an
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>overbought stock,</i></span> a value
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>below 20</i></span> an
+        <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>oversold one.</i></span> %K crossing %D is
+        often read as a change of momentum.''',
+"VWAP": f'''A price <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>above the VWAP</i></span>
+        means the stock trades <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>higher than most of the recent
+        volume,</i></span> a sign of strength; <span style='color:{HIGHLIGHT_COLOR_BLUE}'><i>below
+        it,</i></span> a sign of weakness.'''
 }
 
 st.image("frontend/logo.png", use_column_width=True)
@@ -225,7 +280,7 @@ with tab2:
                 LEVERAGING TECHNICAL INDICATORS</h2>''', unsafe_allow_html=True)
     col1, col2 = st.columns(2)
     with col1:
-        kpi_name = st.selectbox('Select Technical Indicator', ('MA', 'RSI', 'ROC', 'BBP'))
+        kpi_name = st.selectbox('Select Technical Indicator', list_indicators())
         with st.expander(f"🛈 More about {kpi_name}"):
             st.markdown(kpi_description_mapping[kpi_name], unsafe_allow_html=True)
 
@@ -238,8 +293,10 @@ with tab2:
                             <b>number of days</b></span> over which the KPI is
                             calculated.''', unsafe_allow_html=True)
 
+        view = st.selectbox('Select Time Range', [button['label'] for button in TIME_BUTTONS])
 
-    fig_kpi = plot_kpis(fig_price, company_option, length, kpi_name)
+    fig_kpi = plot_kpis(fig_price, company_option, length, kpi_name,
+                        get_view_start_date(company_option, view))
 
     if fig_kpi:
         st.plotly_chart(fig_kpi, use_container_width=True)
@@ -249,6 +306,11 @@ with tab2:
     with st.expander("🛈 What do These Numbers Mean?"):
         st.markdown(kpi_chart_info_mapping[kpi_name], unsafe_allow_html=True)
 
+    compared_kpis = st.multiselect('Compare Technical Indicators', list_indicators())
+    if compared_kpis:
+        st.plotly_chart(plot_indicator_view(company_option, length, compared_kpis),
+                        use_container_width=True)
+
 # Tab 3: Latest News Headlines and Articles
 with tab3:
     st.markdown(f'''<h2 style='color:{HEADING_COLOR}; text-align:
@@ -361,3 +423,20 @@ with tab4:
             download_stock_data(selected_ticker, selected_time)
     if st.button("🔁 Click to Update Ticker Data to the Most Recent"):
         update_stock_data()
+
+    st.markdown('<hr class="horizontal-line">', unsafe_allow_html=True)
+    bulk_tickers = st.text_area('''📋 Bulk Import Tickers (separated by commas,
+                                spaces or new lines)''')
+    bulk_file = st.file_uploader('...or upload a ticker list file', type=['txt', 'csv'])
+
+    if st.button("📥 Import Ticker List"):
+        bulk_symbols = parse_ticker_symbols(bulk_tickers)
+        if bulk_file is not None:
+            bulk_symbols += parse_ticker_symbols(bulk_file.getvalue().decode('utf-8'),
+                                                 bulk_file.name.lower().endswith('.csv'))
+        import_report = bulk_download_stock_data(list(dict.fromkeys(bulk_symbols)),
+                                                 selected_time.lower() or '5y')
+        number_imported = (import_report['Status'] == 'success').sum()
+        st.write(f'''<h5 style='color:{TITLE_COLOR};'>Imported {number_imported}
+                 of {len(import_report)} tickers.</h5>''', unsafe_allow_html=True)
+        st.dataframe(import_report, use_container_width=True)
@@ -0,0 +1,44 @@
+"""
+atomic_file module: atomic replacement of files written by several processes.
+
+A file is first written to a temporary file with a unique name in its folder,
+then moved over the destination in one rename. Readers see either the old or
+the new file, and concurrent writers never write, move or remove each other's
+temporary files: the last rename wins.
+
+Functions:
+    1. atomic_replace(file_path, write_function, suffix='.tmp')
+"""
+import os
+import tempfile
+
+# Permissions of the new files, as open() would create them (mkstemp uses 0600).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_replace(file_path, write_function, suffix='.tmp'):
+    """
+    Function to write a file through write_function(temporary_path), then move
+    it over file_path.
+
+    Parameters:
+    file_path (str): path of the file to replace.
+    write_function (callable): writes the new content to the path it is given.
+    suffix (str, optional): suffix of the temporary file, for writers that
+                            choose the format from the extension. Defaults to '.tmp'.
+
+    Exceptions:
+    the exceptions of write_function and OSError; the temporary file is removed.
+    """
+    descriptor, temporary_path = tempfile.mkstemp(
+        suffix=suffix, prefix=f'.{os.path.basename(file_path)}.',
+        dir=os.path.dirname(file_path) or os.curdir)
+    os.close(descriptor)
+    try:
+        os.chmod(temporary_path, 0o666 & ~_UMASK)
+        write_function(temporary_path)
+        os.replace(temporary_path, file_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
@@ -0,0 +1,264 @@
+"""
+backtest module: evaluate threshold strategies on technical indicators.
+
+A strategy trades one ticker, long or flat, from the signal of one indicator:
+it enters when the signal crosses an entry threshold and holds the position
+until the signal crosses the exit threshold. With entry_when='below' it enters
+when the signal falls below entry and exits when it rises above exit (mean
+reversion, e.g. RSI 30 / 70); with entry_when='above' the comparisons are
+reversed (momentum, e.g. ROC above 0). The signal is the indicator itself, or
+for the indicators drawn over the price (MA, EMA, VWAP) the distance of the
+close from it in percent.
+
+Positions are decided on the close and earn the next day's return. Parameter
+sweeps keep every combination of length, entry and exit as one column of 2D
+(rows, combinations) arrays, so positions and metrics are computed with array
+operations instead of one loop per combination. Tickers are swept in a
+process pool.
+
+Functions:
+    1. threshold_positions(signal, entry_threshold, exit_threshold, entry_when='below')
+    2. compute_metrics(close, positions, cost=0.0)
+    3. run_backtest(ticker_symbol, indicator, length, entry_threshold, exit_threshold,
+                    entry_when='below', cost=0.0)
+    4. sweep_parameters(ticker_symbols, indicator, lengths, entry_thresholds,
+                        exit_thresholds, entry_when='below', cost=0.0, max_workers=None)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from backend.indicator_registry import compute_indicators, get_indicator
+from backend.kpi_manager import SUPPORTED_INDICATORS, get_technical_indicators
+from backend.stock_data_manager import get_stock_data
+
+TRADING_DAYS_PER_YEAR = 252
+# Number of parameter combinations evaluated together, bounding the size of the 2D arrays.
+BACKTEST_BLOCK_COLUMNS = 2048
+# Number of worker processes of sweep_parameters, one per core by default.
+BACKTEST_MAX_WORKERS = os.cpu_count() or 1
+METRIC_COLUMNS = ('Total Return', 'Max Drawdown', 'Sharpe', 'Hit Rate', 'Trades')
+
+
+def threshold_positions(signal, entry_threshold, exit_threshold, entry_when='below'):
+    """
+    Function to turn an indicator signal into positions with entry and exit thresholds.
+
+    Parameters:
+    signal (np.ndarray): signal of shape (rows,) or (rows, combinations).
+    entry_threshold (float or np.ndarray): entry threshold, or one per combination.
+    exit_threshold (float or np.ndarray): exit threshold, or one per combination.
+    entry_when (str): 'below' enters when signal < entry_threshold and exits when
+                      signal > exit_threshold, 'above' enters when signal > entry_threshold
+                      and exits when signal < exit_threshold. Defaults to 'below'.
+
+    Returns:
+    np.ndarray: positions (1 long, 0 flat) with the shape of signal broadcast
+    against the thresholds. A row meeting both conditions enters; NaN signals
+    keep the previous position.
+
+    Exceptions:
+    ValueError if entry_when is not 'below' or 'above'.
+    """
+    if entry_when not in ('below', 'above'):
+        raise ValueError("entry_when must be 'below' or 'above'.")
+    signal = np.asarray(signal, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        if entry_when == 'below':
+            enters, exits = signal < entry_threshold, signal > exit_threshold
+        else:
+            enters, exits = signal > entry_threshold, signal < exit_threshold
+    # 1 on entries, 0 on exits, -1 when nothing happens; each row then takes the
+    # state of the latest event, found with a running maximum of event row numbers
+    events = np.where(enters, 1, np.where(exits, 0, -1)).astype(np.int8)
+    rows = np.arange(len(events)).reshape((-1,) + (1,) * (events.ndim - 1))
+    latest = np.maximum.accumulate(np.where(events >= 0, rows, -1), axis=0)
+    positions = np.take_along_axis(events, np.maximum(latest, 0), axis=0)
+    return np.where(latest >= 0, positions, 0).astype(np.float64)
+
+
+def _strategy_returns(close, positions, cost):
+    """
+    Return the positions held on each row (the previous row's decision), their
+    changes from the previous row and the daily returns of the strategy net of
+    trading costs.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    returns = np.zeros(close.shape)
+    returns[1:] = close[1:] / close[:-1] - 1
+    returns = np.nan_to_num(returns).reshape((-1,) + (1,) * (positions.ndim - 1))
+
+    held = np.zeros(positions.shape)
+    held[1:] = positions[:-1]
+    changes = np.diff(held, axis=0, prepend=0.0)
+    return held, changes, held * returns - cost * np.abs(changes)
+
+
+def compute_metrics(close, positions, cost=0.0):
+    """
+    Function to compute the performance of positions held on a price series.
+
+    Parameters:
+    close (np.ndarray): closing prices of shape (rows,).
+    positions (np.ndarray): positions of shape (rows,) or (rows, combinations),
+                            the position of a row earning the return of the next one.
+    cost (float): cost of a trade as a fraction of the traded value. Defaults to 0.
+
+    Returns:
+    dict: 'Total Return' (compounded), 'Max Drawdown' (most negative fall from a
+    peak of the equity), 'Sharpe' (annualized, NaN without variation), 'Hit Rate'
+    (share of invested days with a positive return, NaN if never invested) and
+    'Trades' (number of entries), each a float or an array per combination.
+    """
+    held, changes, strategy = _strategy_returns(close, positions, cost)
+    equity = np.cumprod(1 + strategy, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+    deviation = strategy.std(axis=0, ddof=1) if len(strategy) > 1 else np.zeros(held.shape[1:])
+    invested = held != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(deviation > 0, strategy.mean(axis=0) / deviation, np.nan)
+        hit_rate = ((strategy > 0) & invested).sum(axis=0) / invested.sum(axis=0)
+    return {'Total Return': equity[-1] - 1 if len(equity) else np.zeros(held.shape[1:]),
+            'Max Drawdown': drawdown.min(axis=0, initial=0.0),
+            'Sharpe': sharpe * np.sqrt(TRADING_DAYS_PER_YEAR),
+            'Hit Rate': hit_rate,
+            'Trades': (changes > 0).sum(axis=0)}
+
+
+def _indicator_signals(stock_data, indicator, lengths):
+    """Return the (rows, lengths) signals of an indicator, one column per length."""
+    spec = get_indicator(indicator)
+    if indicator in SUPPORTED_INDICATORS:
+        # one pass over the closes for every length, with the indicator_kernels
+        values = get_technical_indicators(stock_data, [indicator], lengths)
+    else:
+        values = compute_indicators(stock_data, [(indicator, length) for length in lengths])
+    signals = values[[f'{spec.outputs[0]}_{length}' for length in lengths]].to_numpy(np.float64)
+    if spec.overlay:
+        close = stock_data['Close'].to_numpy(np.float64).reshape(-1, 1)
+        signals = (close / signals - 1) * 100
+    return signals
+
+
+def _load_prices(ticker_symbol, indicator):
+    """Load the columns needed by an indicator and return them with the closes."""
+    stock_data = get_stock_data(ticker_symbol, columns=list(get_indicator(indicator).inputs))
+    return stock_data, stock_data['Close'].to_numpy(np.float64)
+
+
+def run_backtest(ticker_symbol, indicator, length, entry_threshold, exit_threshold, # pylint: disable=too-many-arguments
+                 entry_when='below', cost=0.0):
+    """
+    Function to backtest one threshold strategy on a ticker.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol.
+    indicator (str): name of a registered indicator, e.g. 'RSI'.
+    length (int): The length of timeframe (in days) of the indicator.
+    entry_threshold (float): entry threshold of the signal.
+    exit_threshold (float): exit threshold of the signal.
+    entry_when (str): 'below' or 'above', see threshold_positions. Defaults to 'below'.
+    cost (float): cost of a trade as a fraction of the traded value. Defaults to 0.
+
+    Returns:
+    tuple: (metrics, history) where metrics is the dict of compute_metrics and
+    history a pd.DataFrame with 'Date', 'Close', 'Signal', 'Position' and 'Equity'.
+
+    Exceptions:
+    TypeError if ticker_symbol is not a string
+    ValueError if ticker not in database, the indicator is not registered
+        or entry_when is invalid.
+    """
+    stock_data, close = _load_prices(ticker_symbol, indicator)
+    signal = _indicator_signals(stock_data, indicator, [int(length)])[:, 0]
+    positions = threshold_positions(signal, entry_threshold, exit_threshold, entry_when)
+    metrics = {name: float(value) for name, value in
+               compute_metrics(close, positions, cost).items()}
+    equity = np.cumprod(1 + _strategy_returns(close, positions, cost)[2])
+    history = pd.DataFrame({'Date': stock_data['Date'], 'Close': close, 'Signal': signal,
+                            'Position': positions, 'Equity': equity})
+    return metrics, history
+
+
+def _parameter_grid(lengths, entry_thresholds, exit_thresholds):
+    """Return the length, entry and exit of every combination, lengths varying slowest."""
+    grid = np.meshgrid(np.arange(len(lengths)), entry_thresholds, exit_thresholds,
+                       indexing='ij')
+    return [axis.ravel() for axis in grid]
+
+
+def _sweep_ticker(ticker_symbol, indicator, lengths, entry_thresholds, exit_thresholds, # pylint: disable=too-many-arguments,too-many-locals
+                  entry_when, cost):
+    """Backtest every combination of the grid on one ticker, in blocks of columns."""
+    stock_data, close = _load_prices(ticker_symbol, indicator)
+    signals = _indicator_signals(stock_data, indicator, lengths)
+    length_index, entry_grid, exit_grid = _parameter_grid(lengths, entry_thresholds,
+                                                          exit_thresholds)
+
+    metrics = {name: np.empty(len(length_index)) for name in METRIC_COLUMNS}
+    for start in range(0, len(length_index), BACKTEST_BLOCK_COLUMNS):
+        block = slice(start, start + BACKTEST_BLOCK_COLUMNS)
+        positions = threshold_positions(signals[:, length_index[block]], entry_grid[block],
+                                        exit_grid[block], entry_when)
+        for name, values in compute_metrics(close, positions, cost).items():
+            metrics[name][block] = values
+
+    result = pd.DataFrame({'Ticker': ticker_symbol.upper(),
+                           'Length': np.asarray(lengths)[length_index],
+                           'Entry': entry_grid, 'Exit': exit_grid, **metrics})
+    result['Trades'] = result['Trades'].astype(int)
+    return result
+
+
+def sweep_parameters(ticker_symbols, indicator, lengths, entry_thresholds, exit_thresholds, # pylint: disable=too-many-arguments
+                     entry_when='below', cost=0.0, max_workers=None):
+    """
+    Function to backtest every combination of lengths, entry and exit thresholds
+    on several tickers.
+
+    Parameters:
+    ticker_symbols (list): ticker symbol strings.
+    indicator (str): name of a registered indicator, e.g. 'RSI'.
+    lengths (list): indicator lengths (in days).
+    entry_thresholds (list): entry thresholds.
+    exit_thresholds (list): exit thresholds.
+    entry_when (str): 'below' or 'above', see threshold_positions. Defaults to 'below'.
+    cost (float): cost of a trade as a fraction of the traded value. Defaults to 0.
+    max_workers (int, optional): worker processes. Defaults to None
+                                 (BACKTEST_MAX_WORKERS); 1 sweeps in this process.
+
+    Returns:
+    pd.DataFrame: one row per ticker and combination with 'Ticker', 'Length',
+    'Entry', 'Exit', 'Total Return', 'Max Drawdown', 'Sharpe', 'Hit Rate' and
+    'Trades', in the order of the tickers then lengths, entry and exit thresholds.
+
+    Exceptions:
+    TypeError if a ticker symbol is not a string
+    ValueError if a ticker is not in database, the indicator is not registered,
+        entry_when is invalid or a length is not a positive integer.
+    """
+    if entry_when not in ('below', 'above'):
+        raise ValueError("entry_when must be 'below' or 'above'.")
+    get_indicator(indicator)
+    lengths = [int(length) for length in lengths]
+    if any(length < 1 for length in lengths):
+        raise ValueError("length must be a positive integer.")
+    arguments = (repeat(indicator), repeat(lengths),
+                 repeat(np.asarray(entry_thresholds, dtype=np.float64)),
+                 repeat(np.asarray(exit_thresholds, dtype=np.float64)),
+                 repeat(entry_when), repeat(cost))
+
+    tickers = list(ticker_symbols)
+    max_workers = BACKTEST_MAX_WORKERS if max_workers is None else max_workers
+    if max_workers <= 1 or len(tickers) <= 1:
+        results = list(map(_sweep_ticker, tickers, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_sweep_ticker, tickers, *arguments))
+    if not results:
+        return pd.DataFrame(columns=['Ticker', 'Length', 'Entry', 'Exit', *METRIC_COLUMNS])
+    return pd.concat(results, ignore_index=True)
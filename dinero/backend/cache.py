@@ -0,0 +1,130 @@
+"""
+cache module: bounded, thread-safe in-process LRU cache.
+
+Entries are evicted in least-recently-used order once the total estimated
+size of the cached values exceeds `max_bytes`.
+
+Classes:
+    1. LRUCache(max_bytes)
+
+Functions:
+    1. estimate_size(value)
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_size(value):
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Parameters:
+    value: pd.DataFrame, pd.Series, np.ndarray or any python object.
+
+    Returns:
+    int: estimated size in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by the total size of its values.
+
+    Parameters:
+    max_bytes (int): size budget of the cache. A single value larger than the
+                     budget is never stored.
+
+    Example:
+    >> cache = LRUCache(max_bytes=2**20)
+    >> cache.put(('AAPL', 1), data)
+    >> cache.get(('AAPL', 1))
+    """
+
+    def __init__(self, max_bytes):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be a non-negative integer.")
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the value cached under key (marking it recently used), default otherwise."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        """Cache value under key, evicting least recently used entries if needed."""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, predicate):
+        """
+        Remove every entry whose key satisfies predicate.
+
+        Returns:
+        int: number of removed entries.
+        """
+        with self._lock:
+            stale_keys = [key for key in self._entries if predicate(key)]
+            for key in stale_keys:
+                self._total_bytes -= self._entries.pop(key)[1]
+            return len(stale_keys)
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+        dict: hits, misses, evictions, number of entries and total cached bytes.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'entries': len(self._entries),
+                    'bytes': self._total_bytes}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
@@ -0,0 +1,174 @@
+"""
+indicator_cache module: two-level cache of technical indicator results.
+
+Indicator series are cached in memory (an LRU bounded by
+INDICATOR_CACHE_MAX_BYTES) and on disk, as one Parquet file per ticker,
+indicator and parameters in `{DEFAULT_DATABASE_PATH}/.cache/indicators/{TICKER}/`.
+Entries are keyed by (ticker, indicator, parameters, data version), the data
+version being the version of the stored price table: a series computed before
+download_stock_data or update_stock_data changed the prices is never served.
+Both levels are also dropped explicitly when the stock data cache of a ticker
+is invalidated. Series restricted to a date range are cheap to recompute and
+only kept in memory.
+
+Functions:
+    1. get_cached_technical_indicator(ticker_symbol, length, indicator,
+                                      start_date='', end_date='')
+    2. get_indicator_cache_stats()
+    3. invalidate_indicator_cache(ticker_symbol=None)
+"""
+import json
+import os
+import shutil
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import backend.stock_data_manager as sdm
+from backend.atomic_file import atomic_replace
+from backend.cache import LRUCache
+from backend.kpi_manager import get_technical_indicator
+
+INDICATOR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+INDICATOR_CACHE_DIRECTORY = os.path.join('.cache', 'indicators')
+# Write computed series to disk so they survive restarts of the app.
+INDICATOR_DISK_CACHE = True
+VERSION_METADATA_KEY = b'dinero_data_version'
+
+_indicator_cache = LRUCache(INDICATOR_CACHE_MAX_BYTES)
+_disk_stats = {'hits': 0, 'misses': 0, 'writes': 0}
+_disk_stats_lock = threading.Lock()
+
+
+def _cache_folder(ticker_symbol=None):
+    """Return the folder holding the cached series of a ticker (or of every ticker)."""
+    folder = os.path.join(sdm.DEFAULT_DATABASE_PATH, INDICATOR_CACHE_DIRECTORY)
+    return folder if ticker_symbol is None else os.path.join(folder, ticker_symbol)
+
+
+def _cache_file(ticker_symbol, indicator, parameters):
+    """Return the Parquet file caching one indicator series."""
+    name = '_'.join([indicator, *(str(parameter) for parameter in parameters)])
+    return os.path.join(_cache_folder(ticker_symbol), f'{name}.parquet')
+
+
+def _count_disk(counter):
+    with _disk_stats_lock:
+        _disk_stats[counter] += 1
+
+
+def _read_disk(file_path, version):
+    """Return the series cached in file_path if it was computed from version, None otherwise."""
+    try:
+        metadata = pq.read_schema(file_path).metadata or {}
+        if metadata.get(VERSION_METADATA_KEY) != json.dumps(list(version)).encode():
+            return None
+        return pq.read_table(file_path).to_pandas()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def _write_disk(file_path, series, version):
+    """Write series and its data version to file_path, atomically."""
+    table = pa.Table.from_pandas(series)
+    metadata = {**(table.schema.metadata or {}),
+                VERSION_METADATA_KEY: json.dumps(list(version)).encode()}
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        atomic_replace(file_path, lambda path: pq.write_table(
+            table.replace_schema_metadata(metadata), path))
+    except OSError:
+        # the disk level is an optimization: a read-only database still works
+        return
+    _count_disk('writes')
+
+
+def get_cached_technical_indicator(ticker_symbol, length, indicator, start_date='', end_date=''):
+    """
+    Function to fetch a technical indicator, computing it only if the prices
+    changed since it was last computed.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol.
+    length (int): The length of timeframe (in days) of the indicator.
+    indicator (str): name of a registered indicator, e.g. 'RSI'.
+    start_date (str, optional): first date in 'yyyy-mm-dd' format (inclusive).
+                                Defaults to '' (first stored date).
+    end_date (str, optional): last date in 'yyyy-mm-dd' format (inclusive).
+                              Defaults to '' (last stored date).
+
+    Returns:
+    pd.DataFrame: 'Date' and the indicator column, as get_technical_indicator.
+    The frame is shared with the cache: callers must not modify it in place.
+
+    Exceptions:
+    TypeError if ticker_symbol is not a string
+    ValueError if ticker not in database, the indicator is not supported
+        or a date is invalid
+    """
+    version = sdm.get_data_version(ticker_symbol)
+    ticker_symbol = ticker_symbol.upper()
+    parameters = (int(length),)
+    if start_date or end_date:
+        key = (ticker_symbol, indicator, (*parameters, start_date, end_date), version)
+        series = _indicator_cache.get(key)
+        if series is None:
+            series = get_technical_indicator(ticker_symbol, int(length), indicator,
+                                             start_date, end_date)
+            _indicator_cache.put(key, series)
+        return series
+    key = (ticker_symbol, indicator, parameters, version)
+
+    series = _indicator_cache.get(key)
+    if series is not None:
+        return series
+
+    file_path = _cache_file(ticker_symbol, indicator, parameters)
+    series = _read_disk(file_path, version) if INDICATOR_DISK_CACHE else None
+    if series is not None:
+        _count_disk('hits')
+    else:
+        _count_disk('misses')
+        series = get_technical_indicator(ticker_symbol, int(length), indicator)
+        if INDICATOR_DISK_CACHE:
+            _write_disk(file_path, series, version)
+    _indicator_cache.put(key, series)
+    return series
+
+
+def get_indicator_cache_stats():
+    """
+    Function to get the counters of the indicator cache.
+
+    Returns:
+    dict: 'memory' holds the counters of the in-memory LRU (hits, misses,
+          evictions, entries, bytes); 'disk' the hits, misses and writes of
+          the on-disk level, consulted on memory misses.
+    """
+    with _disk_stats_lock:
+        disk = dict(_disk_stats)
+    return {'memory': _indicator_cache.stats(), 'disk': disk}
+
+
+def invalidate_indicator_cache(ticker_symbol=None):
+    """
+    Function to drop the cached indicators of a ticker (or of every ticker if None)
+    from memory and disk.
+
+    Parameters:
+    ticker_symbol (str, optional): The stock ticker symbol. Defaults to None.
+
+    Returns:
+    int: number of dropped in-memory entries.
+    """
+    if ticker_symbol is None:
+        dropped = _indicator_cache.invalidate(lambda key: True)
+    else:
+        ticker_symbol = ticker_symbol.upper()
+        dropped = _indicator_cache.invalidate(lambda key: key[0] == ticker_symbol)
+    shutil.rmtree(_cache_folder(ticker_symbol), ignore_errors=True)
+    return dropped
+
+
+sdm.register_cache_invalidation(invalidate_indicator_cache)
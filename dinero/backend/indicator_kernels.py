@@ -0,0 +1,229 @@
+"""
+indicator_kernels module: NumPy sliding-window kernels shared by the
+technical indicators.
+
+Kernels take float arrays ordered by date, of shape (rows,) for one ticker or
+(rows, tickers) for a panel, and work along the first axis. Rolling windows
+are differences of cumulative sums: the sums of a series are computed once and
+every window length is then a single vectorized subtraction, so a sweep over
+many lengths costs about one pass over the data.
+
+As with pandas rolling(window=length), the first length - 1 rows are NaN and
+so is every window containing a NaN.
+
+Classes:
+    1. RollingWindows(values)
+
+Functions:
+    1. shift(values, periods)
+    2. gains_and_losses(close)
+    3. simple_moving_average(close_windows, length)
+    4. rsi(gain_windows, loss_windows, length)
+    5. roc(close, length)
+    6. bollinger_bands_percent(close, close_windows, length, num_std_dev=2)
+"""
+import numpy as np
+
+# Blocks of rows sharing a center for standard deviations: at least
+# MIN_BLOCK_ROWS, and BLOCK_WINDOWS times the window length.
+MIN_BLOCK_ROWS = 256
+BLOCK_WINDOWS = 8
+# Variance, relative to the sum of squares of a window, below which the window
+# is checked for equal values (whose standard deviation is exactly 0).
+CONSTANT_TOLERANCE = 1e-10
+
+
+def _prefix_sums(values):
+    """Return the cumulative sums of values along the first axis, starting with a row of 0."""
+    sums = np.zeros((len(values) + 1,) + values.shape[1:], dtype=values.dtype)
+    np.cumsum(values, axis=0, out=sums[1:])
+    return sums
+
+
+def _segment_window_sums(segments, length, out):
+    """
+    Write the window sums, over length rows of every segment (along the second
+    axis), of the deviations of the values from the first value of the segment,
+    and of their squares, to the two arrays of out.
+    """
+    deviations = segments - segments[:, :1]
+    prefix = np.zeros((len(segments), segments.shape[1] + 1) + segments.shape[2:])
+    for position, window_sums in enumerate(out):
+        if position:
+            np.square(deviations, out=deviations)
+        np.cumsum(deviations, axis=1, out=prefix[:, 1:])
+        np.subtract(prefix[:, length:], prefix[:, :-length], out=window_sums)
+
+
+def _check_length(length):
+    """Raise ValueError if length is not a positive integer."""
+    if isinstance(length, bool) or not isinstance(length, (int, np.integer)) or length < 1:
+        raise ValueError("length must be a positive integer.")
+
+
+class RollingWindows:
+    """
+    Cumulative sums of a series, from which the sum, mean and standard deviation
+    of any window length are read in one subtraction.
+
+    Standard deviations need sums of squares, whose differences lose precision
+    when the values are far from 0. They are computed on the deviations of the
+    values from the first value of their block of rows, summed within the
+    block only, so the sums grow with the local variance of the prices, not
+    with their level. The few windows straddling two blocks are summed the
+    same way on the rows around the boundary. Windows of equal values get a
+    standard deviation of exactly 0, as in pandas, rather than a rounding error.
+
+    Attributes:
+    values (np.ndarray): float64 series of shape (rows,) or (rows, tickers).
+    """
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(self.values)
+        # prefix counts of missing values, None when there are none (the usual case)
+        self._missing = _prefix_sums(missing.astype(np.int64)) if missing.any() else None
+        self._present = np.where(missing, 0.0, self.values) if missing.any() else self.values
+        self._sums = _prefix_sums(self._present)
+        self._changes = None
+
+    def _window(self, prefix, length):
+        """Return the window sums of a prefix array, NaN before the first full window."""
+        result = np.empty(self.values.shape)
+        result[:length - 1] = np.nan
+        if length <= len(self.values):
+            np.subtract(prefix[length:], prefix[:-length], out=result[length - 1:])
+            self._mask_incomplete(result, length)
+        return result
+
+    def _mask_incomplete(self, result, length):
+        """Set the windows containing a missing value to NaN."""
+        if self._missing is not None and length <= len(self.values):
+            incomplete = (self._missing[length:] - self._missing[:-length]) > 0
+            result[length - 1:][incomplete] = np.nan
+
+    def sum(self, length):
+        """Return the rolling sum over length rows."""
+        _check_length(length)
+        return self._window(self._sums, length)
+
+    def mean(self, length):
+        """Return the rolling mean over length rows."""
+        _check_length(length)
+        result = self._window(self._sums, length)
+        result /= length
+        return result
+
+    def _centered_window_sums(self, length):
+        """
+        Return the sums of the deviations of every full window from a center
+        inside it, and of their squares.
+        """
+        rows = len(self.values)
+        block = max(MIN_BLOCK_ROWS, 1 << (BLOCK_WINDOWS * length - 1).bit_length())
+        blocks = np.zeros((-(-rows // block) * block,) + self.values.shape[1:])
+        blocks[:rows] = self._present
+        blocks = blocks.reshape((-1, block) + self.values.shape[1:])
+        # sums by the row ending the window
+        window_sums = [np.empty(blocks.shape), np.empty(blocks.shape)]
+        _segment_window_sums(blocks, length, [sums[:, length - 1:] for sums in window_sums])
+        if len(blocks) > 1:
+            # windows straddling a block boundary, from the last length - 1
+            # rows of a block and the first length - 1 rows of the next one
+            _segment_window_sums(
+                np.concatenate([blocks[:-1, block - length + 1:], blocks[1:, :length - 1]],
+                               axis=1),
+                length, [sums[1:, :length - 1] for sums in window_sums])
+        return [sums.reshape((-1,) + self.values.shape[1:])[length - 1:rows]
+                for sums in window_sums]
+
+    def _constant_windows(self, length):
+        """Return, for every full window, whether all its values are equal."""
+        if self._changes is None:
+            changed = np.zeros(self.values.shape, dtype=np.uint8)
+            np.not_equal(self.values[1:], self.values[:-1], out=changed[1:].view(bool))
+            self._changes = _prefix_sums(changed.astype(np.int64))
+        # number of changes between consecutive values inside each window
+        return self._changes[length:] == self._changes[1:len(self.values) + 2 - length]
+
+    def std(self, length):
+        """Return the rolling sample standard deviation (ddof=1) over length rows."""
+        _check_length(length)
+        result = np.full(self.values.shape, np.nan)
+        if length < 2 or length > len(self.values):
+            return result
+
+        deviation_sums, window_squares = self._centered_window_sums(length)
+        deviation_sums *= deviation_sums
+        deviation_sums /= length
+        variance = np.subtract(window_squares, deviation_sums, out=deviation_sums)
+        # only windows whose variance is within rounding of 0 can hold equal values
+        window_squares *= CONSTANT_TOLERANCE
+        maybe_constant = variance <= window_squares
+        if maybe_constant.any():
+            variance[maybe_constant & self._constant_windows(length)] = 0.0
+        variance /= length - 1
+        np.maximum(variance, 0.0, out=variance)
+        np.sqrt(variance, out=result[length - 1:])
+        self._mask_incomplete(result, length)
+        return result
+
+
+def shift(values, periods):
+    """Return values shifted down by periods rows, NaN-filled like pandas shift."""
+    result = np.full(np.shape(values), np.nan)
+    if periods < len(values):
+        result[periods:] = values[:len(values) - periods]
+    return result
+
+
+def gains_and_losses(close):
+    """
+    Return the positive and negative day-to-day changes of close as two
+    non-negative arrays. Rows without a change (the first one, or next to a
+    NaN) count as 0, as in calculate_rsi.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    delta = close - shift(close, 1)
+    with np.errstate(invalid='ignore'):
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+    return gains, losses
+
+
+def simple_moving_average(close_windows, length):
+    """Return the Simple Moving Average from the rolling windows of 'Close'."""
+    return close_windows.mean(length)
+
+
+def rsi(gain_windows, loss_windows, length):
+    """Return the Relative Strength Index from the rolling windows of gains and losses."""
+    gain = gain_windows.mean(length)
+    loss = loss_windows.mean(length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def roc(close, length):
+    """Return the Rate of Change of close over length rows, in percent."""
+    _check_length(length)
+    previous = shift(close, length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close - previous) / previous * 100
+
+
+def bollinger_bands_percent(close, close_windows, length, num_std_dev=2):
+    """
+    Return the Bollinger Bands %B from close and its rolling windows. Windows of
+    equal prices have no band width and give NaN (0 / 0), as in pandas.
+    """
+    percent_b = close_windows.mean(length)
+    std_dev = close_windows.std(length)
+    # (close - lower band) / band width, lower band = sma - num_std_dev * std_dev
+    np.subtract(close, percent_b, out=percent_b)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b /= std_dev
+    percent_b /= 2 * num_std_dev
+    percent_b += 0.5
+    percent_b[std_dev == 0] = np.nan
+    return percent_b
@@ -0,0 +1,345 @@
+"""
+indicator_registry module: the technical indicators known to dinero.
+
+Each indicator is registered with the price columns it reads, the
+intermediate series it is built from, the number of warm-up rows it needs
+and whether it is drawn over the price chart (overlay) or in its own panel.
+
+Intermediates are named by keys such as ('ema', CLOSE, 12) or
+('true_range',). A planner collects the intermediates of every requested
+indicator and computes each distinct one once: the EMAs shared by EMA and
+MACD, the true range of ATR, the highest highs and lowest lows of the
+Stochastic oscillator. MA, RSI, ROC and BBP are the functions of
+technical_indicators (with their pandas or numpy backend), each planned as a
+single intermediate: MA and BBP of the same length do not share their rolling
+means. A view of several indicators therefore reads the prices
+once and costs about one pass over them.
+
+Classes:
+    1. Indicator(name, title, intermediates, compute, ...)
+    2. Intermediates(data)
+
+Functions:
+    1. register_indicator(indicator)
+    2. get_indicator(name)
+    3. list_indicators()
+    4. plan_indicators(requests)
+    5. compute_indicators(data, requests)
+    6. technical_indicator(name, title, function, ...)
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+import backend.technical_indicators as ti
+
+CLOSE = ('column', 'Close')
+HIGH = ('column', 'High')
+LOW = ('column', 'Low')
+VOLUME = ('column', 'Volume')
+# Relative weight of the history before the warm-up rows in an exponential average.
+EMA_TOLERANCE = 1e-6
+MACD_SIGNAL_SPAN = 9
+STOCHASTIC_SMOOTHING = 3
+
+
+def _true_range(values):
+    previous_close = values.get(CLOSE).shift(1)
+    ranges = pd.concat([values.get(HIGH) - values.get(LOW),
+                        (values.get(HIGH) - previous_close).abs(),
+                        (values.get(LOW) - previous_close).abs()], axis=1)
+    return ranges.max(axis=1)
+
+
+def _typical_volume(values):
+    typical_price = (values.get(HIGH) + values.get(LOW) + values.get(CLOSE)) / 3
+    return typical_price * values.get(VOLUME)
+
+
+def _technical_indicator(values, function, length):
+    return getattr(ti, function)(values.data, length)
+
+
+def _macd_line(values, fast, slow):
+    macd = values.get(('ema', CLOSE, fast)) - values.get(('ema', CLOSE, slow))
+    macd.iloc[:slow - 1] = np.nan
+    return macd
+
+
+# Functions computing each kind of intermediate from the Intermediates and the key arguments.
+INTERMEDIATE_FUNCTIONS = {
+    'column': lambda values, column: values.data[column].astype(float),
+    'technical_indicator': _technical_indicator,
+    'rolling_sum': lambda values, source, length: values.get(source).rolling(length).sum(),
+    'rolling_max': lambda values, source, length: values.get(source).rolling(length).max(),
+    'rolling_min': lambda values, source, length: values.get(source).rolling(length).min(),
+    'ema': lambda values, source, span: values.get(source).ewm(span=span, adjust=False).mean(),
+    'wilder': lambda values, source, length: values.get(source).ewm(alpha=1 / length,
+                                                                    adjust=False).mean(),
+    'true_range': _true_range,
+    'typical_volume': _typical_volume,
+    'macd_line': _macd_line,
+}
+
+
+class Intermediates:
+    """
+    Intermediate series of one stock DataFrame, each computed once on first use.
+
+    Attributes:
+    data (pd.DataFrame): stock data with the price columns of the indicators.
+    computed (list): keys of the computed intermediates, in computation order.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.computed = []
+        self._values = {}
+
+    def get(self, key):
+        """Return the intermediate series named by key, computing it on first use."""
+        if key not in self._values:
+            self._values[key] = INTERMEDIATE_FUNCTIONS[key[0]](self, *key[1:])
+            self.computed.append(key)
+        return self._values[key]
+
+    def compute(self, plan):
+        """Compute every intermediate of a plan from plan_indicators, in order."""
+        for key in plan:
+            self.get(key)
+
+
+class Indicator: # pylint: disable=too-many-instance-attributes
+    """
+    A registered technical indicator.
+
+    Attributes:
+    name (str): short name, e.g. 'RSI'.
+    title (str): readable name, e.g. 'Relative Strength Index'.
+    inputs (tuple): price columns the indicator reads.
+    outputs (tuple): names of the columns it returns.
+    overlay (bool): True if drawn over the price chart, False for its own panel.
+    """
+
+    def __init__(self, name, title, intermediates, compute, **options):
+        self.name = name
+        self.title = title
+        self._intermediates = intermediates
+        self._compute = compute
+        self._warmup = options.get('warmup', lambda length: length - 1)
+        self._function = options.get('function')
+        self.inputs = tuple(options.get('inputs', ('Close',)))
+        self.outputs = tuple(options.get('outputs', (name,)))
+        self.overlay = options.get('overlay', False)
+
+    def intermediates(self, length):
+        """Return the keys of the intermediates the indicator is built from."""
+        return self._intermediates(length)
+
+    def warmup(self, length):
+        """
+        Return the number of rows preceding a date needed to compute the indicator
+        at that date as from the full history (within EMA_TOLERANCE for
+        exponential averages).
+        """
+        return self._warmup(length)
+
+    def compute(self, values, length):
+        """Return {output column: series} from the Intermediates of a stock DataFrame."""
+        return self._compute(values, length)
+
+    def calculate(self, data, length):
+        """
+        Calculates the indicator on a stock DataFrame.
+
+        Returns:
+        pd.DataFrame: 'Date' followed by the output columns.
+        """
+        if self._function is not None:
+            # looked up at call time so that technical_indicators stays the single source
+            return getattr(ti, self._function)(data, length)
+        result = pd.DataFrame({'Date': data['Date']})
+        for column, series in self.compute(Intermediates(data), length).items():
+            result[column] = series
+        return result
+
+
+def ema_warmup(alpha):
+    """Return the rows after which older prices weigh less than EMA_TOLERANCE in an EMA."""
+    return math.ceil(math.log(EMA_TOLERANCE) / math.log(1 - alpha))
+
+
+def macd_spans(length):
+    """Return the fast, slow and signal spans of MACD: (12, 26, 9) for a length of 12."""
+    return length, round(length * 26 / 12), MACD_SIGNAL_SPAN
+
+
+def technical_indicator(name, title, function, **options):
+    """
+    Return an Indicator computed by a function of technical_indicators, such as
+    calculate_rsi, returning 'Date' and a name column.
+    """
+    def key(length):
+        return ('technical_indicator', function, length)
+
+    return Indicator(name, title, lambda length: [key(length)],
+                     lambda values, length: {name: values.get(key(length))[name]},
+                     function=function, **options)
+
+
+def _ema(values, length):
+    ema = values.get(('ema', CLOSE, length)).copy()
+    ema.iloc[:length - 1] = np.nan
+    return {'EMA': ema}
+
+
+def _macd(values, length):
+    fast, slow, signal_span = macd_spans(length)
+    macd = values.get(('macd_line', fast, slow))
+    signal = values.get(('ema', ('macd_line', fast, slow), signal_span)).copy()
+    signal.iloc[:slow + signal_span - 2] = np.nan
+    return {'MACD': macd, 'MACD_SIGNAL': signal, 'MACD_HIST': macd - signal}
+
+
+def _atr(values, length):
+    atr = values.get(('wilder', ('true_range',), length)).copy()
+    atr.iloc[:length - 1] = np.nan
+    return {'ATR': atr}
+
+
+def _stochastic(values, length):
+    highest = values.get(('rolling_max', HIGH, length))
+    lowest = values.get(('rolling_min', LOW, length))
+    percent_k = 100 * (values.get(CLOSE) - lowest) / (highest - lowest)
+    return {'STOCH_K': percent_k,
+            'STOCH_D': percent_k.rolling(STOCHASTIC_SMOOTHING).mean()}
+
+
+def _vwap(values, length):
+    return {'VWAP': values.get(('rolling_sum', ('typical_volume',), length))
+                    / values.get(('rolling_sum', VOLUME, length))}
+
+
+_REGISTRY = {}
+
+
+def register_indicator(indicator):
+    """
+    Function to add an indicator to the registry (replacing one with the same name).
+
+    Parameters:
+    indicator (Indicator): the indicator to register.
+
+    Returns:
+    Indicator: the registered indicator.
+    """
+    _REGISTRY[indicator.name] = indicator
+    return indicator
+
+
+def get_indicator(name):
+    """
+    Function to get a registered indicator.
+
+    Parameters:
+    name (str): short name of the indicator, e.g. 'MACD'.
+
+    Returns:
+    Indicator
+
+    Exceptions:
+    ValueError if no indicator is registered under name.
+    """
+    if name not in _REGISTRY:
+        raise ValueError(f"Unsupported indicator. Please use one of {list_indicators()}.")
+    return _REGISTRY[name]
+
+
+def list_indicators():
+    """
+    Function to list the names of the registered indicators, in registration order.
+
+    Returns:
+    list: indicator names.
+    """
+    return list(_REGISTRY)
+
+
+def plan_indicators(requests):
+    """
+    Function to plan the computation of several indicators: every distinct
+    intermediate is listed once, shared ones being computed a single time.
+
+    Parameters:
+    requests (list): (indicator name, length) tuples.
+
+    Returns:
+    list: intermediate keys, in the order they are first needed.
+
+    Exceptions:
+    ValueError if an indicator is not registered.
+    """
+    plan = []
+    for name, length in requests:
+        for key in get_indicator(name).intermediates(length):
+            if key not in plan:
+                plan.append(key)
+    return plan
+
+
+def compute_indicators(data, requests):
+    """
+    Function to compute several indicators on a stock DataFrame in one pass.
+
+    Parameters:
+    data (pd.DataFrame): stock data with 'Date' and the input columns of the indicators.
+    requests (list): (indicator name, length) tuples.
+
+    Returns:
+    pd.DataFrame: 'Date' followed by one column per output and length, named like
+    'MACD_SIGNAL_12', warm-up rows being NaN.
+    """
+    values = Intermediates(data)
+    values.compute(plan_indicators(requests))
+    columns = {'Date': data['Date']}
+    for name, length in requests:
+        for column, series in get_indicator(name).compute(values, length).items():
+            columns[f'{column}_{length}'] = series
+    return pd.DataFrame(columns)
+
+
+register_indicator(technical_indicator(
+    'MA', 'Moving Average', 'calculate_simple_moving_average', overlay=True))
+register_indicator(technical_indicator(
+    'RSI', 'Relative Strength Index', 'calculate_rsi', warmup=lambda length: length))
+register_indicator(technical_indicator(
+    'ROC', 'Rate of Change', 'calculate_roc', warmup=lambda length: length))
+register_indicator(technical_indicator(
+    'BBP', 'Bollinger Bands %B', 'calculate_bollinger_bands_percent'))
+register_indicator(Indicator(
+    'EMA', 'Exponential Moving Average', lambda length: [('ema', CLOSE, length)], _ema,
+    warmup=lambda length: max(length - 1, ema_warmup(2 / (length + 1))), overlay=True))
+register_indicator(Indicator(
+    'MACD', 'Moving Average Convergence Divergence',
+    lambda length: [('ema', CLOSE, macd_spans(length)[0]), ('ema', CLOSE, macd_spans(length)[1]),
+                    ('macd_line',) + macd_spans(length)[:2],
+                    ('ema', ('macd_line',) + macd_spans(length)[:2], MACD_SIGNAL_SPAN)],
+    _macd, outputs=('MACD', 'MACD_SIGNAL', 'MACD_HIST'),
+    warmup=lambda length: (ema_warmup(2 / (macd_spans(length)[1] + 1))
+                           + ema_warmup(2 / (MACD_SIGNAL_SPAN + 1)))))
+register_indicator(Indicator(
+    'ATR', 'Average True Range',
+    lambda length: [('true_range',), ('wilder', ('true_range',), length)],
+    _atr, inputs=('High', 'Low', 'Close'),
+    warmup=lambda length: max(length - 1, ema_warmup(1 / length)) + 1))
+register_indicator(Indicator(
+    'STOCH', 'Stochastic Oscillator',
+    lambda length: [('rolling_max', HIGH, length), ('rolling_min', LOW, length)],
+    _stochastic, inputs=('High', 'Low', 'Close'), outputs=('STOCH_K', 'STOCH_D'),
+    warmup=lambda length: length + STOCHASTIC_SMOOTHING - 2))
+register_indicator(Indicator(
+    'VWAP', 'Volume Weighted Average Price',
+    lambda length: [('typical_volume',), ('rolling_sum', ('typical_volume',), length),
+                    ('rolling_sum', VOLUME, length)],
+    _vwap, inputs=('High', 'Low', 'Close', 'Volume'), overlay=True))
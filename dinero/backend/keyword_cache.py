@@ -0,0 +1,85 @@
+"""
+keyword_cache module: persistent cache of the keywords and entities of articles.
+
+Results are stored in a SQLite database, `{DEFAULT_DATABASE_PATH}/.cache/keywords.sqlite3`,
+keyed like the sentiment cache by the SHA-256 of the normalized text
+(sentiment_cache.text_key) and the version of the pipeline that extracted them.
+
+Functions:
+    1. get_cached_keywords(keys, version)
+    2. put_keywords(results, version)
+    3. get_keyword_cache_stats()
+    4. clear_keyword_cache(version=None)
+"""
+import json
+import os
+
+from backend.sqlite_cache import SQLiteCache
+
+KEYWORD_CACHE_FILE = os.path.join('.cache', 'keywords.sqlite3')
+
+_SCHEMA = '''CREATE TABLE IF NOT EXISTS keywords (
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    terms TEXT NOT NULL,
+    PRIMARY KEY (key, version)
+) WITHOUT ROWID'''
+
+_cache = SQLiteCache('Keyword', KEYWORD_CACHE_FILE, 'keywords', _SCHEMA,
+                     ['hits', 'misses', 'writes'])
+
+
+def get_cached_keywords(keys, version):
+    """
+    Function to look up the keywords and entities of several texts.
+
+    Parameters:
+    keys (list): keys of the texts, from sentiment_cache.text_key.
+    version (str): version of the pipeline the results must come from.
+
+    Returns:
+    dict: the cached terms, lists of (kind, term, count), keyed by key; keys
+          that were never processed by this version are missing.
+    """
+    keys = list(dict.fromkeys(keys))
+    results = {key: [tuple(term) for term in json.loads(terms)]
+               for key, terms in _cache.lookup(['key', 'terms'], 'key', keys, version=version)}
+    _cache.count('hits', len(results))
+    _cache.count('misses', len(keys) - len(results))
+    return results
+
+
+def put_keywords(results, version):
+    """
+    Function to cache the keywords and entities of several texts.
+
+    Parameters:
+    results (dict): lists of (kind, term, count), keyed by sentiment_cache.text_key.
+    version (str): version of the pipeline that extracted them.
+    """
+    _cache.store([(key, version, json.dumps(terms)) for key, terms in results.items()])
+
+
+def get_keyword_cache_stats():
+    """
+    Function to get the counters of the keyword cache.
+
+    Returns:
+    dict: hits, misses and writes of this process, and the number of cached texts.
+    """
+    return _cache.stats()
+
+
+def clear_keyword_cache(version=None):
+    """
+    Function to drop the cached results of a pipeline version (or of every version if None).
+
+    Parameters:
+    version (str, optional): the pipeline version. Defaults to None.
+
+    Returns:
+    int: number of dropped results.
+    """
+    if version is None:
+        return _cache.clear()
+    return _cache.clear(version=version)
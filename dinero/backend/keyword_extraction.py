@@ -0,0 +1,198 @@
+"""
+Module: keyword_extraction
+This module extracts the keywords and named entities of news articles with
+spaCy, to find the terms most associated with significant price changes.
+
+The spaCy pipeline (KEYWORD_MODEL, en_core_web_sm by default, or the package
+or path named by the DINERO_SPACY_MODEL environment variable) is loaded once per
+process without the components the terms do not need, the dependency parser
+above all. Texts are processed in batches with nlp.pipe, in chunks spread
+across a process pool (one pipeline per worker).
+
+Every article yields a list of (kind, term, count): kind is KEYWORD_KIND for the
+lemmas of its nouns and proper nouns (of its words without stop words, for
+pipelines without a tagger) and the entity label (ORG, PERSON, ...) for its
+named entities. With cached=True, the terms are looked up in
+backend.keyword_cache first, by the hash of the normalized text and the
+pipeline version, and only texts never processed by this pipeline are.
+
+Function:
+    - aggregate_keywords
+    - extract_keywords
+    - get_nlp
+    - get_keyword_version
+"""
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+import spacy
+
+from backend.keyword_cache import get_cached_keywords, put_keywords
+from backend.sentiment_cache import normalize_text, text_key
+
+KEYWORD_MODEL = os.environ.get('DINERO_SPACY_MODEL', 'en_core_web_sm')
+# Components of the pipeline left out: keywords need the tagger, entities the ner.
+KEYWORD_DISABLED_COMPONENTS = ('parser', 'senter', 'textcat', 'spacytextblob')
+KEYWORD_POS = ('NOUN', 'PROPN')
+KEYWORD_ENTITY_LABELS = ('ORG', 'PERSON', 'GPE', 'NORP', 'PRODUCT', 'EVENT', 'LAW',
+                         'FAC', 'LOC', 'WORK_OF_ART')
+KEYWORD_KIND = 'KEYWORD'
+# Version of the extraction rules, part of the version of the cached terms.
+KEYWORD_EXTRACTOR_VERSION = 1
+# Texts per nlp.pipe batch, and per task of the process pool.
+KEYWORD_BATCH_SIZE = 128
+KEYWORD_CHUNK_SIZE = 1000
+KEYWORD_MAX_WORKERS = os.cpu_count() or 1
+KEYWORD_TOP_N = 10
+KEYWORD_COLUMNS = ['Ticker', 'Date', 'Kind', 'Term', 'Articles', 'Count']
+
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+
+def get_nlp():
+    """
+    Returns the spaCy pipeline of KEYWORD_MODEL in this process, loading it
+    without KEYWORD_DISABLED_COMPONENTS on first use.
+
+    Returns:
+    - spacy.language.Language: the shared pipeline.
+
+    Raises:
+    - OSError: If KEYWORD_MODEL is neither an installed package nor a pipeline folder.
+    """
+    model = KEYWORD_MODEL
+    with _pipelines_lock:
+        if model not in _pipelines:
+            _pipelines[model] = spacy.load(model, disable=list(KEYWORD_DISABLED_COMPONENTS))
+        return _pipelines[model]
+
+
+def get_keyword_version() -> str:
+    """
+    Returns the version of the pipeline of this process, which changes with
+    the model, its enabled components, spaCy and the extraction rules, to key
+    cached terms.
+
+    Returns:
+    - str: e.g. 'en_core_web_sm-3.7.1-tok2vec+tagger+...-spacy3.7.3-1'.
+    """
+    nlp = get_nlp()
+    return (f"{nlp.meta['lang']}_{nlp.meta['name']}-{nlp.meta['version']}-"
+            f"{'+'.join(nlp.pipe_names)}-spacy{spacy.__version__}-{KEYWORD_EXTRACTOR_VERSION}")
+
+
+def _doc_terms(doc):
+    """The (kind, term, count) of a processed text, most frequent first."""
+    counts = Counter()
+    tagged = doc.has_annotation('POS')
+    for token in doc:
+        if (token.is_alpha and not token.is_stop and len(token) > 2
+                and (not tagged or token.pos_ in KEYWORD_POS)):
+            counts[(KEYWORD_KIND, (token.lemma_ or token.text).lower())] += 1
+    for entity in doc.ents:
+        if entity.label_ in KEYWORD_ENTITY_LABELS:
+            counts[(entity.label_, entity.text)] += 1
+    return [(kind, term, count) for (kind, term), count in counts.most_common()]
+
+
+def _extract_chunk(chunk, batch_size=KEYWORD_BATCH_SIZE):
+    """Process a chunk of (key, text) with the pipeline of this (worker) process, by key."""
+    keys = [key for key, _ in chunk]
+    docs = get_nlp().pipe((text for _, text in chunk), batch_size=batch_size)
+    return {key: _doc_terms(doc) for key, doc in zip(keys, docs)}
+
+
+def extract_keywords(texts: list, batch_size: int = KEYWORD_BATCH_SIZE,
+                     chunk_size: int = KEYWORD_CHUNK_SIZE, max_workers: int = None,
+                     cached: bool = False) -> list:
+    """
+    Extracts the keywords and entities of several texts, each distinct text once.
+
+    Args:
+    - texts (list): the texts.
+    - batch_size (int): texts per nlp.pipe batch. Defaults to KEYWORD_BATCH_SIZE.
+    - chunk_size (int): distinct texts per task of the pool. Defaults to KEYWORD_CHUNK_SIZE.
+    - max_workers (int): worker processes. Defaults to None (KEYWORD_MAX_WORKERS);
+                         1, or a single chunk of texts, processes in this process.
+    - cached (bool): look the terms up in the keyword cache first and cache
+                     the new ones. Defaults to False.
+
+    Returns:
+    - list: the (kind, term, count) of every text, in order.
+
+    Raises:
+    - ValueError: If batch_size or chunk_size is not positive.
+    """
+    if batch_size < 1 or chunk_size < 1:
+        raise ValueError("batch_size and chunk_size must be positive integers.")
+    keys = [text_key(text) for text in texts]
+    version = get_keyword_version()
+    results = get_cached_keywords(keys, version) if cached else {}
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in results and key not in missing:
+            missing[key] = normalize_text(text)
+    missing = list(missing.items())
+    chunks = [missing[start:start + chunk_size] for start in range(0, len(missing), chunk_size)]
+
+    max_workers = KEYWORD_MAX_WORKERS if max_workers is None else max_workers
+    if max_workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                                 initializer=get_nlp) as executor:
+            new_results = list(executor.map(_extract_chunk, chunks, repeat(batch_size)))
+    else:
+        new_results = list(map(_extract_chunk, chunks, repeat(batch_size)))
+    for chunk_results in new_results:
+        if cached:
+            put_keywords(chunk_results, version)
+        results.update(chunk_results)
+    return [list(results[key]) for key in keys]
+
+
+def aggregate_keywords(dates_dictionary: dict, stock_symbol: str, top_n: int = KEYWORD_TOP_N,
+                       max_workers: int = None, cached: bool = False) -> pd.DataFrame:
+    """
+    Extracts the keywords and entities of the articles of every date, see
+    extract_keywords, and ranks them per date.
+
+    Args:
+    - dates_dictionary (dict): lists of articles (dictionaries with a 'content'
+                               key) keyed by date, as returned by
+                               transform.get_filter_dates; dates without news
+                               (None or empty) are skipped.
+    - stock_symbol (str): the ticker of the articles.
+    - top_n (int): terms kept per date, None for all. Defaults to KEYWORD_TOP_N.
+    - max_workers (int): worker processes. Defaults to None (KEYWORD_MAX_WORKERS).
+    - cached (bool): use the keyword cache. Defaults to False.
+
+    Returns:
+    - pd.DataFrame: one row per date and term, with the KEYWORD_COLUMNS: the
+                    number of articles of the date mentioning the term and the
+                    number of mentions, most mentioned first.
+    """
+    dates, texts = [], []
+    for date, articles in dates_dictionary.items():
+        for article in articles or []:
+            dates.append(date)
+            texts.append(article['content'])
+    rows = [(date, kind, term, count)
+            for date, terms in zip(dates, extract_keywords(texts, max_workers=max_workers,
+                                                           cached=cached))
+            for kind, term, count in terms]
+    if not rows:
+        return pd.DataFrame(columns=KEYWORD_COLUMNS)
+
+    terms = pd.DataFrame(rows, columns=['Date', 'Kind', 'Term', 'Count'])
+    ranked = (terms.groupby(['Date', 'Kind', 'Term'], as_index=False)
+              .agg(Articles=('Count', 'size'), Count=('Count', 'sum'))
+              .sort_values(['Date', 'Articles', 'Count', 'Term'],
+                           ascending=[True, False, False, True]))
+    if top_n is not None:
+        ranked = ranked.groupby('Date').head(top_n)
+    ranked.insert(0, 'Ticker', stock_symbol)
+    return ranked[KEYWORD_COLUMNS].reset_index(drop=True)
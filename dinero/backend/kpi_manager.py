@@ -2,24 +2,155 @@
 This module provides functionalities to read stock data from CSV files and
 compute various technical indicators such as Simple Moving Average (MA),
 Relative Strength Index (RSI), Rate of Change (ROC), and Bollinger Bands Percent (BBP)
-by utilizing the technical_indicators module.
+by utilizing the technical_indicators module, as well as the other indicators
+of the indicator_registry module (EMA, MACD, ATR, Stochastic and VWAP).
+
+get_technical_indicators computes several indicators for several lengths in
+one pass over the 'Close' prices with the kernels of indicator_kernels: the
+cumulative sums behind MA and BBP and the gains and losses behind RSI are
+computed once and shared by every requested length.
 """
-import backend.technical_indicators as ti
-from backend.stock_data_manager import get_stock_data
+import numpy as np
+import pandas as pd
+
+import backend.indicator_kernels as kernels
+from backend.indicator_registry import compute_indicators, get_indicator
+from backend.stock_data_manager import get_filtered_stock_data, get_stock_data
+
+SUPPORTED_INDICATORS = ('MA', 'RSI', 'ROC', 'BBP')
 
 
 # Fetches Technical Indicator
-def get_technical_indicator(ticker_symbol, length, indicator):
-    """Fetches technical indicators from the technical_indicators module"""
-    stock_data = get_stock_data(ticker_symbol)
-
-    if indicator == 'MA':
-        return ti.calculate_simple_moving_average(stock_data, length).dropna()
-    if indicator == 'RSI':
-        return ti.calculate_rsi(stock_data, length).dropna()
-    if indicator == 'ROC':
-        return ti.calculate_roc(stock_data, length).dropna()
-    if indicator == 'BBP':
-        return ti.calculate_bollinger_bands_percent(stock_data, length).dropna()
-
-    raise ValueError("Unsupported indicator. Please use 'MA','RSI','ROC' or 'BBP'.")
+def get_technical_indicator(ticker_symbol, length, indicator, start_date='', end_date=''):
+    """
+    Fetches a technical indicator registered in the indicator_registry module.
+
+    Without dates the indicator covers the full history. With a date range only
+    the range and the warm-up rows preceding it (Indicator.warmup: length rows,
+    or the convergence horizon of EMA-based indicators) are loaded and computed,
+    so short ranges stay cheap however long the stored history is.
+
+    Args:
+        ticker_symbol (str): the stock ticker symbol.
+        length (int): the length of timeframe (in days) of the indicator.
+        indicator (str): name of a registered indicator, e.g. 'RSI'.
+        start_date (str, optional): first date of the output in 'yyyy-mm-dd' format
+            (inclusive). Defaults to '' (first stored date).
+        end_date (str, optional): last date of the output in 'yyyy-mm-dd' format
+            (inclusive). Defaults to '' (last stored date).
+
+    Returns:
+        pd.DataFrame: 'Date' and the indicator columns, without warm-up rows.
+    """
+    spec = get_indicator(indicator)
+    if not (start_date or end_date):
+        stock_data = get_stock_data(ticker_symbol)
+        return spec.calculate(stock_data, length).dropna()
+
+    stock_data = get_filtered_stock_data(ticker_symbol, start_date, end_date,
+                                         list(spec.inputs), warmup_rows=spec.warmup(length))
+    result = spec.calculate(stock_data, length)
+    if start_date.strip():
+        dates = pd.DatetimeIndex(pd.to_datetime(result['Date'])).tz_localize(None)
+        result = result[dates >= pd.Timestamp(start_date)]
+    return result.dropna()
+
+
+def get_indicator_view(ticker_symbol, requests):
+    """
+    Computes several registered indicators of a ticker, reading its prices once and
+    computing the intermediates they share (EMAs, true range, rolling windows) once.
+
+    Args:
+        ticker_symbol (str): the stock ticker symbol.
+        requests (list): (indicator name, length) tuples, e.g. [('MACD', 12), ('EMA', 26)].
+
+    Returns:
+        pd.DataFrame: 'Date' followed by one column per output and length named like
+        'MACD_SIGNAL_12', warm-up rows being NaN.
+    """
+    requests = [(indicator, int(length)) for indicator, length in requests]
+    columns = []
+    for indicator, _ in requests:
+        columns.extend(column for column in get_indicator(indicator).inputs
+                       if column not in columns)
+    stock_data = get_stock_data(ticker_symbol, columns=columns)
+    return compute_indicators(stock_data, requests)
+
+
+def _close_prices(data):
+    """
+    Returns the dates, the 'Close' prices as a (rows, series) float array and the
+    series names of a ticker symbol, a stock DataFrame or a panel from backend.panel.
+    """
+    if isinstance(data, str):
+        data = get_stock_data(data, columns=['Close'])
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("data must be a ticker symbol or a pandas DataFrame")
+    if isinstance(data.columns, pd.MultiIndex):
+        close = data['Close']
+        return data.index, close.to_numpy(np.float64), list(close.columns)
+    return data['Date'], data['Close'].to_numpy(np.float64).reshape(-1, 1), None
+
+
+def _indicator_block(close, indicators, lengths):
+    """
+    Computes every indicator and length into one (rows, indicators * lengths, series)
+    array, sharing the rolling windows of 'Close' and of its gains and losses.
+    """
+    close_windows = kernels.RollingWindows(close)
+    rsi_windows = None
+    if 'RSI' in indicators:
+        rsi_windows = [kernels.RollingWindows(changes)
+                       for changes in kernels.gains_and_losses(close)]
+
+    block = np.empty((len(close), len(indicators) * len(lengths), close.shape[1]))
+    position = 0
+    for indicator in indicators:
+        for length in lengths:
+            if indicator == 'MA':
+                block[:, position] = kernels.simple_moving_average(close_windows, length)
+            elif indicator == 'RSI':
+                block[:, position] = kernels.rsi(*rsi_windows, length)
+            elif indicator == 'ROC':
+                block[:, position] = kernels.roc(close, length)
+            else:
+                block[:, position] = kernels.bollinger_bands_percent(close, close_windows,
+                                                                     length)
+            position += 1
+    return block
+
+
+def get_technical_indicators(data, indicators=SUPPORTED_INDICATORS, lengths=(14,)):
+    """
+    Computes several technical indicators for several lengths in one pass over the data.
+
+    Args:
+        data (str or pd.DataFrame): a ticker symbol, a stock DataFrame with 'Date' and
+            'Close' columns, or a panel returned by backend.panel.get_panel.
+        indicators (iterable): indicator names among 'MA', 'RSI', 'ROC' and 'BBP'.
+        lengths (int or iterable): window lengths, applied to every indicator.
+
+    Returns:
+        pd.DataFrame: one column per indicator and length named like 'MA_10', in the
+        order of indicators then lengths, warm-up rows being NaN. For a ticker or a
+        stock DataFrame the first column is 'Date'; for a panel the frame is indexed
+        by Date with ('MA_10', ticker) columns.
+    """
+    indicators = list(indicators)
+    lengths = [lengths] if isinstance(lengths, (int, np.integer)) else list(lengths)
+    unsupported = [indicator for indicator in indicators
+                   if indicator not in SUPPORTED_INDICATORS]
+    if unsupported:
+        raise ValueError("Unsupported indicator. Please use 'MA','RSI','ROC' or 'BBP'.")
+
+    dates, close, tickers = _close_prices(data)
+    block = _indicator_block(close, indicators, lengths)
+    names = [f'{indicator}_{length}' for indicator in indicators for length in lengths]
+
+    if tickers is None:
+        result = pd.DataFrame(block[:, :, 0], columns=names, index=dates.index)
+        result.insert(0, 'Date', dates)
+        return result
+    return pd.DataFrame(block.reshape(len(close), len(names) * len(tickers)), index=dates,
+                        columns=pd.MultiIndex.from_product([names, tickers]))
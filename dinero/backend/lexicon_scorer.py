@@ -0,0 +1,126 @@
+"""
+lexicon_scorer module: vectorized VADER lexicon scores for large batches of texts.
+
+A batch is tokenized once like VADER tokenizes (whitespace split, tokens of at
+least two characters, one leading or trailing punctuation mark dropped, case
+ignored) into a sparse document-term matrix over the lexicon. The pos, neg,
+neu and compound scores then come from matrix products with the valences,
+plus VADER's emphasis from exclamation and question marks.
+
+Only the raw lexicon valences are used: VADER's rules for negations, boosters,
+capitals and 'but' are left out, which is what makes the scores vectorizable.
+benchmarks/benchmark_lexicon_scorer.py reports how close they stay to VADER.
+
+Classes:
+    1. LexiconScorer(lexicon)
+"""
+import re
+import string
+
+import numpy as np
+from nltk.sentiment.vader import VaderConstants
+from sklearn.feature_extraction.text import CountVectorizer
+
+# Version of the scoring rules, part of the version of the cached scores.
+LEXICON_SCORER_VERSION = 1
+SCORE_COLUMNS = ('neg', 'neu', 'pos', 'compound')
+# Compound normalization and punctuation emphasis of VADER.
+NORMALIZE_ALPHA = 15
+EXCLAMATION_WEIGHT = 0.292
+MAX_EXCLAMATIONS = 4
+QUESTION_WEIGHT = 0.18
+MAX_QUESTION_EMPHASIS = 0.96
+
+# A word (no punctuation at all) with one of VADER's punctuation marks before or after it.
+_PUNCTUATION = '|'.join(re.escape(mark) for mark in
+                        sorted(VaderConstants.PUNC_LIST, key=len, reverse=True))
+_STRIP_PUNCTUATION = re.compile(
+    rf'(?<!\S)(?:{_PUNCTUATION})?([^\s{re.escape(string.punctuation)}]{{2,}})'
+    rf'(?:{_PUNCTUATION})?(?!\S)')
+_TOKEN_PATTERN = r'\S\S+'
+_TOKEN = re.compile(_TOKEN_PATTERN)
+
+
+def _preprocess(text):
+    """Lower case text and drop the punctuation around its words."""
+    return _STRIP_PUNCTUATION.sub(r'\1', str(text).lower())
+
+
+def _punctuation_emphasis(texts):
+    """VADER's emphasis from the exclamation and question marks of every text."""
+    exclamations = np.minimum([text.count('!') for text in texts], MAX_EXCLAMATIONS)
+    questions = np.array([text.count('?') for text in texts])
+    return exclamations * EXCLAMATION_WEIGHT + np.where(
+        questions <= 1, 0, np.where(questions <= 3, questions * QUESTION_WEIGHT,
+                                    MAX_QUESTION_EMPHASIS))
+
+
+class LexiconScorer:
+    """
+    Scores batches of texts with a VADER lexicon through sparse matrix products.
+
+    Parameters:
+    lexicon (dict): valence of every lexicon token, e.g. the `lexicon` of an
+                    nltk SentimentIntensityAnalyzer.
+
+    Example:
+    >> scorer = LexiconScorer(get_analyzer().lexicon)
+    >> scorer.score(['Shares rallied!', 'A terrible quarter.'])
+    """
+
+    def __init__(self, lexicon):
+        tokens = [token for token in lexicon if _TOKEN.fullmatch(token)]
+        self.vectorizer = CountVectorizer(vocabulary=tokens, lowercase=False,
+                                          preprocessor=_preprocess,
+                                          token_pattern=_TOKEN_PATTERN)
+        valence = np.array([lexicon[token] for token in tokens])
+        # columns: VADER's sums of positive and negative valences (each offset
+        # by one, as it does), the count of sentiment tokens, and the raw sum
+        self.weights = np.column_stack([np.where(valence > 0, valence + 1, 0),
+                                        np.where(valence < 0, valence - 1, 0),
+                                        (valence != 0).astype(float), valence])
+
+    def score_matrix(self, texts):
+        """
+        Score texts.
+
+        Parameters:
+        texts (list): the texts.
+
+        Returns:
+        np.ndarray: one row per text, the columns of SCORE_COLUMNS (unrounded).
+        """
+        texts = [str(text) for text in texts]
+        counts = self.vectorizer.transform(texts)
+        pos_sum, neg_sum, sentiment_tokens, total = (counts @ self.weights).T
+        token_counts = np.array([len(_TOKEN.findall(text)) for text in texts], dtype=float)
+        neu_count = token_counts - sentiment_tokens
+
+        emphasis = _punctuation_emphasis(texts)
+        total = total + np.sign(total) * emphasis
+        compound = np.clip(total / np.sqrt(total * total + NORMALIZE_ALPHA), -1, 1)
+        more_positive, more_negative = pos_sum > -neg_sum, pos_sum < -neg_sum
+        pos_sum = pos_sum + np.where(more_positive, emphasis, 0)
+        neg_sum = neg_sum - np.where(more_negative, emphasis, 0)
+        denominator = pos_sum - neg_sum + neu_count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = np.abs(np.column_stack([neg_sum, neu_count, pos_sum]) / denominator[:, None])
+        scores = np.column_stack([np.nan_to_num(scores), compound])
+        scores[token_counts == 0] = 0.0
+        return scores
+
+    def score(self, texts):
+        """
+        Score texts, in the format of SentimentIntensityAnalyzer.polarity_scores.
+
+        Parameters:
+        texts (list): the texts.
+
+        Returns:
+        list: a dictionary of 'neg', 'neu', 'pos' (rounded to 3 decimals) and
+              'compound' (rounded to 4) per text.
+        """
+        scores = self.score_matrix(texts)
+        scores[:, :3] = np.round(scores[:, :3], 3)
+        scores[:, 3] = np.round(scores[:, 3], 4)
+        return [dict(zip(SCORE_COLUMNS, row)) for row in scores.tolist()]
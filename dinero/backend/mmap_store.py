@@ -0,0 +1,202 @@
+"""
+mmap_store module: fixed-layout binary mirror of the price tables for
+zero-copy reads.
+
+Each ticker is mirrored in `{DEFAULT_DATABASE_PATH}/mmap/{TICKER}/` as one
+`.npy` file per column (Date as datetime64[ns], prices as stored) plus a
+small `header.json` holding the row count, the column dtypes and the version
+of the source table. Arrays are opened with numpy memory mapping, so several
+worker processes reading the same ticker share the pages of the OS page
+cache instead of each holding a private copy.
+
+The mirror is rebuilt lazily: load_mmap_arrays rewrites it whenever the
+source table has changed since it was written.
+
+Classes:
+    1. MappedPrices
+
+Functions:
+    1. write_mmap_arrays(ticker_symbol)
+    2. load_mmap_arrays(ticker_symbol, columns=None)
+    3. load_price_frame(ticker_symbol, columns=None)
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import backend.stock_data_manager as sdm
+from backend.atomic_file import atomic_replace
+
+MMAP_DIRECTORY = 'mmap'
+HEADER_FILE = 'header.json'
+DATE_COLUMN = 'Date'
+# Reads of a mirror before giving up on arrays that do not match their header.
+MMAP_LOAD_ATTEMPTS = 2
+
+
+def _mmap_path(ticker_symbol):
+    """Return the folder holding the memory-mapped arrays of a ticker."""
+    return os.path.join(sdm.DEFAULT_DATABASE_PATH, MMAP_DIRECTORY, ticker_symbol)
+
+
+def _array_file(column):
+    """Return the file name of the array holding a column."""
+    return f"{column.replace(' ', '_')}.npy"
+
+
+def _atomic_save(file_path, array):
+    """Save an array to a temporary file and move it over file_path."""
+    atomic_replace(file_path, lambda path: np.save(path, array), suffix='.npy')
+
+
+def _write_header(path, header):
+    """Write the header of a mirror as JSON."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(header, file)
+
+
+class MappedPrices:
+    """
+    Read-only, memory-mapped price columns of one ticker.
+
+    Attributes:
+    ticker_symbol (str): The stock ticker symbol.
+    dates (np.memmap): datetime64[ns] dates, one per row.
+    rows (int): number of rows.
+    columns (list): names of the mapped price columns.
+
+    Example:
+    >> prices = load_mmap_arrays('AAPL', ['Open', 'Close'])
+    >> prices['Close'][-5:]
+    """
+
+    def __init__(self, ticker_symbol, dates, arrays):
+        self.ticker_symbol = ticker_symbol
+        self.dates = dates
+        self.rows = len(dates)
+        self._arrays = arrays
+        self.columns = list(arrays)
+
+    def __getitem__(self, column):
+        if column == DATE_COLUMN:
+            return self.dates
+        return self._arrays[column]
+
+    def __len__(self):
+        return self.rows
+
+    def to_frame(self):
+        """
+        Return a DataFrame whose columns are views of the mapped arrays (no copy).
+
+        Returns:
+        pd.DataFrame: 'Date' followed by the mapped price columns.
+        """
+        return pd.DataFrame({DATE_COLUMN: self.dates, **self._arrays}, copy=False)
+
+
+def write_mmap_arrays(ticker_symbol):
+    """
+    Function to (re)write the memory-mapped mirror of a stored ticker.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol.
+
+    Returns:
+    dict: the written header (rows, column dtypes and source version).
+
+    Exceptions:
+    TypeError if ticker_symbol is not a string
+    ValueError if ticker not in database
+    """
+    stock_data = sdm.get_stock_data(ticker_symbol)
+    ticker_symbol = ticker_symbol.upper()
+    version = sdm.get_price_store().version(ticker_symbol)
+    folder = _mmap_path(ticker_symbol)
+    os.makedirs(folder, exist_ok=True)
+
+    dates = sdm.get_date_index(ticker_symbol)
+    _atomic_save(os.path.join(folder, _array_file(DATE_COLUMN)), dates)
+    columns = {}
+    for column in stock_data.columns:
+        if column == DATE_COLUMN:
+            continue
+        array = stock_data[column].to_numpy()
+        _atomic_save(os.path.join(folder, _array_file(column)), array)
+        columns[column] = array.dtype.str
+
+    header = {'rows': len(dates), 'columns': columns, 'version': list(version)}
+    atomic_replace(os.path.join(folder, HEADER_FILE), lambda path: _write_header(path, header))
+    return header
+
+
+def _read_header(folder):
+    """Return the header of a mirror folder, None if there is no mirror."""
+    try:
+        with open(os.path.join(folder, HEADER_FILE), encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def load_mmap_arrays(ticker_symbol, columns=None):
+    """
+    Function to open the memory-mapped price columns of a ticker.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol.
+    columns (list, optional): Price columns to map (e.g. ['Close']).
+                              Defaults to None (all columns).
+
+    Returns:
+    MappedPrices: read-only arrays backed by the mirror files.
+
+    Exceptions:
+    TypeError if ticker_symbol is not a string
+    ValueError if ticker not in database or a column does not exist
+    OSError if the arrays still do not match the header once rewritten
+    """
+    if not isinstance(ticker_symbol, str):
+        raise TypeError("ticker symbol must be strings.")
+    ticker_symbol = ticker_symbol.upper()
+    store = sdm.get_price_store()
+    if not store.exists(ticker_symbol):
+        raise ValueError("No such database. Please download initial data first.")
+
+    folder = _mmap_path(ticker_symbol)
+    header = _read_header(folder)
+    for attempt in range(MMAP_LOAD_ATTEMPTS):
+        if attempt or header is None or tuple(header['version']) != store.version(ticker_symbol):
+            header = write_mmap_arrays(ticker_symbol)
+
+        if columns is None:
+            columns = list(header['columns'])
+        missing = [column for column in columns if column not in header['columns']]
+        if missing:
+            raise ValueError(f"Columns not stored for {ticker_symbol}: {missing}")
+
+        dates = np.load(os.path.join(folder, _array_file(DATE_COLUMN)), mmap_mode='r')
+        arrays = {column: np.load(os.path.join(folder, _array_file(column)), mmap_mode='r')
+                  for column in columns}
+        if all(len(array) == header['rows'] for array in (dates, *arrays.values())):
+            return MappedPrices(ticker_symbol, dates, arrays)
+        # the mirror is being rewritten by another process: rewrite it and read it again
+    raise OSError(f"Memory-mapped arrays of {ticker_symbol} do not match their header "
+                  f"after {MMAP_LOAD_ATTEMPTS} attempts: {folder}")
+
+
+def load_price_frame(ticker_symbol, columns=None):
+    """
+    Function to fetch the stock data of a ticker as a DataFrame backed by the
+    memory-mapped arrays, usable by backend.technical_indicators as is.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol.
+    columns (list, optional): Price columns to map. Defaults to None (all columns).
+
+    Returns:
+    pd.DataFrame: 'Date' (datetime64) followed by the price columns.
+    """
+    return load_mmap_arrays(ticker_symbol, columns).to_frame()
@@ -0,0 +1,188 @@
+"""
+news_cache module: persistent cache of news API responses.
+
+Responses are stored per (ticker, date) in a SQLite database,
+`{DEFAULT_DATABASE_PATH}/.cache/news_v2.sqlite3`, so reruns of the app and
+restarts do not request the same news again:
+
+    - news fetched at least NEWS_SETTLED_DAYS after its date is historical
+      and never expires; news of recent dates expires after NEWS_CACHE_TTL;
+    - empty responses expire after NEWS_EMPTY_TTL and failed requests after
+      NEWS_ERROR_TTL (negative caching), so they are retried but not in a loop;
+    - date mode requests the first page of articles of a date only, range mode
+      every page: range mode requests again the dates cached with a single page.
+
+Functions:
+    1. get_cached_news_articles(ticker, date, session=None)
+    2. fetch_cached_news(ticker, dates, mode='date', max_workers=NEWS_MAX_WORKERS,
+                         session=None)
+    3. get_news_cache_stats()
+    4. clear_news_cache(ticker_symbol=None)
+"""
+import json
+import os
+import time
+from datetime import date as calendar_date, datetime, timedelta, timezone
+
+from backend.req import NEWS_FETCH_MODES, NEWS_MAX_WORKERS, fetch_news_by_date, fetch_news_by_range
+from backend.sqlite_cache import SQLiteCache
+
+# v2: the entries record whether they hold every page of articles of their date.
+NEWS_CACHE_FILE = os.path.join('.cache', 'news_v2.sqlite3')
+# Seconds before the news of a recent date is requested again.
+NEWS_CACHE_TTL = 60 * 60
+# News fetched this many days after its date is complete and never expires.
+NEWS_SETTLED_DAYS = 2
+# Seconds before an empty response, or a failed request, is retried.
+NEWS_EMPTY_TTL = 6 * 60 * 60
+NEWS_ERROR_TTL = 5 * 60
+
+_SCHEMA = '''CREATE TABLE IF NOT EXISTS news (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    articles TEXT,
+    fetched_at REAL NOT NULL,
+    complete INTEGER NOT NULL,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID'''
+
+_cache = SQLiteCache('News', NEWS_CACHE_FILE, 'news', _SCHEMA,
+                     ['hits', 'negative_hits', 'misses', 'expired', 'writes'])
+
+
+def _status(response):
+    """Return how a response is cached: 'ok', 'empty' or 'error' (failed or malformed)."""
+    if not isinstance(response, list):
+        return 'error'
+    return 'ok' if response else 'empty'
+
+
+def _is_settled(date, fetched_at):
+    """Return whether news of date fetched at fetched_at (a timestamp) is historical."""
+    try:
+        day = calendar_date.fromisoformat(date)
+    except ValueError:
+        return False
+    fetched_day = datetime.fromtimestamp(fetched_at, tz=timezone.utc).date()
+    return fetched_day >= day + timedelta(days=NEWS_SETTLED_DAYS)
+
+
+def _is_fresh(status, date, fetched_at, now):
+    """Return whether a cached response can still be served at now."""
+    if status == 'error':
+        return now - fetched_at < NEWS_ERROR_TTL
+    if status == 'empty':
+        return now - fetched_at < NEWS_EMPTY_TTL
+    return _is_settled(date, fetched_at) or now - fetched_at < NEWS_CACHE_TTL
+
+
+def _lookup(ticker, dates, complete_only=False):
+    """
+    Return the fresh cached responses of ticker on dates, keyed by date; with
+    complete_only, without the articles that are the first page only.
+    """
+    rows = _cache.lookup(['date', 'status', 'articles', 'fetched_at', 'complete'], 'date', dates,
+                         ticker=ticker)
+    now = time.time()
+    cached = {}
+    for date, status, articles, fetched_at, complete in rows:
+        if not _is_fresh(status, date, fetched_at, now):
+            _cache.count('expired')
+            continue
+        if complete_only and status == 'ok' and not complete:
+            continue
+        cached[date] = json.loads(articles) if status == 'ok' else [] if status == 'empty' else None
+        _cache.count('hits' if status == 'ok' else 'negative_hits')
+    _cache.count('misses', len(dates) - len(cached))
+    return cached
+
+
+def _store(ticker, responses, complete):
+    """Cache the responses of ticker, keyed by date, holding every page if complete."""
+    fetched_at = time.time()
+    _cache.store([(ticker, date, _status(response),
+                   json.dumps(response) if _status(response) == 'ok' else None, fetched_at,
+                   int(complete or _status(response) != 'ok'))
+                  for date, response in responses.items()])
+
+
+def fetch_cached_news(ticker, dates, mode='date', max_workers=NEWS_MAX_WORKERS, session=None):
+    """
+    Function to retrieve the news articles of a ticker on several dates, requesting
+    only the dates that are not cached (or whose cached response expired).
+
+    Parameters:
+    ticker (str): The stock ticker symbol.
+    dates (list): dates in the format 'YYYY-MM-DD'.
+    mode (str, optional): 'date' to request the missing dates with
+                          req.fetch_news_by_date, 'range' with req.fetch_news_by_range;
+                          range mode does not serve the first pages cached by date mode.
+                          Defaults to 'date'.
+    max_workers (int, optional): requests in flight at once. Defaults to NEWS_MAX_WORKERS.
+    session (requests.Session, optional): session to send the requests with.
+                                          Defaults to None (the shared session).
+
+    Returns:
+    dict: the articles of every date, keyed by date in the order of dates;
+          None for the dates whose request failed.
+
+    Exceptions:
+    ValueError if mode is not one of NEWS_FETCH_MODES
+    """
+    if mode not in NEWS_FETCH_MODES:
+        raise ValueError(f"Unknown news fetch mode: {mode}")
+    dates = list(dict.fromkeys(dates))
+    key = ticker.upper()
+    cached = _lookup(key, dates, complete_only=mode == 'range')
+    missing = [date for date in dates if date not in cached]
+    if missing:
+        fetch_news = fetch_news_by_range if mode == 'range' else fetch_news_by_date
+        fetched = fetch_news(ticker, missing, max_workers=max_workers, session=session)
+        _store(key, fetched, complete=mode == 'range')
+        cached.update(fetched)
+    return {date: cached[date] for date in dates}
+
+
+def get_cached_news_articles(ticker, date, session=None):
+    """
+    Function to retrieve the news articles of a ticker on a date, as
+    req.get_news_articles, through the cache.
+
+    Parameters:
+    ticker (str): The stock ticker symbol.
+    date (str): date in the format 'YYYY-MM-DD'.
+    session (requests.Session, optional): session to send the request with.
+                                          Defaults to None (the shared session).
+
+    Returns:
+    list: the articles of the date, None if the request failed.
+    """
+    return fetch_cached_news(ticker, [date], session=session)[date]
+
+
+def get_news_cache_stats():
+    """
+    Function to get the counters of the news cache.
+
+    Returns:
+    dict: hits (articles served from the cache), negative_hits (cached empty
+          or failed responses), misses (dates requested from the API, expired
+          ones included), expired, writes and the number of cached entries.
+    """
+    return _cache.stats()
+
+
+def clear_news_cache(ticker_symbol=None):
+    """
+    Function to drop the cached news of a ticker (or of every ticker if None).
+
+    Parameters:
+    ticker_symbol (str, optional): The stock ticker symbol. Defaults to None.
+
+    Returns:
+    int: number of dropped entries.
+    """
+    if ticker_symbol is None:
+        return _cache.clear()
+    return _cache.clear(ticker=ticker_symbol.upper())
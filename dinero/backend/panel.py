@@ -0,0 +1,99 @@
+"""
+panel module: load many tickers at once, aligned on a common date index.
+
+Cross-ticker work (correlations, screeners, portfolio views) reads every
+ticker concurrently and places their values into one preallocated block by
+binary-searching each ticker's dates in the common index, instead of
+joining N DataFrames one by one.
+
+Functions:
+    1. get_panel(ticker_symbols, columns=('Close',), start_date='', end_date='',
+                 how='outer', as_array=False)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from backend.stock_data_manager import get_filtered_stock_data
+
+# Number of tickers loaded concurrently.
+PANEL_MAX_WORKERS = 8
+
+
+def _load_ticker(ticker_symbol, columns, start_date, end_date):
+    """Load the dates (datetime64) and the requested columns of one ticker."""
+    stock_data = get_filtered_stock_data(ticker_symbol, start_date, end_date, list(columns))
+    dates = pd.DatetimeIndex(pd.to_datetime(stock_data['Date'])).tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]'), stock_data[list(columns)].to_numpy(np.float64)
+
+
+def _align_dates(all_dates, how):
+    """Return the union ('outer') or intersection ('inner') of sorted date vectors."""
+    if not all_dates:
+        return np.array([], dtype='datetime64[ns]')
+    if how == 'outer':
+        return reduce(np.union1d, all_dates)
+    return reduce(np.intersect1d, all_dates)
+
+
+def _fill_block(dates, loaded, n_columns):
+    """
+    Place the values of every ticker into one (dates, columns * tickers) block,
+    locating each ticker's dates in the common index by binary search.
+    """
+    block = np.full((len(dates), n_columns, len(loaded)), np.nan)
+    for position, (ticker_dates, values) in enumerate(loaded):
+        keep = np.isin(ticker_dates, dates)
+        rows = np.searchsorted(dates, ticker_dates[keep])
+        block[rows, :, position] = values[keep]
+    return block.reshape(len(dates), n_columns * len(loaded))
+
+
+def get_panel(ticker_symbols, columns=('Close',), start_date='', end_date='', # pylint: disable=too-many-arguments
+              how='outer', as_array=False):
+    """
+    Function to fetch several tickers as one wide panel aligned on dates.
+
+    Parameters:
+    ticker_symbols (list): ticker symbol strings.
+    columns (list or tuple): price columns to load. Defaults to ('Close',).
+    start_date (str, optional): first date in 'yyyy-mm-dd' format (inclusive).
+                                Defaults to '' (first stored date).
+    end_date (str, optional): last date in 'yyyy-mm-dd' format (inclusive).
+                              Defaults to '' (last stored date).
+    how (str): 'outer' aligns on the union of the dates (missing values are NaN),
+               'inner' on the dates shared by every ticker. Defaults to 'outer'.
+    as_array (bool): return numpy arrays instead of a DataFrame. Defaults to False.
+
+    Returns:
+    pd.DataFrame (as_array=False): indexed by Date, with (column, ticker) MultiIndex
+        columns, e.g. panel['Close'] holds one column per ticker.
+    tuple (as_array=True): (dates, block) where dates is a datetime64[ns] vector
+        and block a float64 array of shape (len(dates), len(columns) * len(tickers)),
+        ordered like the DataFrame columns (all tickers of the first column first).
+
+    Exceptions:
+    TypeError if a ticker symbol is not a string
+    ValueError if a ticker is not in database, a date is invalid
+        or how is not 'outer' or 'inner'.
+    """
+    if how not in ('outer', 'inner'):
+        raise ValueError("how must be 'outer' or 'inner'.")
+    if not all(isinstance(ticker_symbol, str) for ticker_symbol in ticker_symbols):
+        raise TypeError("ticker symbol must be strings.")
+    tickers = list(dict.fromkeys(ticker_symbol.upper() for ticker_symbol in ticker_symbols))
+    columns = list(columns)
+
+    with ThreadPoolExecutor(max_workers=PANEL_MAX_WORKERS) as executor:
+        loaded = list(executor.map(lambda ticker: _load_ticker(ticker, columns, start_date,
+                                                               end_date), tickers))
+    dates = _align_dates([ticker_dates for ticker_dates, _ in loaded], how)
+
+    block = _fill_block(dates, loaded, len(columns))
+
+    if as_array:
+        return dates, block
+    return pd.DataFrame(block, index=pd.DatetimeIndex(dates, name='Date'),
+                        columns=pd.MultiIndex.from_product([columns, tickers]))
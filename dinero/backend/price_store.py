@@ -0,0 +1,312 @@
+"""
+price_store module: pluggable on-disk storage for daily stock price tables.
+
+Every ticker is stored as one table with a `Date` column followed by the
+price columns returned by yfinance (Open, High, Low, Close, Adj Close, Volume).
+Rows are kept in ascending date order, so date ranges map to row ranges.
+Writes go to a temporary file that atomically replaces the stored table, so
+readers never observe a partially written table.
+
+Classes:
+    1. CsvPriceStore(base_path)
+    2. ParquetPriceStore(base_path)
+
+Functions:
+    1. get_price_store(storage_format='csv', base_path='data')
+    2. migrate_csv_to_parquet(base_path='data', remove_csv=False)
+
+Example Usage:
+    $ python -m backend.price_store migrate --remove-csv
+"""
+import argparse
+import os
+import shutil
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from backend.atomic_file import atomic_replace
+
+DATE_COLUMN = 'Date'
+SUPPORTED_FORMATS = ('csv', 'parquet')
+# Rows per Parquet row group: the unit read_rows can skip without decoding.
+ROW_GROUP_SIZE = 1024
+# Bytes read from the end of a CSV file to find its last row.
+TAIL_BLOCK_SIZE = 4096
+
+
+def _to_table(data):
+    """
+    Normalize a yfinance-style DataFrame (dates in the index) into a table
+    with an explicit `Date` column.
+    """
+    if DATE_COLUMN in data.columns:
+        return data.reset_index(drop=True)
+    table = data.reset_index()
+    return table.rename(columns={table.columns[0]: DATE_COLUMN})
+
+
+class CsvPriceStore:
+    """
+    Plain text storage: one `{TICKER}.csv` file per ticker.
+
+    Dates are kept as 'yyyy-mm-dd' strings, exactly as written by yfinance.
+    """
+    extension = '.csv'
+
+    def __init__(self, base_path='data'):
+        self.base_path = base_path
+
+    def file_path(self, ticker_symbol):
+        """Return the path of the file holding the given ticker."""
+        return os.path.join(self.base_path, f'{ticker_symbol}{self.extension}')
+
+    def exists(self, ticker_symbol):
+        """Return True if the ticker is stored."""
+        return os.path.exists(self.file_path(ticker_symbol))
+
+    def version(self, ticker_symbol):
+        """
+        Return a token that changes whenever the stored table of a ticker changes.
+
+        Returns:
+        tuple: (modification time in ns, file size in bytes).
+        """
+        stat = os.stat(self.file_path(ticker_symbol))
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def list_tickers(self):
+        """Return the list of stored ticker symbols."""
+        if not os.path.exists(self.base_path):
+            return []
+        return [file[:-len(self.extension)] for file in os.listdir(self.base_path)
+                if file.endswith(self.extension)]
+
+    def column_names(self, ticker_symbol):
+        """Return the stored column names of a ticker, `Date` first."""
+        return list(pd.read_csv(self.file_path(ticker_symbol), nrows=0).columns)
+
+    def read(self, ticker_symbol, columns=None):
+        """
+        Read the stored table of a ticker.
+
+        Parameters:
+        ticker_symbol (str): The stock ticker symbol.
+        columns (list, optional): Price columns to load, `Date` is always included.
+                                  Defaults to None (all columns).
+
+        Returns:
+        pd.DataFrame: The stored price table.
+        """
+        file_path = self.file_path(ticker_symbol)
+        if columns is None:
+            return pd.read_csv(file_path)
+        return pd.read_csv(file_path, usecols=[DATE_COLUMN, *columns])
+
+    def read_rows(self, ticker_symbol, start_row, stop_row, columns=None):
+        """
+        Read the rows [start_row, stop_row) of the stored table of a ticker.
+
+        Skipped lines are not converted to numbers, only the requested rows are.
+
+        Returns:
+        pd.DataFrame: The requested rows, indexed by their row positions.
+        """
+        file_path = self.file_path(ticker_symbol)
+        usecols = None if columns is None else [DATE_COLUMN, *columns]
+        rows = pd.read_csv(file_path, usecols=usecols, skiprows=range(1, start_row + 1),
+                           nrows=max(stop_row - start_row, 0))
+        rows.index = pd.RangeIndex(start_row, start_row + len(rows))
+        return rows
+
+    def last_date(self, ticker_symbol):
+        """
+        Return the date of the last stored row of a ticker, reading only the
+        end of the file.
+
+        Returns:
+        pd.Timestamp or None if the table has no rows.
+        """
+        with open(self.file_path(ticker_symbol), 'rb') as file:
+            size = file.seek(0, os.SEEK_END)
+            block_size = min(size, TAIL_BLOCK_SIZE)
+            while True:
+                file.seek(size - block_size)
+                lines = [line for line in file.read(block_size).splitlines() if line.strip()]
+                # The first line of a partial block may be truncated, the last one is not.
+                if len(lines) >= 2 or block_size == size:
+                    break
+                block_size = min(size, block_size * 2)
+        if len(lines) == 0:
+            return None
+        last_value = lines[-1].split(b',')[0].decode()
+        if last_value == DATE_COLUMN:
+            return None
+        return pd.Timestamp(last_value)
+
+    def write(self, ticker_symbol, data):
+        """Replace the stored table of a ticker with data."""
+        os.makedirs(self.base_path, exist_ok=True)
+        atomic_replace(self.file_path(ticker_symbol), data.to_csv)
+
+    def append(self, ticker_symbol, data):
+        """
+        Append the rows of data (dates in the index, as returned by yfinance)
+        to the stored table of a ticker.
+        """
+        file_path = self.file_path(ticker_symbol)
+        data = data.reindex(columns=self.column_names(ticker_symbol)[1:])
+
+        def copy_and_append(temporary_path):
+            shutil.copyfile(file_path, temporary_path)
+            data.to_csv(temporary_path, mode='a', header=False)
+
+        atomic_replace(file_path, copy_and_append)
+
+
+class ParquetPriceStore(CsvPriceStore):
+    """
+    Columnar storage: one `{TICKER}.parquet` file per ticker.
+
+    Prices are stored as typed binary columns and `Date` as a timestamp, so
+    reads skip text parsing and only decode the requested columns.
+    """
+    extension = '.parquet'
+
+    def column_names(self, ticker_symbol):
+        """Return the stored column names of a ticker, `Date` first."""
+        return pq.read_schema(self.file_path(ticker_symbol)).names
+
+    def read(self, ticker_symbol, columns=None):
+        """
+        Read the stored table of a ticker.
+
+        Parameters:
+        ticker_symbol (str): The stock ticker symbol.
+        columns (list, optional): Price columns to load, `Date` is always included.
+                                  Defaults to None (all columns).
+
+        Returns:
+        pd.DataFrame: The stored price table, with `Date` as datetime64.
+        """
+        if columns is not None:
+            columns = [DATE_COLUMN, *columns]
+        return pd.read_parquet(self.file_path(ticker_symbol), columns=columns)
+
+    def read_rows(self, ticker_symbol, start_row, stop_row, columns=None):
+        """
+        Read the rows [start_row, stop_row) of the stored table of a ticker.
+
+        Only the row groups overlapping the range are decoded.
+
+        Returns:
+        pd.DataFrame: The requested rows, indexed by their row positions.
+        """
+        parquet_file = pq.ParquetFile(self.file_path(ticker_symbol))
+        row_groups, first_row, offset = [], start_row, 0
+        for group in range(parquet_file.metadata.num_row_groups):
+            num_rows = parquet_file.metadata.row_group(group).num_rows
+            if offset < stop_row and offset + num_rows > start_row:
+                if not row_groups:
+                    first_row = offset
+                row_groups.append(group)
+            offset += num_rows
+
+        if columns is not None:
+            columns = [DATE_COLUMN, *columns]
+        rows = parquet_file.read_row_groups(row_groups, columns=columns).to_pandas()
+        rows = rows.iloc[start_row - first_row:stop_row - first_row]
+        rows.index = pd.RangeIndex(start_row, start_row + len(rows))
+        return rows
+
+    def last_date(self, ticker_symbol):
+        """
+        Return the date of the last stored row of a ticker, decoding only the
+        `Date` column of the last row group.
+
+        Returns:
+        pd.Timestamp or None if the table has no rows.
+        """
+        parquet_file = pq.ParquetFile(self.file_path(ticker_symbol))
+        num_row_groups = parquet_file.metadata.num_row_groups
+        if parquet_file.metadata.num_rows == 0:
+            return None
+        dates = parquet_file.read_row_group(num_row_groups - 1, columns=[DATE_COLUMN])
+        return pd.Timestamp(dates.column(DATE_COLUMN)[-1].as_py())
+
+    def write(self, ticker_symbol, data):
+        """Replace the stored table of a ticker with data."""
+        os.makedirs(self.base_path, exist_ok=True)
+        table = _to_table(data)
+        table[DATE_COLUMN] = pd.to_datetime(table[DATE_COLUMN])
+        atomic_replace(self.file_path(ticker_symbol),
+                       lambda path: table.to_parquet(path, index=False,
+                                                     row_group_size=ROW_GROUP_SIZE))
+
+    def append(self, ticker_symbol, data):
+        """Append the rows of data to the stored table of a ticker."""
+        table = _to_table(data)
+        table[DATE_COLUMN] = pd.to_datetime(table[DATE_COLUMN])
+        combined = pd.concat([self.read(ticker_symbol), table], ignore_index=True)
+        self.write(ticker_symbol, combined)
+
+
+def get_price_store(storage_format='csv', base_path='data'):
+    """
+    Function to create the price store for a storage format.
+
+    Parameters:
+    storage_format (str): 'csv' or 'parquet'. Defaults to 'csv'.
+    base_path (str): Folder holding the stored tables. Defaults to 'data'.
+
+    Returns:
+    CsvPriceStore or ParquetPriceStore
+
+    Exceptions:
+    ValueError if storage_format is not supported.
+    """
+    if storage_format == 'csv':
+        return CsvPriceStore(base_path)
+    if storage_format == 'parquet':
+        return ParquetPriceStore(base_path)
+    raise ValueError(f"storage format must be one of {SUPPORTED_FORMATS}.")
+
+
+def migrate_csv_to_parquet(base_path='data', remove_csv=False):
+    """
+    Function to convert every CSV table in base_path to Parquet (one-shot migration).
+
+    Parameters:
+    base_path (str): Folder holding the stored tables. Defaults to 'data'.
+    remove_csv (bool): Delete each CSV file once converted. Defaults to False.
+
+    Returns:
+    list: list of migrated ticker symbol strings.
+    """
+    csv_store = CsvPriceStore(base_path)
+    parquet_store = ParquetPriceStore(base_path)
+    migrated = []
+    for ticker_symbol in csv_store.list_tickers():
+        parquet_store.write(ticker_symbol, csv_store.read(ticker_symbol))
+        if remove_csv:
+            os.remove(csv_store.file_path(ticker_symbol))
+        migrated.append(ticker_symbol)
+    return migrated
+
+
+def main(argv=None):
+    """Command line entry point of the price store."""
+    parser = argparse.ArgumentParser(description='Manage the dinero price store.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    migrate_parser = subparsers.add_parser('migrate', help='convert CSV tables to Parquet')
+    migrate_parser.add_argument('--path', default='data', help='database folder')
+    migrate_parser.add_argument('--remove-csv', action='store_true',
+                                help='delete CSV files after conversion')
+    args = parser.parse_args(argv)
+
+    migrated = migrate_csv_to_parquet(args.path, args.remove_csv)
+    print(f"Migrated {len(migrated)} tickers to Parquet: {', '.join(migrated)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,9 +6,20 @@ This module provides functions for analyzing financial data related to stocks.
 Functions:
     - process_dict_to_df: Processes sentiment data from a dictionary to a pandas DataFrame.
     - get_sentiments: Retrieves sentiment analysis for a given stock symbol and percent change.
+    - get_keywords: Retrieves the top keywords and entities of the news of significant events.
+    - warm_news_cache: Fetches the news of several stocks into the news cache ahead of time.
+    - main: Command line entry point warming the news cache.
+
+Example Usage (from the dinero folder):
+    $ python -m backend.processing AAPL MSFT --percent-change 5
 """
-import os
+import argparse
+
 import pandas as pd
+from backend.keyword_extraction import KEYWORD_TOP_N, aggregate_keywords
+from backend.news_cache import get_news_cache_stats
+from backend.req import NEWS_FETCH_MODES
+from backend.stock_data_manager import get_existing_tickers, get_price_store
 from backend.transform import get_filter_dates
 from backend.sentiment_analysis import get_sentiment_value
 
@@ -48,13 +59,15 @@ def process_dict_to_df(sentiment_data):
     return formatted_df
 
 
-def get_sentiments(stock_symbol, percent_change):
+def get_sentiments(stock_symbol, percent_change, scorer='vader'):
     """
     Retrieves sentiment analysis for a given stock symbol and percent change.
 
     Args:
         stock_symbol (str): The stock symbol for which sentiment analysis is to be retrieved.
         percent_change (float): The percent change threshold for filtering dates.
+        scorer (str): 'vader', or 'lexicon' for the vectorized raw lexicon scores
+                      (see sentiment_analysis.get_sentiment_value). Defaults to 'vader'.
 
     Returns:
         pd.DataFrame or None: A DataFrame containing sentiment analysis data,
@@ -66,11 +79,12 @@ def get_sentiments(stock_symbol, percent_change):
             raise ValueError("percent_change argument is None")
         if stock_symbol is None:
             raise ValueError("stock_symbol argument is None")
-        file_path = os.path.join("data", f"{stock_symbol}.csv")
-        dates_dictionary = get_filter_dates(file_path, percent_change, stock_symbol)
+        file_path = get_price_store().file_path(stock_symbol)
+        dates_dictionary = get_filter_dates(file_path, percent_change, stock_symbol,
+                                            mode='range', cached=True)
 
         for key, value in dates_dictionary.items():
-            sentiment_data[key] = get_sentiment_value(value)
+            sentiment_data[key] = get_sentiment_value(value, cached=True, scorer=scorer)
 
         data_frame = process_dict_to_df(sentiment_data=sentiment_data)
         return data_frame
@@ -78,3 +92,77 @@ def get_sentiments(stock_symbol, percent_change):
     except ValueError as error:
         print(f"Value Error raised: {error}")
         return None
+
+
+def get_keywords(stock_symbol, percent_change, top_n=KEYWORD_TOP_N):
+    """
+    Retrieves the keywords and named entities most mentioned in the news of the
+    dates with a significant price change of a stock.
+
+    Args:
+        stock_symbol (str): The stock symbol for which keywords are to be retrieved.
+        percent_change (float): The percent change threshold for filtering dates.
+        top_n (int): terms kept per date, None for all. Defaults to KEYWORD_TOP_N.
+
+    Returns:
+        pd.DataFrame or None: the terms per date, see keyword_extraction.aggregate_keywords,
+                            or None if an error occurs.
+    """
+    try:
+        if percent_change is None:
+            raise ValueError("percent_change argument is None")
+        if stock_symbol is None:
+            raise ValueError("stock_symbol argument is None")
+        file_path = get_price_store().file_path(stock_symbol)
+        dates_dictionary = get_filter_dates(file_path, percent_change, stock_symbol,
+                                            mode='range', cached=True)
+        return aggregate_keywords(dates_dictionary, stock_symbol, top_n, cached=True)
+
+    except ValueError as error:
+        print(f"Value Error raised: {error}")
+        return None
+
+
+def warm_news_cache(stock_symbols, percent_change, mode='range'):
+    """
+    Fetches the news of the dates get_sentiments looks at into the news cache,
+    so the app serves them without waiting for the news API.
+
+    Args:
+        stock_symbols (list): The stock symbols to fetch the news of.
+        percent_change (float): The percent change threshold for filtering dates.
+        mode (str): how the news are requested, see transform.get_filter_dates.
+                    Defaults to 'range'.
+
+    Returns:
+        dict: the number of dates with articles, keyed by stock symbol.
+    """
+    warmed = {}
+    for stock_symbol in stock_symbols:
+        file_path = get_price_store().file_path(stock_symbol)
+        dates_dictionary = get_filter_dates(file_path, percent_change, stock_symbol,
+                                            mode=mode, cached=True)
+        warmed[stock_symbol] = sum(1 for articles in dates_dictionary.values() if articles)
+    return warmed
+
+
+def main(argv=None):
+    """Command line entry point warming the news cache."""
+    parser = argparse.ArgumentParser(description='Fetch news into the news cache.')
+    parser.add_argument('tickers', nargs='*',
+                        help='stock symbols to warm (default: every stored ticker)')
+    parser.add_argument('--percent-change', type=float, default=5,
+                        help='daily price change selecting the news dates')
+    parser.add_argument('--mode', choices=NEWS_FETCH_MODES, default='range',
+                        help='request every date on its own or windows of dates')
+    args = parser.parse_args(argv)
+
+    stock_symbols = [ticker.upper() for ticker in args.tickers] or get_existing_tickers()
+    for stock_symbol, dates in warm_news_cache(stock_symbols, args.percent_change,
+                                               args.mode).items():
+        print(f'{stock_symbol}: {dates} dates with articles')
+    print(get_news_cache_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+rate_limit module: client-side protection of a rate-limited, sometimes unavailable API.
+
+TokenBucket spaces requests out to a sustained rate with bursts of up to its
+capacity. With a state file, the bucket is shared by every thread and process
+using the same file (through an exclusive file lock, on POSIX systems);
+otherwise by the threads of this process.
+
+CircuitBreaker fails fast once an API keeps failing: after failure_threshold
+consecutive failures requests are refused for reset_timeout seconds, then a
+single trial request decides whether to close the circuit again.
+
+Classes:
+    1. TokenBucket(rate, capacity, state_path=None)
+    2. CircuitBreaker(failure_threshold, reset_timeout)
+"""
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: the bucket is only shared by the threads of a process
+    fcntl = None  # pylint: disable=invalid-name
+
+_STATE_FORMAT = '<dd'  # tokens, time of the last refill
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens per second, holding at most capacity tokens.
+
+    Parameters:
+    rate (float): sustained requests per second.
+    capacity (float): largest burst of requests.
+    state_path (str, optional): file holding the bucket, shared by the processes
+                                using it. Defaults to None (this process only).
+
+    Example:
+    >> bucket = TokenBucket(rate=5, capacity=10)
+    >> if bucket.acquire(timeout=10):
+    >>     send_request()
+    """
+
+    def __init__(self, rate, capacity, state_path=None):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._state = (float(capacity), time.time())
+
+    def _read_state(self, file):
+        if file is None:
+            return self._state
+        file.seek(0)
+        data = file.read(struct.calcsize(_STATE_FORMAT))
+        if len(data) < struct.calcsize(_STATE_FORMAT):
+            return float(self.capacity), time.time()
+        return struct.unpack(_STATE_FORMAT, data)
+
+    def _write_state(self, file, state):
+        if file is None:
+            self._state = state
+            return
+        file.seek(0)
+        file.truncate()
+        file.write(struct.pack(_STATE_FORMAT, *state))
+        file.flush()
+
+    def _update(self, tokens):
+        """Refill the bucket, take tokens if available; return the tokens there were."""
+        with self._lock:
+            file = None
+            if self.state_path is not None and fcntl is not None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+                file = open(self.state_path, 'a+b')  # pylint: disable=consider-using-with
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                available, updated = self._read_state(file)
+                now = time.time()
+                available = min(self.capacity, available + max(now - updated, 0) * self.rate)
+                taken = tokens if available >= tokens else 0
+                self._write_state(file, (available - taken, now))
+                return available
+            finally:
+                if file is not None:
+                    file.close()  # also releases the lock
+
+    def available(self):
+        """Return the tokens currently in the bucket."""
+        return self._update(0)
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Wait until tokens are available and take them.
+
+        Parameters:
+        tokens (float, optional): tokens to take. Defaults to 1.
+        timeout (float, optional): seconds to wait at most. Defaults to None (no limit).
+
+        Returns:
+        bool: True if the tokens were taken, False if they would not be
+              available within timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            available = self._update(tokens)
+            if available >= tokens:
+                return True
+            wait = (tokens - available) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if wait > remaining:
+                    return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over consecutive failures of an API.
+
+    Parameters:
+    failure_threshold (int): consecutive failures opening the circuit.
+    reset_timeout (float): seconds the circuit stays open before a trial request.
+
+    Example:
+    >> breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    >> if breaker.allow_request():
+    >>     breaker.record(send_request_succeeded())
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold, reset_timeout):
+        if failure_threshold < 1 or reset_timeout < 0:
+            raise ValueError("failure_threshold must be at least 1, reset_timeout non-negative.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        """Return 'closed', 'open' or 'half-open' (the reset timeout has passed)."""
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow_request(self):
+        """
+        Return whether a request may be sent: always while closed, never while
+        open, and a single trial request at a time while half-open.
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.OPEN or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record(self, success):
+        """Record the outcome of an allowed request."""
+        with self._lock:
+            self._trial_running = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
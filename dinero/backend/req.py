@@ -1,13 +1,232 @@
 """
 Module for retrieving news articles related to a specific stock ticker.
 
+Requests go through one pooled `requests.Session` (connections are kept alive
+and reused) with a connect/read timeout per request, and are retried with
+exponential backoff on connection errors, timeouts and 5xx responses.
+fetch_news_by_date fetches many dates concurrently over that session.
+
+fetch_news_by_range needs fewer requests: nearby event dates are grouped into
+windows, each window is requested once for all the tickers (paging through
+`offset`), and the articles are bucketed locally by publication date.
+
+Every request first takes a token from a rate limiter shared by the threads
+and processes of the host (NEWS_RATE_LIMIT requests per second), and is refused
+at once while the circuit breaker is open (after BREAKER_FAILURES consecutive
+retryable failures, for BREAKER_RESET_TIMEOUT seconds), so load on a slow or
+failing provider gives bounded latency instead of piling up timeouts. 429
+responses (too many requests) are retried through the rate limiter, each retry
+waiting for a token again.
+
+get_news_articles and get_news_range raise a NewsRequestError when they get no
+articles: CircuitOpenError and RateLimitedError for requests that were not
+sent, NewsAPIError for requests that failed. The fetch_news_by_* functions
+return None for the dates they could not get.
+
     Function :
     -   get_news_articles
+    -   fetch_news_by_date
+    -   get_news_range
+    -   group_dates
+    -   fetch_news_by_range
+    -   create_session
+    -   get_session
+    -   configure_news_limits
+    -   is_retryable
+
+    Classes :
+    -   NewsRequestError
+    -   CircuitOpenError
+    -   RateLimitedError
+    -   NewsAPIError
+    -   SessionRetry
 
 """
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date as calendar_date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.rate_limit import CircuitBreaker, TokenBucket
+
+NEWS_API_URL = 'https://eodhd.com/api/news'
+NEWS_API_TOKEN = os.environ.get('EODHD_API_TOKEN', 'demo')
+# (connect, read) timeouts of one request, in seconds.
+REQUEST_TIMEOUT = (3.05, 20)
+# Retries of a failed request, waiting RETRY_BACKOFF * 2 ** (retry - 1) seconds in between.
+REQUEST_RETRIES = 3
+RETRY_BACKOFF = 0.5
+# Retries of requests that could not connect (refused, unknown host), which rarely recover.
+CONNECT_RETRIES = 1
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Retryable statuses retried by the session; 429 is retried through the rate limiter.
+SESSION_RETRY_STATUS_CODES = (500, 502, 503, 504)
+# Concurrent requests of fetch_news_by_date, also the size of the connection pool.
+NEWS_MAX_WORKERS = 8
+# Articles per page of a range request (the API maximum) and pages read at most per range.
+NEWS_PAGE_LIMIT = 1000
+NEWS_MAX_PAGES = 20
+# Event dates at most NEWS_WINDOW_GAP_DAYS apart share a window of at most NEWS_WINDOW_MAX_DAYS.
+NEWS_WINDOW_GAP_DAYS = 7
+NEWS_WINDOW_MAX_DAYS = 31
+# 'date' requests every date on its own, 'range' windows of nearby dates.
+NEWS_FETCH_MODES = ('date', 'range')
+# Sustained requests per second and burst allowed by the provider's quota, shared through
+# NEWS_RATE_LIMIT_FILE by every process of the host, and the longest wait for a token.
+NEWS_RATE_LIMIT = float(os.environ.get('EODHD_RATE_LIMIT', 5))
+NEWS_RATE_BURST = 10
+NEWS_RATE_LIMIT_FILE = os.environ.get('EODHD_RATE_LIMIT_FILE',
+                                      os.path.join(tempfile.gettempdir(), 'dinero_news_rate'))
+NEWS_RATE_LIMIT_TIMEOUT = 10
+# Consecutive retryable failures opening the circuit, and seconds before a trial request.
+BREAKER_FAILURES = 5
+BREAKER_RESET_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+_session = None  # pylint: disable=invalid-name
+_session_lock = threading.Lock()
+_limits = {}
+
+
+class NewsRequestError(Exception):
+    """A request to the news API that returned no articles."""
+
+
+class CircuitOpenError(NewsRequestError):
+    """The request was not sent: the circuit breaker is open."""
+
+
+class RateLimitedError(NewsRequestError):
+    """The request was not sent: no rate limiter token within NEWS_RATE_LIMIT_TIMEOUT."""
+
+
+class NewsAPIError(NewsRequestError):
+    """
+    The request was sent and failed: connection error, timeout, error status
+    or malformed response.
+
+    Attributes:
+        retryable (bool): whether the request may succeed when sent again (see is_retryable).
+        status_code (int): HTTP status of the response, None without a response.
+        retry_after (float): seconds to wait before a retry asked by the response, or None.
+    """
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.retryable = is_retryable(error)
+        response = getattr(error, 'response', None)
+        self.status_code = None if response is None else response.status_code
+        retry_after = None if response is None else response.headers.get('Retry-After')
+        self.retry_after = float(retry_after) if str(retry_after).isdigit() else None
+
+
+class SessionRetry(Retry):
+    """Retry policy of the session, which leaves 429 responses to _request_news even
+    when they carry a Retry-After header."""
+
+    RETRY_AFTER_STATUS_CODES = Retry.RETRY_AFTER_STATUS_CODES - {429}
+
+
+def create_session(retries=REQUEST_RETRIES, backoff=RETRY_BACKOFF, pool_size=NEWS_MAX_WORKERS):
+    """
+    Create an HTTP session with a connection pool and retries with backoff.
+
+    Args:
+        retries (int): retries of a failed request (timeout or 5xx status, at most
+            CONNECT_RETRIES of them for connection errors). Defaults to REQUEST_RETRIES.
+        backoff (float): backoff factor in seconds, the n-th retry waits
+            backoff * 2 ** (n - 1) seconds (or the Retry-After of the response).
+            Defaults to RETRY_BACKOFF.
+        pool_size (int): connections kept alive per host. Defaults to NEWS_MAX_WORKERS.
+
+    Returns:
+        requests.Session: the configured session.
+    """
+    retry = SessionRetry(total=retries, connect=min(retries, CONNECT_RETRIES),
+                         backoff_factor=backoff, status_forcelist=SESSION_RETRY_STATUS_CODES,
+                         allowed_methods=frozenset(['GET']), raise_on_status=False)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the shared session of the module, created on first use.
+
+    Returns:
+        requests.Session: the session used when no session is given.
+    """
+    global _session  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def configure_news_limits(rate=NEWS_RATE_LIMIT, burst=NEWS_RATE_BURST,
+                          state_path=NEWS_RATE_LIMIT_FILE, failure_threshold=BREAKER_FAILURES,
+                          reset_timeout=BREAKER_RESET_TIMEOUT):
+    """
+    Replace the rate limiter and circuit breaker of the news requests, e.g. to
+    match the quota of another plan.
+
+    Args:
+        rate (float): sustained requests per second. Defaults to NEWS_RATE_LIMIT.
+        burst (int): largest burst of requests. Defaults to NEWS_RATE_BURST.
+        state_path (str): file sharing the limiter between processes, None to
+            limit this process only. Defaults to NEWS_RATE_LIMIT_FILE.
+        failure_threshold (int): consecutive retryable failures opening the circuit.
+            Defaults to BREAKER_FAILURES.
+        reset_timeout (float): seconds the circuit stays open. Defaults to BREAKER_RESET_TIMEOUT.
+
+    Returns:
+        tuple: the new (TokenBucket, CircuitBreaker).
+    """
+    limiter = TokenBucket(rate, burst, state_path)
+    breaker = CircuitBreaker(failure_threshold, reset_timeout)
+    with _session_lock:
+        _limits['limiter'], _limits['breaker'] = limiter, breaker
+    return limiter, breaker
+
+
+def _get_limits():
+    """Return the (TokenBucket, CircuitBreaker) of the news requests, created on first use."""
+    with _session_lock:
+        if _limits:
+            return _limits['limiter'], _limits['breaker']
+    return configure_news_limits()
+
 
-def get_news_articles(ticker: str, date: str):
+def is_retryable(error):
+    """
+    Classify a failed request: connection errors, timeouts and 429/5xx responses
+    may succeed later; other 4xx responses (invalid token, exhausted quota, unknown
+    ticker) and malformed responses will not.
+
+    Args:
+        error (Exception): the error raised by the request.
+    Returns:
+        bool: True if the request may succeed when sent again.
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout,
+                          requests.exceptions.RetryError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUS_CODES
+    return False
+
+
+def get_news_articles(ticker: str, date: str, session=None):
     """
     Retrieve news articles related to a specific stock ticker on a given date.
 
@@ -15,17 +234,198 @@ def get_news_articles(ticker: str, date: str):
         ticker (str): The stock ticker symbol.
         date (str): The date for which news articles are to be retrieved.
                     Should be in the format 'YYYY-MM-DD'.
+        session (requests.Session, optional): session to send the request with.
+                    Defaults to None (the shared session of get_session).
     Returns:
         dict: A dictionary containing the news articles data.
+    Raises:
+        NewsRequestError: If the request was not sent or failed after its retries.
     """
+    return _request_news({'s': ticker, 'offset': 0, 'from': date, 'to': date}, session)
+
+
+def _send_news_request(params, session):
+    """
+    Send one request to the news API through the rate limiter and circuit breaker,
+    returning the decoded JSON.
+    """
+    limiter, breaker = _get_limits()
+    if breaker.state == CircuitBreaker.OPEN:
+        raise CircuitOpenError("news API unavailable, circuit open")
+    if not limiter.acquire(timeout=NEWS_RATE_LIMIT_TIMEOUT):
+        raise RateLimitedError("rate limit exceeded")
+    if not breaker.allow_request():
+        raise CircuitOpenError("news API unavailable, circuit open")
+    # errors the provider will repeat (e.g. exhausted quota) do not open the circuit
+    success = False
     try:
-        url = f'https://eodhd.com/api/news?s={ticker}\
-            &offset=0&api_token=demo&fmt=json&from={date}&to={date}'
-        response = requests.get(url, timeout=100)
+        response = session.get(NEWS_API_URL, params={**params, 'api_token': NEWS_API_TOKEN,
+                                                     'fmt': 'json'},
+                               timeout=REQUEST_TIMEOUT)
         response.raise_for_status()  # Raise an exception for HTTP errors (status codes >= 400)
         data = response.json()
-        return data
-    except requests.RequestException as error:
-        print(f"Error retrieving news articles: {error}")
+        success = True
+    except (requests.RequestException, ValueError) as error:
+        api_error = NewsAPIError(error)
+        success = not api_error.retryable
+        raise api_error from error
+    finally:
+        breaker.record(success)
+    return data
+
+
+def _request_news(params, session=None):
+    """
+    Send a request to the news API, retrying 429 responses up to REQUEST_RETRIES
+    times with backoff (or their Retry-After), and return the decoded JSON.
+    """
+    session = get_session() if session is None else session
+    for retry in range(REQUEST_RETRIES):
+        try:
+            return _send_news_request(params, session)
+        except NewsAPIError as error:
+            if error.status_code != 429:
+                raise
+            time.sleep(error.retry_after or RETRY_BACKOFF * 2 ** retry)
+    return _send_news_request(params, session)
+
+
+def _articles_or_none(function, *args, **kwargs):
+    """Return the result of a get_news_* function, None (logged) if it raised NewsRequestError."""
+    try:
+        return function(*args, **kwargs)
+    except NewsRequestError as error:
+        logger.warning("Error retrieving news articles (%s): %s", type(error).__name__, error)
         return None
-    
\ No newline at end of file
+
+
+def fetch_news_by_date(ticker: str, dates, max_workers=NEWS_MAX_WORKERS, session=None):
+    """
+    Retrieve the news articles of a ticker on several dates concurrently.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        dates (list): dates in the format 'YYYY-MM-DD'.
+        max_workers (int): requests in flight at once. Defaults to NEWS_MAX_WORKERS.
+        session (requests.Session, optional): session to send the requests with.
+                    Defaults to None (the shared session of get_session).
+    Returns:
+        dict: the response of get_news_articles for every date (None for
+              requests that were not sent or failed), keyed by date in the order of dates.
+    """
+    dates = list(dict.fromkeys(dates))
+    session = get_session() if session is None else session
+    if len(dates) <= 1 or max_workers <= 1:
+        return {date: _articles_or_none(get_news_articles, ticker, date, session=session)
+                for date in dates}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        responses = executor.map(
+            lambda date: _articles_or_none(get_news_articles, ticker, date, session=session),
+            dates)
+        return dict(zip(dates, responses))
+
+
+def get_news_range(tickers, start_date: str, end_date: str, session=None):
+    """
+    Retrieve every news article of one or several tickers within a date range,
+    paging through the results NEWS_PAGE_LIMIT articles at a time. A range with
+    more than NEWS_MAX_PAGES pages is split in two halves requested in turn.
+
+    Args:
+        tickers (str or list): stock ticker symbol(s), requested together.
+        start_date (str): first date of the range, in the format 'YYYY-MM-DD'.
+        end_date (str): last date of the range (inclusive), in the format 'YYYY-MM-DD'.
+        session (requests.Session, optional): session to send the requests with.
+                    Defaults to None (the shared session of get_session).
+    Returns:
+        list: the articles of the range.
+    Raises:
+        NewsRequestError: If a request was not sent or failed, or returned
+            something else than a list of articles, or if a single date has
+            more than NEWS_MAX_PAGES pages (the list would be incomplete).
+    """
+    symbols = tickers if isinstance(tickers, str) else ','.join(tickers)
+    articles = []
+    for page in range(NEWS_MAX_PAGES):
+        data = _request_news({'s': symbols, 'from': start_date, 'to': end_date,
+                              'limit': NEWS_PAGE_LIMIT, 'offset': page * NEWS_PAGE_LIMIT},
+                             session)
+        if not isinstance(data, list):
+            raise NewsAPIError(ValueError(f"Unexpected news API response: {str(data)[:200]}"))
+        articles.extend(data)
+        if len(data) < NEWS_PAGE_LIMIT:
+            return articles
+
+    # every page was full, the range may hold more articles
+    first_day, last_day = (calendar_date.fromisoformat(day) for day in (start_date, end_date))
+    if first_day >= last_day:
+        raise NewsRequestError(f"News of {symbols} on {start_date} exceed {NEWS_MAX_PAGES} "
+                               f"pages of {NEWS_PAGE_LIMIT} articles")
+    middle = first_day + (last_day - first_day) // 2
+    return (get_news_range(tickers, start_date, middle.isoformat(), session)
+            + get_news_range(tickers, (middle + timedelta(days=1)).isoformat(), end_date,
+                             session))
+
+
+def group_dates(dates, max_gap_days=NEWS_WINDOW_GAP_DAYS, max_span_days=NEWS_WINDOW_MAX_DAYS):
+    """
+    Group dates into contiguous windows to request at once.
+
+    Args:
+        dates (list): dates in the format 'YYYY-MM-DD', in any order.
+        max_gap_days (int): largest gap in days between two dates of a window.
+                    Defaults to NEWS_WINDOW_GAP_DAYS.
+        max_span_days (int): largest number of days covered by a window.
+                    Defaults to NEWS_WINDOW_MAX_DAYS.
+    Returns:
+        list: (start_date, end_date) windows in the format 'YYYY-MM-DD', in date
+              order, covering every date.
+    """
+    days = sorted({calendar_date.fromisoformat(date) for date in dates})
+    windows = []
+    for day in days:
+        if (windows and (day - windows[-1][1]).days <= max_gap_days
+                and (day - windows[-1][0]).days < max_span_days):
+            windows[-1][1] = day
+        else:
+            windows.append([day, day])
+    return [(start.isoformat(), end.isoformat()) for start, end in windows]
+
+
+def fetch_news_by_range(tickers, dates, max_workers=NEWS_MAX_WORKERS, session=None):
+    """
+    Retrieve the news articles of one or several tickers on several dates with
+    one (paged) request per window of nearby dates, windows being fetched concurrently.
+
+    Args:
+        tickers (str or list): stock ticker symbol(s), sharing the requests.
+        dates (list): dates in the format 'YYYY-MM-DD'.
+        max_workers (int): requests in flight at once. Defaults to NEWS_MAX_WORKERS.
+        session (requests.Session, optional): session to send the requests with.
+                    Defaults to None (the shared session of get_session).
+    Returns:
+        dict: the articles published on every date (by the date of their 'date'
+              field), keyed by date in the order of dates; None for the dates of
+              a window whose request failed. Articles of every requested ticker are
+              included, callers select theirs with the 'symbols' field.
+    """
+    dates = list(dict.fromkeys(dates))
+    session = get_session() if session is None else session
+    windows = group_dates(dates)
+    with ThreadPoolExecutor(max_workers=max(min(max_workers, len(windows)), 1)) as executor:
+        responses = list(executor.map(
+            lambda window: _articles_or_none(get_news_range, tickers, *window, session=session),
+            windows))
+
+    articles_by_date = {date: [] for date in dates}
+    for (start_date, end_date), articles in zip(windows, responses):
+        if articles is None:
+            for date in dates:
+                if start_date <= date <= end_date:
+                    articles_by_date[date] = None
+            continue
+        for article in articles:
+            published = str(article.get('date', ''))[:10]
+            if articles_by_date.get(published) is not None:
+                articles_by_date[published].append(article)
+    return articles_by_date
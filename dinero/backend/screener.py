@@ -0,0 +1,207 @@
+"""
+screener module: evaluate indicator predicates across many tickers.
+
+A predicate compares the latest value of an indicator output with a threshold,
+e.g. 'RSI_14 < 30' or 'BBP_20 > 1' (output name, length, operator, number).
+For every ticker only the trailing rows needed by the predicates are read
+(the largest warm-up of the indicator registry plus the latest row), the
+indicators are computed together with indicator_registry.compute_indicators
+and the tickers are spread over a process pool in chunks, so the work scales
+with the number of cores.
+
+Functions:
+    1. parse_predicate(text)
+    2. screen_tickers(predicates, ticker_symbols=None, rank_by=None,
+                      ascending=None, max_workers=None)
+
+Example Usage (from the dinero folder):
+    $ python -m backend.screener "RSI_14 < 30" "BBP_20 > 1" --limit 20
+"""
+import argparse
+import math
+import operator
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+
+from backend.indicator_registry import compute_indicators, get_indicator, list_indicators
+from backend.stock_data_manager import (
+    get_date_index,
+    get_existing_tickers,
+    get_filtered_stock_data
+)
+
+# Number of worker processes, one per core by default.
+SCREENER_MAX_WORKERS = os.cpu_count() or 1
+# Chunks handed to each worker: more chunks balance the load, fewer cut the overhead.
+CHUNKS_PER_WORKER = 4
+OPERATORS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+             '==': operator.eq, '!=': operator.ne}
+PREDICATE_PATTERN = re.compile(
+    r'^\s*([A-Za-z_]+)_(\d+)\s*(<=|>=|==|!=|<|>)\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*$')
+
+Predicate = namedtuple('Predicate', ['column', 'indicator', 'length', 'operator', 'threshold'])
+
+
+def _output_indicators():
+    """Return {output name: indicator name} over the registered indicators."""
+    return {output: name for name in list_indicators() for output in get_indicator(name).outputs}
+
+
+def parse_predicate(text):
+    """
+    Function to parse a screening predicate.
+
+    Parameters:
+    text (str): '<output>_<length> <operator> <number>', e.g. 'RSI_14 < 30' or
+                'MACD_HIST_12 > 0'. Operators are <, <=, >, >=, == and !=.
+
+    Returns:
+    Predicate: (column, indicator, length, operator, threshold), e.g.
+        ('RSI_14', 'RSI', 14, '<', 30.0).
+
+    Exceptions:
+    TypeError if text is not a string
+    ValueError if text is not a predicate or names an unknown indicator output.
+    """
+    if not isinstance(text, str):
+        raise TypeError("predicate must be a string like 'RSI_14 < 30'.")
+    match = PREDICATE_PATTERN.match(text)
+    if match is None or int(match.group(2)) < 1:
+        raise ValueError(f"Invalid predicate {text!r}, expected e.g. 'RSI_14 < 30'.")
+    output, length, comparison, threshold = match.groups()
+    output = output.upper()
+    outputs = _output_indicators()
+    if output not in outputs:
+        raise ValueError(f"Unknown indicator output {output!r}. "
+                         f"Please use one of {list(outputs)}.")
+    return Predicate(f'{output}_{length}', outputs[output], int(length), comparison,
+                     float(threshold))
+
+
+def _load_tail(ticker_symbol, columns, rows):
+    """Load the last rows of the stored table of a ticker (None if it is empty)."""
+    dates = get_date_index(ticker_symbol)
+    if len(dates) == 0:
+        return None
+    last_date = pd.Timestamp(dates[-1]).strftime('%Y-%m-%d')
+    return get_filtered_stock_data(ticker_symbol, last_date, '', columns, warmup_rows=rows - 1)
+
+
+def _screen_ticker(ticker_symbol, requests, columns, rows):
+    """Return the latest date and indicator values of a ticker as a dict, or None."""
+    stock_data = _load_tail(ticker_symbol, columns, rows)
+    if stock_data is None or stock_data.empty:
+        return None
+    latest = compute_indicators(stock_data, requests).iloc[-1]
+    return {'Ticker': ticker_symbol.upper(), **latest.to_dict()}
+
+
+def _screen_chunk(ticker_symbols, requests, columns, rows):
+    """Screen a chunk of tickers in one worker process."""
+    return [_screen_ticker(ticker_symbol, requests, columns, rows)
+            for ticker_symbol in ticker_symbols]
+
+
+def _chunks(items, count):
+    """Split items into at most count contiguous chunks of near-equal size."""
+    size = max(math.ceil(len(items) / max(count, 1)), 1)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def screen_tickers(predicates, ticker_symbols=None, rank_by=None, ascending=None, # pylint: disable=too-many-locals
+                   max_workers=None):
+    """
+    Function to find the tickers whose latest indicator values satisfy every predicate.
+
+    Parameters:
+    predicates (list): predicate strings like 'RSI_14 < 30' (see parse_predicate)
+                       or Predicate tuples.
+    ticker_symbols (list, optional): tickers to screen. Defaults to None
+                                     (every ticker of get_existing_tickers()).
+    rank_by (str, optional): column to rank the matches by. Defaults to None
+                             (the column of the first predicate).
+    ascending (bool, optional): ranking order. Defaults to None (lowest first for
+                                a '<' or '<=' predicate on rank_by, highest first otherwise).
+    max_workers (int, optional): worker processes. Defaults to None
+                                 (SCREENER_MAX_WORKERS); 1 screens in this process.
+
+    Returns:
+    pd.DataFrame: one row per matching ticker with 'Rank', 'Ticker', 'Date' (of the
+    latest stored row) and the value of every predicate column, best ranked first.
+
+    Exceptions:
+    TypeError if a predicate or a ticker symbol is not a string
+    ValueError if there is no predicate, a predicate is invalid, a ticker is not
+        in database or rank_by is not a predicate column.
+    """
+    predicates = [predicate if isinstance(predicate, Predicate) else parse_predicate(predicate)
+                  for predicate in predicates]
+    if not predicates:
+        raise ValueError("At least one predicate is required.")
+    predicate_columns = list(dict.fromkeys(predicate.column for predicate in predicates))
+    rank_by = predicates[0].column if rank_by is None else rank_by
+    if rank_by not in predicate_columns:
+        raise ValueError(f"rank_by must be one of {predicate_columns}.")
+    if ascending is None:
+        ascending = next(predicate.operator in ('<', '<=') for predicate in predicates
+                         if predicate.column == rank_by)
+
+    requests = list(dict.fromkeys((predicate.indicator, predicate.length)
+                                  for predicate in predicates))
+    specs = [get_indicator(indicator) for indicator, _ in requests]
+    columns = list(dict.fromkeys(column for spec in specs for column in spec.inputs))
+    rows = max(spec.warmup(length) for spec, (_, length) in zip(specs, requests)) + 1
+
+    tickers = get_existing_tickers() if ticker_symbols is None else list(ticker_symbols)
+    max_workers = SCREENER_MAX_WORKERS if max_workers is None else max_workers
+    if max_workers <= 1 or len(tickers) <= 1:
+        screened = _screen_chunk(tickers, requests, columns, rows)
+    else:
+        chunks = _chunks(tickers, max_workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            screened = [result for chunk in executor.map(_screen_chunk, chunks, repeat(requests),
+                                                         repeat(columns), repeat(rows))
+                        for result in chunk]
+
+    latest = pd.DataFrame([result for result in screened if result is not None],
+                          columns=['Ticker', 'Date', *predicate_columns])
+    matches = pd.Series(True, index=latest.index)
+    for predicate in predicates:
+        matches &= OPERATORS[predicate.operator](latest[predicate.column], predicate.threshold)
+    result = latest.loc[matches, ['Ticker', 'Date', *predicate_columns]]
+    result = result.sort_values(rank_by, ascending=ascending, kind='stable')
+    result.insert(0, 'Rank', range(1, len(result) + 1))
+    return result.reset_index(drop=True)
+
+
+def main(argv=None):
+    """Command line entry point of the screener."""
+    parser = argparse.ArgumentParser(description='Screen tickers with indicator predicates.')
+    parser.add_argument('predicates', nargs='+',
+                        help="predicates such as 'RSI_14 < 30' (all must hold)")
+    parser.add_argument('--tickers', nargs='+', help='tickers to screen (default: all stored)')
+    parser.add_argument('--rank-by', help='predicate column to rank by (default: the first)')
+    parser.add_argument('--order', choices=('asc', 'desc'),
+                        help='ranking order (default: from the predicate operator)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--limit', type=int, help='print only the best ranked matches')
+    args = parser.parse_args(argv)
+
+    ascending = None if args.order is None else args.order == 'asc'
+    try:
+        result = screen_tickers(args.predicates, args.tickers, args.rank_by, ascending,
+                                args.workers)
+    except (TypeError, ValueError) as error:
+        parser.error(str(error))
+    print(f'{len(result)} matching tickers')
+    if not result.empty:
+        print(result.head(args.limit).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
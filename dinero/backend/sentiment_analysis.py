@@ -2,15 +2,180 @@
 Module: sentiment_analysis
 This module provides functions for sentiment analysis of text data.
 
+The VADER lexicon is read from a local file the first time an article is
+scored, without checking the network: the file named by the DINERO_VADER_LEXICON
+environment variable, the nltk data of the machine if it holds the lexicon, or
+the copy bundled with the vaderSentiment package. The analyzer is built once per
+process and shared by every call and thread.
+
+With cached=True, scores are looked up in backend.sentiment_cache first, by the
+hash of the normalized text and the model version, and only texts never scored
+by this model are analyzed.
+
+For large corpora, iter_sentiment_values and batch_sentiment_values split the
+articles into chunks scored across a process pool (one analyzer per worker),
+streaming the results back in order.
+
+Every scoring function takes a scorer: 'vader' (the default) applies every
+VADER rule one text at a time, 'lexicon' scores a whole batch at once with the
+raw lexicon valences through sparse matrix products (see backend.lexicon_scorer).
+
 Function:
     - get_sentiment_value
+    - iter_sentiment_values
+    - batch_sentiment_values
+    - score_texts
+    - get_analyzer
+    - get_lexicon_scorer
+    - get_model_version
+    - get_lexicon_path
 """
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import nltk
-nltk.download('vader_lexicon')
+import vaderSentiment
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+from backend.lexicon_scorer import LEXICON_SCORER_VERSION, LexiconScorer
+from backend.sentiment_cache import get_cached_scores, normalize_text, put_scores, text_key
+
+NLTK_LEXICON = 'sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt'
+BUNDLED_LEXICON = os.path.join(os.path.dirname(vaderSentiment.__file__), 'vader_lexicon.txt')
+SENTIMENT_MAX_WORKERS = os.cpu_count() or 1
+# Texts per task of the process pool: larger chunks cut the overhead, smaller ones stream sooner.
+SENTIMENT_CHUNK_SIZE = 256
+SENTIMENT_SCORERS = ('vader', 'lexicon')
+
+_analyzer = None  # pylint: disable=invalid-name
+_lexicon_hash = None  # pylint: disable=invalid-name
+_lexicon_scorer = None  # pylint: disable=invalid-name
+_analyzer_lock = threading.Lock()
+
+
+def get_lexicon_path() -> str:
+    """
+    Finds the VADER lexicon on this machine, without downloading it.
+
+    Returns:
+    - str: an nltk resource URL of the lexicon ('file:...' for files).
+
+    Raises:
+    - LookupError: If DINERO_VADER_LEXICON names a missing file.
+    """
+    path = os.environ.get('DINERO_VADER_LEXICON')
+    if path:
+        if not os.path.isfile(path):
+            raise LookupError(f"VADER lexicon not found: {path}")
+        return f'file:{os.path.abspath(path)}'
+    try:
+        nltk.data.find(NLTK_LEXICON)
+        return NLTK_LEXICON
+    except LookupError:
+        return f'file:{BUNDLED_LEXICON}'
+
+
+def get_analyzer() -> SentimentIntensityAnalyzer:
+    """
+    Returns the analyzer of this process, loading the lexicon on first use.
+
+    Returns:
+    - SentimentIntensityAnalyzer: the shared analyzer (scoring is read-only,
+      so threads can use it concurrently).
+    """
+    global _analyzer, _lexicon_hash  # pylint: disable=global-statement
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = SentimentIntensityAnalyzer(lexicon_file=get_lexicon_path())
+            _lexicon_hash = hashlib.sha256(_analyzer.lexicon_file.encode('utf-8')).hexdigest()
+        return _analyzer
+
+
+def get_lexicon_scorer() -> LexiconScorer:
+    """
+    Returns the vectorized lexicon scorer of this process, built on first use
+    from the lexicon of the analyzer.
+
+    Returns:
+    - LexiconScorer: the shared scorer.
+    """
+    global _lexicon_scorer  # pylint: disable=global-statement
+    lexicon = get_analyzer().lexicon
+    with _analyzer_lock:
+        if _lexicon_scorer is None:
+            _lexicon_scorer = LexiconScorer(lexicon)
+        return _lexicon_scorer
+
+
+def _check_scorer(scorer):
+    if scorer not in SENTIMENT_SCORERS:
+        raise ValueError(f"Unknown sentiment scorer: {scorer}")
 
-def get_sentiment_value(title_list: list) -> dict:
+
+def get_model_version(scorer: str = 'vader') -> str:
+    """
+    Returns the version of a scorer of this process, which changes with nltk
+    (or the scoring rules) and with the lexicon, to key cached scores.
+
+    Args:
+    - scorer (str): one of SENTIMENT_SCORERS. Defaults to 'vader'.
+
+    Returns:
+    - str: e.g. 'vader-nltk-3.8.1-' followed by a hash of the lexicon.
+
+    Raises:
+    - ValueError: If scorer is not one of SENTIMENT_SCORERS.
+    """
+    _check_scorer(scorer)
+    get_analyzer()
+    if scorer == 'lexicon':
+        return f'lexicon-sparse-{LEXICON_SCORER_VERSION}-{_lexicon_hash[:16]}'
+    return f'vader-nltk-{nltk.__version__}-{_lexicon_hash[:16]}'
+
+
+def _score_new(texts_by_key: dict, scorer: str) -> dict:
+    """Score normalized texts keyed by text_key, returning their scores by key."""
+    if scorer == 'lexicon':
+        return dict(zip(texts_by_key, get_lexicon_scorer().score(list(texts_by_key.values()))))
+    analyzer = get_analyzer()
+    return {key: analyzer.polarity_scores(text) for key, text in texts_by_key.items()}
+
+
+def score_texts(texts: list, cached: bool = False, scorer: str = 'vader') -> list:
+    """
+    Scores several texts, each distinct text once.
+
+    Args:
+    - texts (list): the texts to score.
+    - cached (bool): look the scores up in the sentiment cache first and cache
+                     the new ones. Defaults to False.
+    - scorer (str): one of SENTIMENT_SCORERS. Defaults to 'vader'.
+
+    Returns:
+    - list: the scores ('neg', 'neu', 'pos' and 'compound') of every text, in order.
+
+    Raises:
+    - ValueError: If scorer is not one of SENTIMENT_SCORERS.
+    """
+    keys = [text_key(text) for text in texts]
+    version = get_model_version(scorer)
+    scores = get_cached_scores(keys, version) if cached else {}
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in scores and key not in missing:
+            missing[key] = normalize_text(text)
+    new_scores = _score_new(missing, scorer) if missing else {}
+    if cached and new_scores:
+        put_scores(new_scores, version)
+    scores.update(new_scores)
+    return [dict(scores[key]) for key in keys]
+
+
+def get_sentiment_value(title_list: list, cached: bool = False, scorer: str = 'vader') -> dict:
     """
     Analyzes the sentiment of each title in the given list using
     VADER (Valence Aware Dictionary and sEntiment Reasoner).
@@ -18,6 +183,10 @@ def get_sentiment_value(title_list: list) -> dict:
     Args:
     - title_list (list): A list of dictionaries representing titles or sentences to analyze.
                          Each dictionary should have 'title', 'content', and 'link' keys.
+    - cached (bool): serve the scores of already scored contents from the
+                     sentiment cache (see score_texts). Defaults to False.
+    - scorer (str): 'vader', or 'lexicon' for the vectorized raw lexicon scores.
+                    Defaults to 'vader'.
 
     Returns:
     - dict: A dictionary where keys are the titles/sentences and
@@ -25,13 +194,107 @@ def get_sentiment_value(title_list: list) -> dict:
             The sentiment scores include 'neg' (negative),
             'neu' (neutral), 'pos' (positive), and 'compound' (overall sentiment).
     """
+    _check_scorer(scorer)
     senti_dict = {}
-    analyzer = SentimentIntensityAnalyzer()
-    for sentence in title_list:
-        content = sentence['content']
+    if not title_list:
+        return senti_dict
+    sentiment_scores = score_texts([sentence['content'] for sentence in title_list], cached,
+                                   scorer)
+    for sentence, sentiment_score in zip(title_list, sentiment_scores):
         title = sentence['title']
         link = sentence['link']
-        sentiment_score = analyzer.polarity_scores(content)
         senti_dict[title] = {'sentiment_score': sentiment_score, 'link': link}
 
     return senti_dict
+
+
+def _score_chunk(chunk, scorer='vader'):
+    """Score a chunk of (key, text) with the scorer of this (worker) process, by key."""
+    return _score_new(dict(chunk), scorer)
+
+
+def _missing_chunks(keys, title_list, scores, chunk_size):
+    """Split the distinct texts without a score into chunks of (key, normalized text)."""
+    missing = {}
+    for key, sentence in zip(keys, title_list):
+        if key not in scores and key not in missing:
+            missing[key] = normalize_text(sentence['content'])
+    missing = list(missing.items())
+    return [missing[start:start + chunk_size] for start in range(0, len(missing), chunk_size)]
+
+
+def iter_sentiment_values(title_list: list, chunk_size: int = SENTIMENT_CHUNK_SIZE,
+                          max_workers: int = None, cached: bool = False,
+                          scorer: str = 'vader'):
+    """
+    Analyzes the sentiment of many articles across worker processes, yielding
+    the results in the order of the articles as soon as their chunk is scored.
+
+    Args:
+    - title_list (list): dictionaries with 'title', 'content', and 'link' keys.
+    - chunk_size (int): distinct texts per task of the pool. Defaults to SENTIMENT_CHUNK_SIZE.
+    - max_workers (int): worker processes. Defaults to None (SENTIMENT_MAX_WORKERS);
+                         1, or a single chunk of texts, scores in this process.
+    - cached (bool): serve already scored contents from the sentiment cache and
+                     cache the new scores. Defaults to False.
+    - scorer (str): one of SENTIMENT_SCORERS. Defaults to 'vader'.
+
+    Yields:
+    - tuple: (title, {'sentiment_score': ..., 'link': ...}) of every article, the
+             entries of get_sentiment_value.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    keys = [text_key(sentence['content']) for sentence in title_list]
+    version = get_model_version(scorer)
+    scores = get_cached_scores(keys, version) if cached else {}
+    chunks = _missing_chunks(keys, title_list, scores, chunk_size)
+
+    max_workers = SENTIMENT_MAX_WORKERS if max_workers is None else max_workers
+    executor = None
+    if max_workers > 1 and len(chunks) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                                       initializer=get_analyzer)
+        scored_chunks = executor.map(_score_chunk, chunks, repeat(scorer))
+    else:
+        scored_chunks = map(_score_chunk, chunks, repeat(scorer))
+    try:
+        for key, sentence in zip(keys, title_list):
+            # chunks come back in order: wait for the ones up to this article's text
+            for new_scores in scored_chunks if key not in scores else ():
+                if cached:
+                    put_scores(new_scores, version)
+                scores.update(new_scores)
+                if key in scores:
+                    break
+            yield sentence['title'], {'sentiment_score': dict(scores[key]),
+                                      'link': sentence['link']}
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def batch_sentiment_values(title_list: list, chunk_size: int = SENTIMENT_CHUNK_SIZE,
+                           max_workers: int = None, cached: bool = False,
+                           scorer: str = 'vader'):
+    """
+    Analyzes the sentiment of many articles across worker processes, see
+    iter_sentiment_values, and measures the throughput.
+
+    Args:
+    - title_list (list): dictionaries with 'title', 'content', and 'link' keys.
+    - chunk_size (int): distinct texts per task of the pool. Defaults to SENTIMENT_CHUNK_SIZE.
+    - max_workers (int): worker processes. Defaults to None (SENTIMENT_MAX_WORKERS).
+    - cached (bool): use the sentiment cache. Defaults to False.
+    - scorer (str): one of SENTIMENT_SCORERS. Defaults to 'vader'.
+
+    Returns:
+    - tuple: the dictionary of get_sentiment_value, and a dictionary with the
+             number of 'articles', the 'seconds' taken and the 'articles_per_second'.
+    """
+    start = time.perf_counter()
+    senti_dict = dict(iter_sentiment_values(title_list, chunk_size, max_workers, cached,
+                                            scorer))
+    seconds = time.perf_counter() - start
+    return senti_dict, {'articles': len(title_list), 'seconds': seconds,
+                        'articles_per_second': len(title_list) / seconds if seconds else 0.0}
@@ -0,0 +1,122 @@
+"""
+sentiment_cache module: persistent cache of sentiment scores.
+
+Scores are stored in a SQLite database, `{DEFAULT_DATABASE_PATH}/.cache/sentiment.sqlite3`,
+keyed by the SHA-256 of the normalized text and the version of the model that
+scored it: the same article seen for several event dates, or on every rerun of
+the app, is scored once, and a new lexicon or model never serves stale scores.
+
+Functions:
+    1. normalize_text(text)
+    2. text_key(text)
+    3. get_cached_scores(keys, version)
+    4. put_scores(scores, version)
+    5. get_sentiment_cache_stats()
+    6. clear_sentiment_cache(version=None)
+"""
+import hashlib
+import os
+import unicodedata
+
+from backend.sqlite_cache import SQLiteCache
+
+SENTIMENT_CACHE_FILE = os.path.join('.cache', 'sentiment.sqlite3')
+SCORE_NAMES = ('neg', 'neu', 'pos', 'compound')
+
+_SCHEMA = '''CREATE TABLE IF NOT EXISTS scores (
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    neg REAL NOT NULL,
+    neu REAL NOT NULL,
+    pos REAL NOT NULL,
+    compound REAL NOT NULL,
+    PRIMARY KEY (key, version)
+) WITHOUT ROWID'''
+
+_cache = SQLiteCache('Sentiment', SENTIMENT_CACHE_FILE, 'scores', _SCHEMA,
+                     ['hits', 'misses', 'writes'])
+
+
+def normalize_text(text):
+    """
+    Function to normalize a text before hashing and scoring it: Unicode NFC form
+    and runs of whitespace collapsed to single spaces (case is kept, it changes
+    sentiment scores).
+
+    Parameters:
+    text (str): the text.
+
+    Returns:
+    str: the normalized text.
+    """
+    return ' '.join(unicodedata.normalize('NFC', str(text)).split())
+
+
+def text_key(text):
+    """
+    Function to compute the cache key of a text.
+
+    Parameters:
+    text (str): the text.
+
+    Returns:
+    str: the SHA-256 of the normalized text, in hexadecimal.
+    """
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def get_cached_scores(keys, version):
+    """
+    Function to look up the scores of several texts.
+
+    Parameters:
+    keys (list): keys of the texts, from text_key.
+    version (str): version of the model the scores must come from.
+
+    Returns:
+    dict: the cached scores ('neg', 'neu', 'pos' and 'compound'), keyed by key;
+          keys that were never scored by this version are missing.
+    """
+    keys = list(dict.fromkeys(keys))
+    rows = _cache.lookup(['key', *SCORE_NAMES], 'key', keys, version=version)
+    scores = {row[0]: dict(zip(SCORE_NAMES, row[1:])) for row in rows}
+    _cache.count('hits', len(scores))
+    _cache.count('misses', len(keys) - len(scores))
+    return scores
+
+
+def put_scores(scores, version):
+    """
+    Function to cache the scores of several texts.
+
+    Parameters:
+    scores (dict): scores ('neg', 'neu', 'pos' and 'compound'), keyed by text_key.
+    version (str): version of the model that computed them.
+    """
+    _cache.store([(key, version, *(score[name] for name in SCORE_NAMES))
+                  for key, score in scores.items()])
+
+
+def get_sentiment_cache_stats():
+    """
+    Function to get the counters of the sentiment cache.
+
+    Returns:
+    dict: hits, misses and writes of this process, and the number of cached scores.
+    """
+    return _cache.stats()
+
+
+def clear_sentiment_cache(version=None):
+    """
+    Function to drop the cached scores of a model version (or of every version if None).
+
+    Parameters:
+    version (str, optional): the model version. Defaults to None.
+
+    Returns:
+    int: number of dropped scores.
+    """
+    if version is None:
+        return _cache.clear()
+    return _cache.clear(version=version)
@@ -0,0 +1,142 @@
+"""
+sqlite_cache module: the tables of the persistent caches.
+
+The news, sentiment and keyword caches each keep one table in a SQLite
+database under `{DEFAULT_DATABASE_PATH}/.cache/`, read in batches of keys. A
+cache is an optimization: a database that cannot be read is logged and read
+as empty, and one that cannot be written (e.g. read-only) only loses the new
+entries.
+
+Classes:
+    1. SQLiteCache(name, file_name, table, schema, counters)
+"""
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import backend.stock_data_manager as sdm
+
+# Keys looked up per query, below the SQLite limit on query parameters.
+LOOKUP_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache:
+    """
+    One table of a cache database, and the counters of its use in this process.
+
+    Attributes:
+    name (str): name of the cache in log messages, e.g. 'News'.
+    file_name (str): database file, relative to DEFAULT_DATABASE_PATH.
+    table (str): name of the table created by schema.
+    """
+
+    def __init__(self, name, file_name, table, schema, counters):
+        self.name = name
+        self.file_name = file_name
+        self.table = table
+        self._schema = schema
+        self._counters = tuple(counters)
+        self._stats = dict.fromkeys(self._counters, 0)
+        self._stats_lock = threading.Lock()
+
+    def connect(self):
+        """
+        Open the cache database, creating it and the table if needed.
+
+        Returns:
+        sqlite3.Connection: to be closed by the caller.
+        """
+        file_path = os.path.join(sdm.DEFAULT_DATABASE_PATH, self.file_name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        connection = sqlite3.connect(file_path, timeout=30)
+        connection.execute(self._schema)
+        return connection
+
+    def count(self, counter, amount=1):
+        """Add amount to a counter of the cache."""
+        with self._stats_lock:
+            self._stats[counter] += amount
+
+    def reset_stats(self):
+        """Set every counter of the cache back to 0."""
+        with self._stats_lock:
+            self._stats = dict.fromkeys(self._counters, 0)
+
+    def lookup(self, columns, key_column, keys, **filters):
+        """
+        Read the entries whose key_column is one of keys and whose other columns
+        equal filters, LOOKUP_BATCH_SIZE keys per query.
+
+        Parameters:
+        columns (list): names of the columns to read.
+        key_column (str): name of the key column.
+        keys (list): distinct keys.
+        filters: values of other columns, e.g. version='...'.
+
+        Returns:
+        list: tuples of the columns, without the entries that could not be read.
+        """
+        conditions = ''.join(f'{column} = ? AND ' for column in filters)
+        rows = []
+        try:
+            with closing(self.connect()) as connection:
+                for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                    batch = keys[start:start + LOOKUP_BATCH_SIZE]
+                    rows.extend(connection.execute(
+                        f'SELECT {", ".join(columns)} FROM {self.table} WHERE {conditions}'
+                        f'{key_column} IN ({",".join("?" * len(batch))})',
+                        [*filters.values(), *batch]))
+        except (OSError, sqlite3.Error) as error:
+            logger.warning("%s cache unavailable: %s", self.name, error)
+        return rows
+
+    def store(self, rows):
+        """
+        Insert or replace entries, counted as writes.
+
+        Parameters:
+        rows (list): tuples of the values of every column of the table.
+        """
+        if not rows:
+            return
+        try:
+            with closing(self.connect()) as connection:
+                with connection:
+                    connection.executemany(f'INSERT OR REPLACE INTO {self.table} VALUES '
+                                           f'({", ".join("?" * len(rows[0]))})', rows)
+        except (OSError, sqlite3.Error) as error:
+            logger.warning("%s cache not written: %s", self.name, error)
+            return
+        self.count('writes', len(rows))
+
+    def stats(self):
+        """
+        Get the counters of the cache.
+
+        Returns:
+        dict: the counters of this process and the number of entries.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with closing(self.connect()) as connection:
+            stats['entries'] = connection.execute(
+                f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        return stats
+
+    def clear(self, **filters):
+        """
+        Delete the entries whose columns equal filters (every entry without filters).
+
+        Returns:
+        int: number of deleted entries.
+        """
+        conditions = ' AND '.join(f'{column} = ?' for column in filters)
+        with closing(self.connect()) as connection:
+            with connection:
+                return connection.execute(
+                    f'DELETE FROM {self.table}' + (f' WHERE {conditions}' if filters else ''),
+                    list(filters.values())).rowcount
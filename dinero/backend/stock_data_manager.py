@@ -4,17 +4,136 @@ stock_data_manager module: manange stock data (data from yfinance API).
 Funtions:
     1. download_stock_data(ticker_symbol, period_str='5y')
     2. get_existing_tickers()
-    3. update_stock_data()
-    4. get_stock_data(ticker_symbol)
-    5. get_filtered_stock_data(ticker_symbol, start_date='', end_date='')
+    3. update_stock_data(provider=None, batch_size=50, max_workers=4)
+    4. get_stock_data(ticker_symbol, columns=None, compact=False)
+    5. get_filtered_stock_data(ticker_symbol, start_date='', end_date='', columns=None,
+                               warmup_rows=0)
     6. get_last_n_days(stock_data, n_days)
+    7. get_price_store()
+    8. get_stock_data_cache_stats()
+    9. invalidate_stock_data_cache(ticker_symbol=None)
+    10. get_date_index(ticker_symbol)
+    11. yfinance_provider(ticker_symbols, start=None, end=None, period=None)
+    12. bulk_download_stock_data(ticker_symbols, period_str='5y', provider=None,
+                                 batch_size=50, max_workers=4)
+    13. parse_ticker_symbols(text, csv_format=False)
+    14. register_cache_invalidation(callback)
+    15. get_data_version(ticker_symbol)
+
+Storage:
+    Tables are kept in DEFAULT_DATABASE_PATH in the DEFAULT_STORAGE_FORMAT
+    ('csv' or 'parquet', see backend.price_store). The format can be set with
+    the DINERO_STORAGE_FORMAT environment variable; existing CSV files are
+    converted with `python -m backend.price_store migrate`.
+
+Caching:
+    get_stock_data keeps loaded tables in an in-process LRU cache bounded by
+    STOCK_DATA_CACHE_MAX_BYTES. Entries are keyed by the table version
+    (modification time and size), and download/update invalidate them
+    explicitly, so callers never see stale data. Cached frames are shared:
+    callers must not modify values in place. Caches of derived data (e.g.
+    backend.indicator_cache) register a callback to be invalidated together.
+
+Compact mode:
+    get_stock_data(..., compact=True) keeps large universes resident with
+    about 28 bytes per row instead of about 100: datetime64 dates, float32
+    prices, uint32 (or uint64) volumes, and 'Adj Close' dropped unless
+    requested. Precision guarantees of each indicator in compact mode are
+    listed in docs/component_specification.md.
+
+Providers:
+    Functions that fetch prices take a `provider`, a callable
+    provider(ticker_symbols, start=None, end=None, period=None) returning a
+    dict {ticker_symbol: DataFrame indexed by Date}. yfinance_provider is the
+    default; tests and offline tools can inject a local stand-in.
 """
+import csv
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
+from backend.cache import LRUCache
+from backend.price_store import get_price_store as _make_price_store
+
 DEFAULT_DATABASE_PATH = 'data'
+DEFAULT_STORAGE_FORMAT = os.environ.get('DINERO_STORAGE_FORMAT', 'csv')
+STOCK_DATA_CACHE_MAX_BYTES = 256 * 1024 * 1024
+COMPACT_PRICE_DTYPE = 'float32'
+COMPACT_DROPPED_COLUMNS = ('Adj Close',)
+# Number of tickers per multi-symbol provider request and concurrent requests.
+UPDATE_BATCH_SIZE = 50
+UPDATE_MAX_WORKERS = 4
+# Header names of the ticker column of a ticker list file.
+TICKER_HEADERS = ('TICKER', 'SYMBOL')
+
+_stock_data_cache = LRUCache(STOCK_DATA_CACHE_MAX_BYTES)
+_invalidation_callbacks = []
+
+def get_price_store():
+    """
+    Function to get the price store of the database.
+
+    Returns:
+    CsvPriceStore or ParquetPriceStore: store of DEFAULT_STORAGE_FORMAT
+        located in DEFAULT_DATABASE_PATH.
+    """
+    return _make_price_store(DEFAULT_STORAGE_FORMAT, DEFAULT_DATABASE_PATH)
+
+def get_stock_data_cache_stats():
+    """
+    Function to get the counters of the get_stock_data cache.
+
+    Returns:
+    dict: hits, misses, evictions, number of entries and total cached bytes.
+    """
+    return _stock_data_cache.stats()
+
+def invalidate_stock_data_cache(ticker_symbol=None):
+    """
+    Function to drop cached tables of a ticker (or of every ticker if None).
+
+    Parameters:
+    ticker_symbol (str, optional): The stock ticker symbol. Defaults to None.
+
+    Returns:
+    int: number of dropped cache entries.
+    """
+    if ticker_symbol is not None:
+        ticker_symbol = ticker_symbol.upper()
+    for callback in _invalidation_callbacks:
+        callback(ticker_symbol)
+    if ticker_symbol is None:
+        return _stock_data_cache.invalidate(lambda key: True)
+    return _stock_data_cache.invalidate(lambda key: key[0] == ticker_symbol)
+
+def register_cache_invalidation(callback):
+    """
+    Function to register a cache of data derived from the stock data, so that it
+    is invalidated whenever the cached tables of a ticker are.
+
+    Parameters:
+    callback (callable): called as callback(ticker_symbol), ticker_symbol being
+                         None when every ticker is invalidated.
+    """
+    if callback not in _invalidation_callbacks:
+        _invalidation_callbacks.append(callback)
+
+def _check_period(period_str):
+    """
+    Validate a yfinance period string and return it in lower case.
+
+    Exceptions:
+    ValueError if period_str has invalid format.
+    """
+    period_str = period_str.lower()
+    if not (period_str == 'max' or period_str[-1:] in ['d','y']
+            or period_str[-2:] in ['wk','mo']):
+        raise ValueError("period format: 'max', 'd', 'wk', 'mo', 'y' (case insensitive).")
+    return period_str
 
 def download_stock_data(ticker_symbol, period_str='5y'):
     """
@@ -33,7 +152,8 @@ def download_stock_data(ticker_symbol, period_str='5y'):
         1 means possible invalid period_str input
 
     Side Effects:
-    Save non-empty data to 'data/{ticker_symbol}.csv', do nothing otherwise.
+    Save non-empty data to the price store ('data/{ticker_symbol}.csv' by default),
+    do nothing otherwise.
     Print progress messages (complate or fail) to terminal.
 
     Exceptions:
@@ -58,21 +178,110 @@ def download_stock_data(ticker_symbol, period_str='5y'):
         raise TypeError("Arguments must be strings.")
     if not os.path.exists(DEFAULT_DATABASE_PATH):
         os.makedirs(DEFAULT_DATABASE_PATH)
-    period_str = period_str.lower()
+    period_str = _check_period(period_str)
     ticker_symbol = ticker_symbol.upper()
-    if not (period_str == 'max' or period_str[-1] in ['d','y']
-            or period_str[-2:] in ['wk','mo']):
-        raise ValueError("period format: 'max', 'd', 'wk', 'mo', 'y' (case insensitive).")
 
     data = yf.download(ticker_symbol, period=period_str)
 
     if len(data) == 0:
         raise ValueError("Fail to download: no data, ticker symbol may be delisted ")
 
-    file_path = os.path.join(DEFAULT_DATABASE_PATH, f'{ticker_symbol}.csv')
-    data.to_csv(file_path)
+    get_price_store().write(ticker_symbol, data)
+    invalidate_stock_data_cache(ticker_symbol)
     return len(data)
 
+def parse_ticker_symbols(text, csv_format=False):
+    """
+    Function to parse a list of ticker symbols from free text or file content.
+
+    Parameters:
+    text (str): symbols separated by commas, semicolons, spaces or new lines.
+                Lines starting with '#' and 'Ticker'/'Symbol' headers are ignored.
+    csv_format (bool, optional): text is a CSV file with the symbols in its first
+                                 column (other columns, e.g. company names, and a
+                                 header row are ignored). Defaults to False.
+
+    Returns:
+    list: unique upper case ticker symbol strings, in order of appearance.
+    """
+    lines = [line for line in text.splitlines() if not line.strip().startswith('#')]
+    if csv_format:
+        rows = [row for row in csv.reader(lines) if row and row[0].strip()]
+        if rows and not re.fullmatch(r'[\w.^=-]+', rows[0][0].strip()):
+            rows = rows[1:]  # header with a name like 'Ticker Symbol'
+        symbols = [row[0].strip().upper() for row in rows]
+    else:
+        symbols = [symbol.upper() for symbol in re.split(r'[\s,;]+', '\n'.join(lines))
+                   if symbol]
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol not in TICKER_HEADERS))
+
+def bulk_download_stock_data(ticker_symbols, period_str='5y', provider=None,
+                             batch_size=UPDATE_BATCH_SIZE, max_workers=UPDATE_MAX_WORKERS):
+    """
+    Function to import a universe of tickers: download and store the
+    historical data of many symbols at once.
+
+    Parameters:
+    ticker_symbols (list or str): ticker symbol strings, or the text content of a
+                                  ticker list file (see parse_ticker_symbols).
+    period_str (str): The time period for which to fetch the data, same
+                      formats as download_stock_data. Defaults to '5y'.
+    provider (callable, optional): price provider (see module docstring).
+                                   Defaults to yfinance_provider.
+    batch_size (int): number of symbols per provider request. Defaults to 50.
+    max_workers (int): number of concurrent provider requests. Defaults to 4.
+
+    Returns:
+    pd.DataFrame: one row per symbol with columns
+        'Ticker', 'Status' ('success' or 'failed'), 'Rows' (number of stored rows)
+        and 'Error' (reason of the failure, '' on success).
+
+    Exceptions:
+    TypeError if a ticker symbol or period_str is not string
+    ValueError if period_str has invalid format.
+
+    Notes:
+    Unlike download_stock_data, a delisted or failing symbol does not raise:
+    it is reported as 'failed' and the other symbols are still imported.
+    """
+    if isinstance(ticker_symbols, str):
+        ticker_symbols = parse_ticker_symbols(ticker_symbols)
+    if not (isinstance(period_str, str) and
+            all(isinstance(symbol, str) for symbol in ticker_symbols)):
+        raise TypeError("Arguments must be strings.")
+    period_str = _check_period(period_str)
+    provider = provider or yfinance_provider
+    store = get_price_store()
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in ticker_symbols))
+    report = {symbol: ('failed', 0, 'no data, ticker symbol may be delisted')
+              for symbol in symbols}
+
+    def fetch_and_write(batch):
+        try:
+            downloaded = provider(batch, period=period_str)
+        except Exception as error: # pylint: disable=broad-except
+            for symbol in batch:
+                report[symbol] = ('failed', 0, str(error))
+            return
+        for symbol in batch:
+            if symbol not in downloaded or len(downloaded[symbol]) == 0:
+                continue
+            data = _new_rows(downloaded[symbol], None)
+            try:
+                store.write(symbol, data)
+            except OSError as error:
+                report[symbol] = ('failed', 0, str(error))
+                continue
+            invalidate_stock_data_cache(symbol)
+            report[symbol] = ('success', len(data), '')
+
+    batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(fetch_and_write, batches))
+
+    return pd.DataFrame([(symbol, *report[symbol]) for symbol in symbols],
+                        columns=['Ticker', 'Status', 'Rows', 'Error'])
+
 def get_existing_tickers():
     """
     Function to retrieve a list of ticker symbol strings that exist in the data folder.
@@ -81,55 +290,233 @@ def get_existing_tickers():
     list: A list of existing ticker symbol strings.
         Return empty list if data folder is empty.
     """
-    return [file[:-4] for file in os.listdir(DEFAULT_DATABASE_PATH)
-            if file.endswith('.csv')]
+    return get_price_store().list_tickers()
+
+def yfinance_provider(ticker_symbols, start=None, end=None, period=None):
+    """
+    Default price provider: download daily prices of several tickers from
+    Yahoo Finance in one multi-symbol request.
 
-def update_stock_data():
+    Parameters:
+    ticker_symbols (list): ticker symbol strings.
+    start (str, optional): first date to fetch in 'yyyy-mm-dd' format (inclusive).
+    end (str, optional): last date to fetch in 'yyyy-mm-dd' format (exclusive).
+    period (str, optional): yfinance period string, used when start is None.
+
+    Returns:
+    dict: {ticker_symbol: pd.DataFrame indexed by Date} for every ticker with data.
+    """
+    symbols = ticker_symbols[0] if len(ticker_symbols) == 1 else list(ticker_symbols)
+    if start is None:
+        data = yf.download(symbols, period=period, group_by='ticker')
+    else:
+        data = yf.download(symbols, start=start, end=end, group_by='ticker')
+
+    if len(data) == 0:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {ticker_symbols[0]: data} if len(ticker_symbols) == 1 else {}
+    frames = {}
+    for ticker_symbol in data.columns.get_level_values(0).unique():
+        frame = data[ticker_symbol].dropna(how='all')
+        if len(frame) > 0:
+            frames[ticker_symbol] = frame
+    return frames
+
+def _new_rows(data, last_recorded_date):
+    """
+    Drop duplicated dates and dates already recorded from downloaded data.
+
+    Returns:
+    pd.DataFrame: rows strictly after last_recorded_date, in ascending date order.
+    """
+    data = data[~data.index.duplicated(keep='last')].sort_index()
+    if last_recorded_date is not None:
+        data = data[data.index > last_recorded_date]
+    return data
+
+def update_stock_data(provider=None, batch_size=UPDATE_BATCH_SIZE,
+                      max_workers=UPDATE_MAX_WORKERS):
     """
     Function to update the database. For each existing ticker, appending
-    new data from the last recorded day to today to the original CSV file.
+    new data from the last recorded day to today to the stored table.
+
+    Parameters:
+    provider (callable, optional): price provider (see module docstring).
+                                   Defaults to yfinance_provider.
+    batch_size (int): number of tickers per provider request. Defaults to 50.
+    max_workers (int): number of concurrent provider requests. Defaults to 4.
 
     Returns:
     list: list of updated ticker symbol strings.
+
+    Notes:
+    The last recorded date of each ticker comes from a tail read of its table.
+    Tickers sharing the same missing range are fetched together in batches,
+    rows already recorded are dropped, and each append replaces the stored
+    table atomically. A failed batch is reported and skipped.
     """
+    provider = provider or yfinance_provider
+    store = get_price_store()
     existing_tickers = get_existing_tickers()
+    today = pd.Timestamp.today().normalize()
+
+    last_recorded_dates = {}
+    tickers_by_start = {}
     for ticker_symbol in existing_tickers:
-        file_path = os.path.join(DEFAULT_DATABASE_PATH, f'{ticker_symbol}.csv')
-        existing_data = pd.read_csv(file_path)
+        last_recorded_date = store.last_date(ticker_symbol)
+        last_recorded_dates[ticker_symbol] = last_recorded_date
+        start = None
+        if last_recorded_date is not None:
+            start = (last_recorded_date + pd.DateOffset(1)).normalize()
+            if start >= today:
+                continue
+        tickers_by_start.setdefault(start, []).append(ticker_symbol)
+
+    batches = [(start, tickers[i:i + batch_size])
+               for start, tickers in tickers_by_start.items()
+               for i in range(0, len(tickers), batch_size)]
+
+    def fetch_and_append(batch):
+        start, ticker_symbols = batch
+        try:
+            if start is None:
+                new_data = provider(ticker_symbols, period='5y')
+            else:
+                new_data = provider(ticker_symbols, start=start.strftime('%Y-%m-%d'),
+                                    end=today.strftime('%Y-%m-%d'))
+        except Exception as error: # pylint: disable=broad-except
+            print(f"Fail to update {', '.join(ticker_symbols)}: {error}")
+            return
+        for ticker_symbol in ticker_symbols:
+            if ticker_symbol not in new_data:
+                continue
+            rows = _new_rows(new_data[ticker_symbol], last_recorded_dates[ticker_symbol])
+            if len(rows) > 0:
+                store.append(ticker_symbol, rows)
+                invalidate_stock_data_cache(ticker_symbol)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(fetch_and_append, batches))
 
-        last_recorded_date = pd.to_datetime(existing_data['Date'].iloc[-1])
-        last_recorded_date += pd.DateOffset(1)
-        last_recorded_date = last_recorded_date.strftime('%Y-%m-%d')
-        today = pd.Timestamp.today().strftime('%Y-%m-%d')
+    return existing_tickers
 
-        new_data = yf.download(ticker_symbol, start=last_recorded_date, end=today)
-        new_data.to_csv(file_path, mode='a', header=False)
+def _get_ticker_store(ticker_symbol):
+    """
+    Validate a ticker symbol and return it (upper case) with the price store holding it.
 
-    return existing_tickers
+    Exceptions:
+    TypeError if ticker_symbol is not a string
+    ValueError if ticker not in database
+    """
+    if not isinstance(ticker_symbol, str):
+        raise TypeError("ticker symbol must be strings.")
+    ticker_symbol = ticker_symbol.upper()
+    store = get_price_store()
+    if not store.exists(ticker_symbol):
+        raise ValueError("No such database. Please download initial data first.")
+    return ticker_symbol, store
+
+def get_data_version(ticker_symbol):
+    """
+    Function to get a token that changes whenever the stored table of a ticker
+    changes, to key caches of data derived from it.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol.
+
+    Returns:
+    tuple: version of the stored table (see backend.price_store).
+
+    Exceptions:
+    TypeError if ticker_symbol is not a string
+    ValueError if ticker not in database
+    """
+    ticker_symbol, store = _get_ticker_store(ticker_symbol)
+    return store.version(ticker_symbol)
 
-def get_stock_data(ticker_symbol):
+def _compact_stock_data(stock_data):
+    """
+    Downcast a price table: datetime64 dates, float32 prices and the smallest
+    unsigned integer type (uint32 or uint64) holding the volumes.
+    """
+    compact = {'Date': pd.to_datetime(stock_data['Date'])}
+    for column in stock_data.columns.drop('Date'):
+        values = stock_data[column]
+        if pd.api.types.is_float_dtype(values):
+            values = values.astype(COMPACT_PRICE_DTYPE)
+        elif pd.api.types.is_integer_dtype(values) and (len(values) == 0 or values.min() >= 0):
+            fits_uint32 = len(values) == 0 or values.max() <= np.iinfo(np.uint32).max
+            values = values.astype(np.uint32 if fits_uint32 else np.uint64)
+        compact[column] = values
+    return pd.DataFrame(compact)
+
+def get_stock_data(ticker_symbol, columns=None, compact=False):
     """
     Function to fetch stock data for a given ticker symbol from statistic database.
 
     Parameters:
     ticker_symbol (str): The stock ticker symbol.
+    columns (list, optional): Price columns to load (e.g. ['Close']), the 'Date'
+                              column is always included. Defaults to None (all columns,
+                              except 'Adj Close' in compact mode).
+    compact (bool, optional): Load compact dtypes (see module docstring). Defaults to False.
 
     Returns:
-    pd.DataFrame: A DataFrame containing the stock data.
+    pd.DataFrame: A DataFrame containing the stock data (served from the
+        in-process cache when the stored table has not changed).
 
     Exceptions:
     TypeError if ticker_symbol is not a string
     ValueError if ticker not in database
     """
-    if not isinstance(ticker_symbol, str):
-        raise TypeError("ticker symbol must be strings.")
-    ticker_symbol = ticker_symbol.upper()
-    file_path = os.path.join(DEFAULT_DATABASE_PATH, f'{ticker_symbol}.csv')
-    if not os.path.exists(file_path):
-        raise ValueError("No such database. Please download initial data first.")
-    return pd.read_csv(file_path)
+    ticker_symbol, store = _get_ticker_store(ticker_symbol)
+    if compact and columns is None:
+        columns = [column for column in store.column_names(ticker_symbol)[1:]
+                   if column not in COMPACT_DROPPED_COLUMNS]
+
+    cache_key = (ticker_symbol, None if columns is None else tuple(columns),
+                 store.version(ticker_symbol))
+    if compact:
+        cache_key += ('compact',)
+    stock_data = _stock_data_cache.get(cache_key)
+    if stock_data is None:
+        stock_data = store.read(ticker_symbol, columns)
+        if compact:
+            stock_data = _compact_stock_data(stock_data)
+        _stock_data_cache.put(cache_key, stock_data)
+    return stock_data.copy(deep=False)
+
+def get_date_index(ticker_symbol):
+    """
+    Function to fetch the sorted dates of the stored table of a ticker.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol.
+
+    Returns:
+    np.ndarray: datetime64[ns] array of the 'Date' column, one entry per stored row
+        (cached until the stored table changes).
 
-def get_filtered_stock_data(ticker_symbol, start_date='1900-01-01', end_date=''):
+    Exceptions:
+    TypeError if ticker_symbol is not a string
+    ValueError if ticker not in database
+    """
+    ticker_symbol, store = _get_ticker_store(ticker_symbol)
+    version = store.version(ticker_symbol)
+    cache_key = (ticker_symbol, '__dates__', version)
+    dates = _stock_data_cache.get(cache_key)
+    if dates is None:
+        stock_data = _stock_data_cache.get((ticker_symbol, None, version))
+        if stock_data is None:
+            stock_data = store.read(ticker_symbol, columns=[])
+        dates = pd.DatetimeIndex(pd.to_datetime(stock_data['Date'])).tz_localize(None)
+        dates = dates.to_numpy(dtype='datetime64[ns]')
+        _stock_data_cache.put(cache_key, dates)
+    return dates
+
+def get_filtered_stock_data(ticker_symbol, start_date='1900-01-01', end_date='', columns=None,
+                            warmup_rows=0):
     """
     Function to fetch stock data of the ticker within given timeframe from statistic database.
 
@@ -139,6 +526,11 @@ def get_filtered_stock_data(ticker_symbol, start_date='1900-01-01', end_date='')
                                 (inclusive) Defaults to '1900-01-01'.
     end_date (str, optional): The end date for the filtered data in 'yyyy-mm-dd' format.
                               (inclusive) Defaults to ''.
+    columns (list, optional): Price columns to load, the 'Date' column is always
+                              included. Defaults to None (all columns).
+    warmup_rows (int, optional): Number of stored rows preceding start_date to
+                                 include as well (fewer if the history is shorter),
+                                 e.g. the warm-up of an indicator. Defaults to 0.
 
     Returns:
     pd.DataFrame: A DataFrame containing the filtered stock data.
@@ -149,8 +541,13 @@ def get_filtered_stock_data(ticker_symbol, start_date='1900-01-01', end_date='')
     ValueError:
         If start_date or end_date has invalid date format
         or start_date is later than end_date.
+
+    Notes:
+    The range is located with a binary search over the sorted date index
+    (see get_date_index), then only the matching rows are sliced from the
+    cached table or read from the price store.
     """
-    stock_data = get_stock_data(ticker_symbol)
+    ticker_symbol, store = _get_ticker_store(ticker_symbol)
 
     if not (isinstance(start_date, str) and isinstance(end_date, str)):
         raise TypeError("Dates must be strings in form of 'yyyy-mm-dd'.")
@@ -169,7 +566,21 @@ def get_filtered_stock_data(ticker_symbol, start_date='1900-01-01', end_date='')
     if start_date > end_date:
         raise ValueError("Start date after end date.")
 
-    return stock_data.query(f"'{start_date}' <= Date <= '{end_date}'")
+    dates = get_date_index(ticker_symbol)
+    start_row = int(dates.searchsorted(start_date.to_datetime64(), side='left'))
+    start_row = max(start_row - int(warmup_rows), 0)
+    stop_row = int(dates.searchsorted(end_date.to_datetime64(), side='right'))
+
+    version = store.version(ticker_symbol)
+    if columns is not None and (ticker_symbol, tuple(columns), version) in _stock_data_cache:
+        stock_data = _stock_data_cache.get((ticker_symbol, tuple(columns), version))
+    else:
+        stock_data = _stock_data_cache.get((ticker_symbol, None, version))
+    if stock_data is not None:
+        if columns is not None:
+            stock_data = stock_data[['Date', *columns]]
+        return stock_data.iloc[start_row:stop_row].copy(deep=False)
+    return store.read_rows(ticker_symbol, start_row, stop_row, columns)
 
 def get_last_n_days(stock_data, n_days):
     """
@@ -0,0 +1,412 @@
+"""
+streaming_indicators module: stateful technical indicators advanced one bar at a time.
+
+Each indicator keeps only the state its rolling window needs (the last closes,
+gains and losses and their running sums), so a new daily bar is added in O(1)
+instead of recomputing the whole history with backend.technical_indicators.
+The values match the batch functions: the state is seeded from the end of the
+history and running sums are recomputed exactly from the window every
+RECOMPUTE_INTERVAL updates, so floating point drift cannot accumulate.
+
+States are plain JSON and can be saved next to the stored indicator series,
+then reloaded to extend it when update_stock_data appends new days.
+
+Classes:
+    1. StreamingIndicator(length)
+    2. StreamingSMA(length)
+    3. StreamingRSI(length=14)
+    4. StreamingROC(length=14)
+    5. StreamingBBP(length=20, num_std_dev=2)
+
+Functions:
+    1. create_streaming_indicator(indicator, length)
+    2. load_streaming_indicator(file_path)
+    3. extend_indicator_series(series, indicator, stock_data)
+
+Example Usage:
+    >> rsi = StreamingRSI.from_history(get_stock_data('AAPL'), 14)
+    >> rsi.update(172.5, '2024-03-06')
+    >> rsi.save('data/AAPL_RSI_14.json')
+"""
+import json
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+import pandas as pd
+
+from backend.atomic_file import atomic_replace
+
+# Number of updates after which running sums are recomputed from the window.
+RECOMPUTE_INTERVAL = 512
+
+
+class StreamingIndicator(ABC):
+    """
+    Base class of the streaming indicators: subclasses implement _push,
+    _current_value, _state and _restore.
+
+    Attributes:
+    name (str): indicator name, as the column returned by backend.technical_indicators.
+    length (int): window length.
+    value (float): indicator value after the last update, NaN during the warm-up.
+    last_date (pd.Timestamp): date of the last update, None if updates were not dated.
+    """
+    name = None
+
+    def __init__(self, length):
+        if isinstance(length, bool) or not isinstance(length, int) or length < 1:
+            raise ValueError("length must be a positive integer.")
+        self.length = length
+        self.value = math.nan
+        self.last_date = None
+        self._updates = 0
+
+    @classmethod
+    def history_rows(cls, length):
+        """Return the number of trailing closes needed to seed the state."""
+        return length + 1
+
+    @classmethod
+    def from_history(cls, data, length, **parameters):
+        """
+        Create an indicator seeded from the end of a price history.
+
+        Parameters:
+        data (pd.DataFrame): stock data with 'Date' and 'Close' columns, in date order.
+        length (int): window length.
+
+        Returns:
+        StreamingIndicator: the state after the last row of data.
+        """
+        indicator = cls(length, **parameters)
+        indicator.update_frame(data.tail(cls.history_rows(length)))
+        return indicator
+
+    def update(self, close, date=None):
+        """
+        Add one bar and return the new indicator value.
+
+        Parameters:
+        close (float): closing price of the new bar.
+        date (str or pd.Timestamp, optional): date of the new bar. Bars must be
+            added in increasing date order.
+
+        Returns:
+        float: the indicator value, NaN during the warm-up.
+
+        Exceptions:
+        ValueError if date is not after the date of the last update.
+        """
+        if date is not None:
+            date = pd.Timestamp(date)
+            if self.last_date is not None and date <= self.last_date:
+                raise ValueError(f"bar of {date.date()} is not after {self.last_date.date()}.")
+        self._push(float(close))
+        self._updates += 1
+        if self._updates % RECOMPUTE_INTERVAL == 0:
+            self._recompute()
+        self.value = self._current_value()
+        self.last_date = date if date is not None else self.last_date
+        return self.value
+
+    def update_frame(self, data):
+        """
+        Add every row of data and return the new values.
+
+        Parameters:
+        data (pd.DataFrame): new rows with 'Date' and 'Close' columns, in date order.
+
+        Returns:
+        pd.DataFrame: 'Date' and the indicator column, like backend.technical_indicators.
+        """
+        values = [self.update(close, date) for date, close in zip(data['Date'], data['Close'])]
+        return pd.DataFrame({'Date': data['Date'].to_numpy(), self.name: values},
+                            index=data.index)
+
+    @abstractmethod
+    def _push(self, close):
+        """Add a close to the window and update the running sums."""
+
+    def _recompute(self):
+        """Recompute running sums exactly from the window."""
+
+    @abstractmethod
+    def _current_value(self):
+        """Return the indicator value of the current window, NaN during the warm-up."""
+
+    @abstractmethod
+    def _state(self):
+        """Return the indicator specific state as JSON compatible values."""
+
+    @abstractmethod
+    def _restore(self, state):
+        """Restore the indicator specific state written by _state."""
+
+    def to_dict(self):
+        """Return the state of the indicator as a JSON compatible dict."""
+        return {'indicator': self.name, 'length': self.length,
+                'last_date': None if self.last_date is None else self.last_date.isoformat(),
+                'state': self._state()}
+
+    def load_state(self, state):
+        """Restore the state of a new indicator from a dict returned by to_dict."""
+        self._restore(state['state'])
+        self._recompute()
+        if state['last_date'] is not None:
+            self.last_date = pd.Timestamp(state['last_date'])
+        self.value = self._current_value()
+
+    @staticmethod
+    def from_dict(state):
+        """Create an indicator from a dict returned by to_dict."""
+        indicator_class = STREAMING_INDICATORS[state['indicator']]
+        indicator = indicator_class(state['length'], **state['state'].get('parameters', {}))
+        indicator.load_state(state)
+        return indicator
+
+    def save(self, file_path):
+        """Write the state of the indicator to a JSON file, atomically."""
+        state = self.to_dict()
+
+        def write_state(path):
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(state, file)
+
+        atomic_replace(file_path, write_state)
+
+
+class StreamingSMA(StreamingIndicator):
+    """Simple Moving Average of the closes, see calculate_simple_moving_average."""
+    name = 'MA'
+
+    def __init__(self, length):
+        super().__init__(length)
+        self._window = deque(maxlen=length)
+        self._sum = 0.0
+
+    def _push(self, close):
+        if len(self._window) == self.length:
+            self._sum -= self._window[0]
+        self._window.append(close)
+        self._sum += close
+
+    def _recompute(self):
+        self._sum = math.fsum(self._window)
+
+    def _current_value(self):
+        if len(self._window) < self.length:
+            return math.nan
+        return self._sum / self.length
+
+    def _state(self):
+        return {'window': list(self._window)}
+
+    def _restore(self, state):
+        self._window.extend(state['window'])
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    Relative Strength Index of the closes, see calculate_rsi.
+
+    As in the batch function, the first close of a history counts as a change of 0;
+    seeded from a longer history, that change falls out of the window.
+    """
+    name = 'RSI'
+
+    def __init__(self, length=14):
+        super().__init__(length)
+        self._previous = None
+        self._gains = deque(maxlen=length)
+        self._losses = deque(maxlen=length)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        # number of days of the window with a gain (loss)
+        self._gain_days = 0
+        self._loss_days = 0
+
+    def _push(self, close):
+        change = 0.0 if self._previous is None else close - self._previous
+        self._previous = close
+        if len(self._gains) == self.length:
+            self._gain_sum -= self._gains[0]
+            self._loss_sum -= self._losses[0]
+            self._gain_days -= self._gains[0] > 0
+            self._loss_days -= self._losses[0] > 0
+        self._gains.append(max(change, 0.0))
+        self._losses.append(max(-change, 0.0))
+        self._gain_sum += self._gains[-1]
+        self._loss_sum += self._losses[-1]
+        self._gain_days += change > 0
+        self._loss_days += change < 0
+
+    def _recompute(self):
+        self._gain_sum = math.fsum(self._gains)
+        self._loss_sum = math.fsum(self._losses)
+        self._gain_days = sum(gain > 0 for gain in self._gains)
+        self._loss_days = sum(loss > 0 for loss in self._losses)
+
+    def _current_value(self):
+        if len(self._gains) < self.length:
+            return math.nan
+        # windows without any gain (or loss) have a sum of exactly 0, not the rounding residue
+        gain = self._gain_sum if self._gain_days else 0.0
+        loss = self._loss_sum if self._loss_days else 0.0
+        if loss == 0:
+            return 100.0 if gain > 0 else math.nan
+        return 100 - (100 / (1 + gain / loss))
+
+    def _state(self):
+        return {'previous': self._previous, 'gains': list(self._gains),
+                'losses': list(self._losses)}
+
+    def _restore(self, state):
+        self._previous = state['previous']
+        self._gains.extend(state['gains'])
+        self._losses.extend(state['losses'])
+
+
+class StreamingROC(StreamingIndicator):
+    """Rate of Change of the closes in percent, see calculate_roc."""
+    name = 'ROC'
+
+    def __init__(self, length=14):
+        super().__init__(length)
+        self._window = deque(maxlen=length + 1)
+
+    def _push(self, close):
+        self._window.append(close)
+
+    def _current_value(self):
+        if len(self._window) <= self.length or self._window[0] == 0:
+            return math.nan
+        return (self._window[-1] - self._window[0]) / self._window[0] * 100
+
+    def _state(self):
+        return {'window': list(self._window)}
+
+    def _restore(self, state):
+        self._window.extend(state['window'])
+
+
+class StreamingBBP(StreamingIndicator):
+    """
+    Bollinger Bands %B of the closes, see calculate_bollinger_bands_percent.
+
+    Running sums are kept relative to an anchor close near the window, so the
+    variance is not the difference of two large sums.
+    """
+    name = 'BBP'
+
+    def __init__(self, length=20, num_std_dev=2):
+        super().__init__(length)
+        self.num_std_dev = num_std_dev
+        self._window = deque(maxlen=length)
+        self._anchor = None
+        self._sum = 0.0
+        self._squares = 0.0
+        # number of consecutive closes of the window that differ
+        self._changes = 0
+
+    @classmethod
+    def history_rows(cls, length):
+        return length
+
+    def _push(self, close):
+        if self._anchor is None:
+            self._anchor = close
+        if len(self._window) == self.length:
+            oldest = self._window[0] - self._anchor
+            self._sum -= oldest
+            self._squares -= oldest * oldest
+            if self.length > 1 and self._window[1] != self._window[0]:
+                self._changes -= 1
+        if self.length > 1 and self._window and close != self._window[-1]:
+            self._changes += 1
+        self._window.append(close)
+        deviation = close - self._anchor
+        self._sum += deviation
+        self._squares += deviation * deviation
+
+    def _recompute(self):
+        if not self._window:
+            return
+        self._anchor = math.fsum(self._window) / len(self._window)
+        self._sum = math.fsum(close - self._anchor for close in self._window)
+        self._squares = math.fsum((close - self._anchor) ** 2 for close in self._window)
+        self._changes = sum(1 for previous, close in zip(self._window, list(self._window)[1:])
+                            if close != previous)
+
+    def _current_value(self):
+        if len(self._window) < self.length or self.length < 2 or self._changes == 0:
+            return math.nan
+        mean = self._sum / self.length
+        variance = (self._squares - self._sum * mean) / (self.length - 1)
+        std_dev = math.sqrt(max(variance, 0.0))
+        if std_dev == 0:
+            return math.nan
+        lower_band = self._anchor + mean - std_dev * self.num_std_dev
+        return (self._window[-1] - lower_band) / (2 * self.num_std_dev * std_dev)
+
+    def _state(self):
+        return {'window': list(self._window), 'parameters': {'num_std_dev': self.num_std_dev}}
+
+    def _restore(self, state):
+        self._window.extend(state['window'])
+
+
+STREAMING_INDICATORS = {indicator.name: indicator
+                        for indicator in (StreamingSMA, StreamingRSI, StreamingROC, StreamingBBP)}
+
+
+def create_streaming_indicator(indicator, length):
+    """
+    Function to create an empty streaming indicator.
+
+    Parameters:
+    indicator (str): 'MA', 'RSI', 'ROC' or 'BBP'.
+    length (int): window length.
+
+    Returns:
+    StreamingIndicator
+
+    Exceptions:
+    ValueError if the indicator is not supported or length is not a positive integer.
+    """
+    if indicator not in STREAMING_INDICATORS:
+        raise ValueError("Unsupported indicator. Please use 'MA','RSI','ROC' or 'BBP'.")
+    return STREAMING_INDICATORS[indicator](length)
+
+
+def load_streaming_indicator(file_path):
+    """
+    Function to load a streaming indicator saved with StreamingIndicator.save.
+
+    Parameters:
+    file_path (str): path of the JSON state file.
+
+    Returns:
+    StreamingIndicator
+    """
+    with open(file_path, encoding='utf-8') as file:
+        return StreamingIndicator.from_dict(json.load(file))
+
+
+def extend_indicator_series(series, indicator, stock_data):
+    """
+    Function to extend a computed indicator series with the new days of a ticker.
+
+    Parameters:
+    series (pd.DataFrame): 'Date' and indicator columns computed up to indicator.last_date.
+    indicator (StreamingIndicator): state after the last row of series (updated in place).
+    stock_data (pd.DataFrame): stock data with 'Date' and 'Close' columns; only the
+                               rows after indicator.last_date are used.
+
+    Returns:
+    pd.DataFrame: series followed by the values of the new days.
+    """
+    new_rows = stock_data
+    if indicator.last_date is not None:
+        new_rows = stock_data[pd.to_datetime(stock_data['Date']) > indicator.last_date]
+    return pd.concat([series, indicator.update_frame(new_rows)], ignore_index=True)
@@ -1,17 +1,54 @@
-"""Module for calculating various technical indicators used in financial analysis."""
+"""Module for calculating various technical indicators used in financial analysis.
+
+Every indicator has two implementations: 'pandas' (rolling Series operations)
+and 'numpy' (the cumulative-sum kernels of backend.indicator_kernels working on
+the raw 'Close' array, with a single DataFrame built for the result). Both give
+the same values within floating point rounding. The default is read from the
+DINERO_INDICATOR_BACKEND environment variable and can be changed with
+set_indicator_backend, or per call with the backend argument.
+"""
+import os
+
+import numpy as np
 import pandas as pd
 
+import backend.indicator_kernels as kernels
+
+SUPPORTED_BACKENDS = ('pandas', 'numpy')
+INDICATOR_BACKEND = os.environ.get('DINERO_INDICATOR_BACKEND', 'pandas')
+
+
+def set_indicator_backend(backend):
+    """Selects the default implementation of the indicators: 'pandas' or 'numpy'."""
+    global INDICATOR_BACKEND  # pylint: disable=global-statement
+    INDICATOR_BACKEND = _check_backend(backend)
+
+
+def _check_backend(backend):
+    """Returns the backend to use, the default one if backend is None."""
+    backend = INDICATOR_BACKEND if backend is None else backend
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"backend must be one of {SUPPORTED_BACKENDS}.")
+    return backend
+
 
 # Simple Moving Average
-def calculate_simple_moving_average(data, length):
+def calculate_simple_moving_average(data, length, backend=None):
     """Calculates the Simple Moving Average (SMA) of the 'Close' prices over a specified length."""
+    if _check_backend(backend) == 'numpy':
+        close_windows = kernels.RollingWindows(_close_array(data))
+        return _array_dataframe(data, kernels.simple_moving_average(close_windows, length), 'MA')
     moving_avg = data['Close'].rolling(window=length).mean()
     return _formatted_dataframe(data, moving_avg, 'MA')
 
 
 # Relative Strength Index
-def calculate_rsi(data, length=14):
+def calculate_rsi(data, length=14, backend=None):
     """Computes the Relative Strength Index (RSI) for the 'Close' prices over a specified length."""
+    if _check_backend(backend) == 'numpy':
+        gains, losses = kernels.gains_and_losses(_close_array(data))
+        rsi = kernels.rsi(kernels.RollingWindows(gains), kernels.RollingWindows(losses), length)
+        return _array_dataframe(data, rsi, 'RSI')
     delta = data['Close'].diff(1)
     gain = (delta.where(delta > 0, 0)).rolling(window=length).mean()
     loss = (-delta.where(delta < 0, 0)).rolling(window=length).mean()
@@ -22,16 +59,23 @@ def calculate_rsi(data, length=14):
 
 
 # Rate of Change
-def calculate_roc(data, length=14):
+def calculate_roc(data, length=14, backend=None):
     """Determines the Rate of Change (ROC) of the 'Close' prices over a specified length."""
+    if _check_backend(backend) == 'numpy':
+        return _array_dataframe(data, kernels.roc(_close_array(data), length), 'ROC')
     roc = ((data['Close'] - data['Close'].shift(length)) / data['Close'].shift(length)) * 100
     return _formatted_dataframe(data, roc, 'ROC')
 
 
 # Bollinger Bands %
-def calculate_bollinger_bands_percent(data, length=20, num_std_dev=2):
+def calculate_bollinger_bands_percent(data, length=20, num_std_dev=2, backend=None):
     """Calculates the Bollinger Bands Percentage (BBP) for the 'Close' prices
     over a specified length."""
+    if _check_backend(backend) == 'numpy':
+        close = _close_array(data)
+        percent_b = kernels.bollinger_bands_percent(close, kernels.RollingWindows(close),
+                                                    length, num_std_dev)
+        return _array_dataframe(data, percent_b, 'BBP')
     sma = data['Close'].rolling(window=length).mean()
     std_dev = data['Close'].rolling(window=length).std()
 
@@ -52,3 +96,15 @@ def _formatted_dataframe(data, indicator, name):
     result_df['Date'] = data['Date']
     result_df[name] = indicator
     return result_df
+
+
+def _close_array(data):
+    """Returns the 'Close' prices of data as a float64 array."""
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("data must be a pandas DataFrame")
+    return data['Close'].to_numpy(np.float64)
+
+
+def _array_dataframe(data, values, name):
+    """Builds the resulting DataFrame from the date column and an indicator array in one step."""
+    return pd.DataFrame({'Date': data['Date'].to_numpy(), name: values}, index=data.index)
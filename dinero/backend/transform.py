@@ -1,13 +1,48 @@
 """Module for analyzing stock data and fetching relevant news articles.
 
     Function:
+        - find_value_change_dates
         - find_count_value_change
+        - find_stored_value_change
         - get_filter_dates
 """
+import os
 
+import numpy as np
 import pandas as pd
 
-from backend.req import get_news_articles
+from backend.mmap_store import load_mmap_arrays
+from backend.news_cache import fetch_cached_news
+from backend.req import NEWS_FETCH_MODES, fetch_news_by_date, fetch_news_by_range
+from backend.stock_data_manager import get_price_store
+
+
+def find_value_change_dates(dates, open_prices, close_prices, value_change: int) -> list:
+    """
+    Finds dates with a specified value change percentage from raw price arrays
+    (e.g. the memory-mapped arrays of backend.mmap_store), without building a DataFrame.
+
+    Args:
+        dates (np.ndarray): 'YYYY-MM-DD' strings or datetime64 dates.
+        open_prices (np.ndarray): Open prices, aligned with dates.
+        close_prices (np.ndarray): Close prices, aligned with dates.
+        value_change (int): The percentage change value to filter the data by.
+
+    Returns:
+        list: A list of dates ('YYYY-MM-DD') where the value change percentage
+              meets the criteria.
+    """
+    open_prices = np.asarray(open_prices, dtype=np.float64)
+    percent_change = (np.asarray(close_prices) - open_prices) / open_prices * 100
+
+    if value_change >= 0:
+        selected = np.asarray(dates)[percent_change >= value_change]
+    else:
+        selected = np.asarray(dates)[percent_change <= value_change]
+
+    if np.issubdtype(selected.dtype, np.datetime64):
+        selected = np.datetime_as_string(selected, unit='D')
+    return selected.tolist()
 
 
 def find_count_value_change(file: str, value_change: int) -> list:
@@ -15,54 +50,102 @@ def find_count_value_change(file: str, value_change: int) -> list:
     Analyzes stock data to find dates with a specified value change percentage.
 
     Args:
-        file (str): Path to the CSV file containing stock data.
+        file (str): Path to the CSV (or Parquet) file containing stock data.
         value_change (int): The percentage change value to filter the data by.
 
     Returns:
-        list: A list of dates where the value change percentage meets the criteria.
+        list: A list of dates ('YYYY-MM-DD') where the value change percentage
+              meets the criteria.
     """
     try:
-        stock_data = pd.read_csv(file)
-
-        stock_data['Value Change'] = stock_data['Close'] - stock_data['Open']
-        stock_data['Percent Change'] = (stock_data['Value Change'] / stock_data['Open']) * 100
-
-        if value_change >= 0:
-            change_df = stock_data[stock_data['Percent Change'] >= value_change]
+        if file.endswith('.parquet'):
+            stock_data = pd.read_parquet(file, columns=['Date', 'Open', 'Close'])
         else:
-            change_df = stock_data[stock_data['Percent Change'] <= value_change]
+            stock_data = pd.read_csv(file)
 
-        return change_df['Date'].to_list()
+        return find_value_change_dates(stock_data['Date'].to_numpy(),
+                                       stock_data['Open'].to_numpy(),
+                                       stock_data['Close'].to_numpy(), value_change)
     except FileNotFoundError as error:
         print(f"File Not Found: {error}")
         return None
 
 
-def get_filter_dates(file_path: str, percent_change: int, stock_ticker: str):
+def find_stored_value_change(stock_ticker: str, value_change: int, file: str = None) -> list:
+    """
+    Finds dates with a specified value change percentage of a stored ticker
+    from its memory-mapped Open and Close arrays (see backend.mmap_store),
+    without parsing its price file.
+
+    Args:
+        stock_ticker (str): The ticker symbol of the stock.
+        value_change (int): The percentage change value to filter the data by.
+        file (str): Path to the price file of the stock. Defaults to None (the
+                    stored table); a file other than the stored table of the
+                    ticker is read with find_count_value_change instead.
+
+    Returns:
+        list: A list of dates ('YYYY-MM-DD') where the value change percentage
+              meets the criteria, None if the file is not found.
+    """
+    store = get_price_store()
+    stored_path = store.file_path(stock_ticker.upper())
+    if file is not None and os.path.abspath(file) != os.path.abspath(stored_path):
+        return find_count_value_change(file, value_change)
+    if not store.exists(stock_ticker.upper()):
+        print(f"File Not Found: {stored_path}")
+        return None
+    prices = load_mmap_arrays(stock_ticker, ['Open', 'Close'])
+    return find_value_change_dates(prices.dates, prices['Open'], prices['Close'], value_change)
+
+
+def get_filter_dates(file_path: str, percent_change: int, stock_ticker: str, mode='date',
+                     cached=False):
     """
     Fetches news articles related to stock based on percentage value change.
 
     Args:
-        file_path (str): Path to the CSV file containing stock data.
+        file_path (str): Path to the CSV file containing stock data; the stored
+                         table of the ticker is read from its memory-mapped arrays.
         percent_change (int): The percentage change value to filter the stock data by.
         stock_ticker (str): The ticker symbol of the stock.
+        mode (str): 'date' to request every date on its own (at most one page of
+                    articles per date), 'range' to request windows of nearby dates
+                    once (see req.fetch_news_by_range). Defaults to 'date'.
+        cached (bool): serve the articles from the news cache, requesting only
+                    the dates it misses (see news_cache.fetch_cached_news).
+                    Defaults to False.
 
     Returns:
         dict: A dictionary where keys are dates with significant value changes,
-              and values are lists of news articles related to the stock on those dates.
+              and values are lists of news articles related to the stock on those dates
+              (empty if the articles of a date could not be retrieved).
+
+    The articles of all dates are fetched concurrently over a pooled session
+    (see req.fetch_news_by_date).
+
+    Raises:
+        ValueError: If mode is not one of NEWS_FETCH_MODES.
     """
-    dates_for_articles = find_count_value_change(file_path, percent_change)
+    if mode not in NEWS_FETCH_MODES:
+        raise ValueError(f"Unknown news fetch mode: {mode}")
+    dates_for_articles = find_stored_value_change(stock_ticker, percent_change, file_path) or []
+    if cached:
+        api_responses = fetch_cached_news(stock_ticker, dates_for_articles, mode=mode)
+    elif mode == 'range':
+        api_responses = fetch_news_by_range(stock_ticker, dates_for_articles)
+    else:
+        api_responses = fetch_news_by_date(stock_ticker, dates_for_articles)
 
     news_articles_links = {}
 
-    for date in dates_for_articles:
+    for date, api_response in api_responses.items():
         try:
-            api_response = get_news_articles(stock_ticker, date=date)
             news_articles_links[date] = [{'content': i['content'],'title': i['title'],
                                           'link': i['link'], } for i in
-                                            api_response if any(stock_ticker in symbol
+                                            api_response or [] if any(stock_ticker in symbol
                                                                 for symbol in i['symbols'])]
-        except KeyError as error:
+        except (KeyError, TypeError) as error:
             print(f"Error: Invalid data format in news articles response - {error}")
             news_articles_links[date] = []  # Empty list for this date
     return news_articles_links
@@ -5,13 +5,18 @@ This module creates and controls interactive plots using plotly package.
 
 Functions:
     1. plot_stock_price(ticker_symbol)
-    2. plot_kpis(stock_fig, ticker_symbol, length, kpi_name)
+    2. plot_kpis(stock_fig, ticker_symbol, length, kpi_name, start_date='', end_date='')
+    3. plot_indicator_view(ticker_symbol, length, kpi_names)
+    4. get_view_start_date(ticker_symbol, view)
 """
+import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-from backend.stock_data_manager import get_stock_data
-from backend.kpi_manager import get_technical_indicator
+from backend.stock_data_manager import get_date_index, get_filtered_stock_data, get_stock_data
+from backend.indicator_cache import get_cached_technical_indicator
+from backend.indicator_registry import get_indicator
+from backend.kpi_manager import get_indicator_view
 
 TIME_BUTTONS = [
     {'step': 'all', 'label': 'All'},
@@ -56,7 +61,35 @@ def plot_stock_price(ticker_symbol):
 
     return fig_candlestick
 
-def plot_kpis(stock_fig, ticker_symbol, length, kpi_name):
+def get_view_start_date(ticker_symbol, view):
+    """
+    Get the first date shown by a time button, counted back from the last stored date.
+
+    Parameters:
+    ticker_symbol (str): The ticker symbol of the stock.
+    view (str): label of one of TIME_BUTTONS, e.g. '1 Month'.
+
+    Returns:
+    str: date in 'yyyy-mm-dd' format, '' for 'All'.
+
+    Exceptions:
+    ValueError if view is not the label of a time button.
+    """
+    buttons = {button['label']: button for button in TIME_BUTTONS}
+    if view not in buttons:
+        raise ValueError(f"view must be one of {list(buttons)}.")
+    button = buttons[view]
+    if button['step'] == 'all':
+        return ''
+    last_date = pd.Timestamp(get_date_index(ticker_symbol)[-1])
+    if button['stepmode'] == 'todate':
+        start_date = last_date.to_period(button['step'][0].upper()).start_time
+        start_date -= pd.DateOffset(**{f"{button['step']}s": button['count'] - 1})
+    else:
+        start_date = last_date - pd.DateOffset(**{f"{button['step']}s": button['count']})
+    return start_date.strftime('%Y-%m-%d')
+
+def plot_kpis(stock_fig, ticker_symbol, length, kpi_name, start_date='', end_date=''): # pylint: disable=too-many-arguments
     """
     Plot the specified technical indicator for the given stock.
 
@@ -69,6 +102,11 @@ def plot_kpis(stock_fig, ticker_symbol, length, kpi_name):
         The length of timeframe (in days) to calculate corresponding indicator.
     indicator_name (str):
         The name of the technical indicator to plot.
+    start_date (str, optional):
+        First date to plot in 'yyyy-mm-dd' format. Defaults to '' (first stored date).
+    end_date (str, optional):
+        Last date to plot in 'yyyy-mm-dd' format. Defaults to '' (last stored date).
+        With a date range, only the range and the warm-up of the indicator are computed.
 
     Returns:
     None if plot of 'MA' indicator, plotly.graph_objects.Figure otherwise.
@@ -88,26 +126,37 @@ def plot_kpis(stock_fig, ticker_symbol, length, kpi_name):
         integrate tooltip
         add legend
     """
-    indicator = get_technical_indicator(ticker_symbol,int(length),kpi_name)
+    indicator = get_cached_technical_indicator(ticker_symbol, int(length), kpi_name,
+                                               start_date, end_date)
+
+    spec = get_indicator(kpi_name)
+    outputs = indicator.columns[1:]
 
-    if kpi_name == 'MA':
-        stock_fig.add_trace(go.Scatter(x=indicator['Date'], y=indicator[indicator.columns[1]],
-                                       mode='lines', name=indicator.columns[1]))
+    if spec.overlay:
+        for output in outputs:
+            stock_fig.add_trace(go.Scatter(x=indicator['Date'], y=indicator[output],
+                                           mode='lines', name=output))
         stock_fig.update_layout(title=f'{ticker_symbol} Stock Candlestick Chart with {kpi_name}')
         candles = stock_fig.data[0]
         candles.increasing.fillcolor = '#3D9970' # green
         candles.increasing.line.color = '#3D9970'
         candles.decreasing.fillcolor = '#FF4136' # red
         candles.decreasing.line.color = '#FF4136'
+        if (start_date or end_date) and not indicator.empty:
+            stock_fig.update_xaxes(range=[indicator['Date'].iloc[0], indicator['Date'].iloc[-1]])
         return None
 
     kpi_fig = make_subplots(rows=2, cols=1)
 
-    stock_data = get_stock_data(ticker_symbol)
-    kpi_fig.add_trace(go.Scatter(x=indicator['Date'], y=stock_data['Close'],
+    if start_date or end_date:
+        stock_data = get_filtered_stock_data(ticker_symbol, start_date, end_date, ['Close'])
+    else:
+        stock_data = get_stock_data(ticker_symbol)
+    kpi_fig.add_trace(go.Scatter(x=stock_data['Date'], y=stock_data['Close'],
                                  mode='lines', name='Close Price'), row=1, col=1)
-    kpi_fig.add_trace(go.Scatter(x=indicator['Date'], y=indicator[indicator.columns[1]],
-                                 mode='lines', name=kpi_name), row=2, col=1)
+    for output in outputs:
+        kpi_fig.add_trace(go.Scatter(x=indicator['Date'], y=indicator[output],
+                                     mode='lines', name=output), row=2, col=1)
 
     # Update layout for the KPI line chart
     kpi_fig.update_layout(hovermode="x unified")
@@ -117,3 +166,41 @@ def plot_kpis(stock_fig, ticker_symbol, length, kpi_name):
     kpi_fig.update_xaxes(rangeselector={'buttons': TIME_BUTTONS})
     kpi_fig.update_yaxes(autorange=True, fixedrange = False)
     return kpi_fig
+
+def plot_indicator_view(ticker_symbol, length, kpi_names):
+    """
+    Plot several technical indicators of the given stock in one figure, computed
+    together in a single pass over the prices.
+
+    Parameters:
+    ticker_symbol (str):
+        The ticker symbol of the stock.
+    length (int):
+        The length of timeframe (in days) to calculate the indicators.
+    kpi_names (list):
+        The names of the technical indicators to plot.
+
+    Returns:
+    plotly.graph_objects.Figure:
+    The close price with the overlay indicators (MA, EMA, VWAP) in the first
+    subplot, followed by one subplot per other indicator.
+    """
+    specs = [get_indicator(kpi_name) for kpi_name in kpi_names]
+    view = get_indicator_view(ticker_symbol, [(spec.name, int(length)) for spec in specs])
+    panels = [spec for spec in specs if not spec.overlay]
+
+    view_fig = make_subplots(rows=len(panels) + 1, cols=1, shared_xaxes=True)
+    view_fig.add_trace(go.Scatter(x=view['Date'], y=get_stock_data(ticker_symbol)['Close'],
+                                  mode='lines', name='Close Price'), row=1, col=1)
+    for spec in specs:
+        row = panels.index(spec) + 2 if spec in panels else 1
+        for output in spec.outputs:
+            view_fig.add_trace(go.Scatter(x=view['Date'], y=view[f'{output}_{int(length)}'],
+                                          mode='lines', name=output), row=row, col=1)
+
+    view_fig.update_layout(hovermode="x unified")
+    view_fig.update_layout(title=f'{", ".join(kpi_names)} for {ticker_symbol}',
+                           xaxis_title="Date", yaxis_title="Price")
+    view_fig.update_xaxes(rangeselector={'buttons': TIME_BUTTONS}, row=1, col=1)
+    view_fig.update_yaxes(autorange=True, fixedrange = False)
+    return view_fig
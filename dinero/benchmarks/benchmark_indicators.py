@@ -0,0 +1,69 @@
+"""
+benchmark_indicators.py
+=================
+Compare the 'pandas' and 'numpy' backends of backend.technical_indicators
+on a long synthetic price history.
+
+Example Usage (from the dinero folder):
+    $ python -m benchmarks.benchmark_indicators --rows 2500 100000 --length 50
+"""
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import backend.technical_indicators as ti
+
+FUNCTIONS = {'MA': ti.calculate_simple_moving_average, 'RSI': ti.calculate_rsi,
+             'ROC': ti.calculate_roc, 'BBP': ti.calculate_bollinger_bands_percent}
+
+
+def make_history(rows, seed=0):
+    """Return a random walk of closing prices shaped like get_stock_data output."""
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, rows)))
+    dates = pd.date_range('2000-01-01', periods=rows, freq='min')
+    return pd.DataFrame({'Date': dates, 'Close': close})
+
+
+def time_indicator(function, data, length, backend, repeat):
+    """Return the best time of one indicator computation in ms."""
+    return min(timeit.repeat(lambda: function(data, length, backend=backend),
+                             number=1, repeat=repeat)) * 1000
+
+
+def run_benchmark(rows, length, repeat):
+    """
+    Time every indicator with both backends.
+
+    Returns:
+    pd.DataFrame: best time of each backend in ms and the speedup, one row per
+    history length and indicator.
+    """
+    results = []
+    for row_count in rows:
+        data = make_history(row_count)
+        for name, function in FUNCTIONS.items():
+            pandas_time = time_indicator(function, data, length, 'pandas', repeat)
+            numpy_time = time_indicator(function, data, length, 'numpy', repeat)
+            results.append({'Rows': row_count, 'Indicator': name, 'pandas (ms)': pandas_time,
+                            'numpy (ms)': numpy_time, 'Speedup': pandas_time / numpy_time})
+    return pd.DataFrame(results)
+
+
+def main(argv=None):
+    """Command line entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark the indicator backends.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1250, 10_000, 1_000_000],
+                        help='lengths of the histories (5 years of daily prices is 1250)')
+    parser.add_argument('--length', type=int, default=50, help='indicator window length')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement')
+    args = parser.parse_args(argv)
+
+    print(f'window length {args.length}, best of {args.repeat} runs')
+    print(run_benchmark(args.rows, args.length, args.repeat).to_string(index=False,
+                                                                        float_format='%.2f'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+benchmark_keywords.py
+=================
+Measure the throughput of keyword_extraction.extract_keywords, in articles per
+minute, with every number of worker processes and nlp.pipe batch size, on a
+synthetic corpus of news-like articles (without the cache).
+
+Example Usage (from the dinero folder):
+    $ python -m benchmarks.benchmark_keywords --articles 5000 --workers 1 2 4 --batch-sizes 64 256
+    $ DINERO_SPACY_MODEL=/path/to/pipeline python -m benchmarks.benchmark_keywords
+"""
+import argparse
+import itertools
+import time
+
+import pandas as pd
+
+from backend.keyword_extraction import extract_keywords, get_keyword_version
+from benchmarks.benchmark_lexicon_scorer import make_corpus
+
+COMPANIES = ['Apple', 'Microsoft', 'Tesla', 'Amazon', 'Nvidia']
+PEOPLE = ['Tim Cook', 'Satya Nadella', 'Elon Musk', 'Andy Jassy', 'Jensen Huang']
+
+
+def make_articles(count):
+    """Return count distinct article texts naming companies, people and places."""
+    return [f'{COMPANIES[position % 5]} said on Monday in New York that {PEOPLE[position % 5]} '
+            f'will present the results. {text}'
+            for position, text in enumerate(make_corpus(count))]
+
+
+def run_benchmark(articles, workers, batch_sizes):
+    """
+    Time extract_keywords with every number of workers and batch size.
+
+    Returns:
+    pd.DataFrame: time in s and articles per minute per configuration.
+    """
+    texts = make_articles(articles)
+    extract_keywords(texts[:10], max_workers=1)  # load the pipeline before timing
+    results = []
+    for worker_count, batch_size in itertools.product(workers, batch_sizes):
+        start = time.perf_counter()
+        extract_keywords(texts, batch_size=batch_size, max_workers=worker_count)
+        seconds = time.perf_counter() - start
+        results.append({'Workers': worker_count, 'Batch size': batch_size,
+                        'Time (s)': seconds, 'Articles/min': articles / seconds * 60})
+    return pd.DataFrame(results)
+
+
+def main(argv=None):
+    """Command line entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark the keyword extraction.')
+    parser.add_argument('--articles', type=int, default=5_000, help='articles to process')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='numbers of worker processes to compare')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[128],
+                        help='nlp.pipe batch sizes to compare')
+    args = parser.parse_args(argv)
+
+    print(get_keyword_version())
+    print(run_benchmark(args.articles, args.workers, args.batch_sizes).to_string(
+        index=False, float_format='%.2f'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+benchmark_lexicon_scorer.py
+=================
+Compare the vectorized lexicon scorer with VADER on a synthetic corpus of
+news-like sentences: an accuracy report (mean absolute error of every score,
+correlation of the compound scores, agreement of the positive/neutral/negative
+labels at the usual +-0.05 compound thresholds) and the throughput of both
+scorers in this process.
+
+Example Usage (from the dinero folder):
+    $ python -m benchmarks.benchmark_lexicon_scorer --articles 20000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.lexicon_scorer import SCORE_COLUMNS
+from backend.sentiment_analysis import get_analyzer, get_lexicon_scorer
+
+SUBJECTS = ['Shares', 'The stock', 'Revenue', 'The company', 'Analysts', 'Investors', 'Profit']
+VERBS = ['rallied', 'plunged', 'improved', 'collapsed', 'held steady', 'surged', 'slipped',
+         'recovered', 'disappointed', 'impressed']
+DETAILS = ['after strong earnings', 'on weak guidance', 'despite a lawsuit',
+           'amid fears of a recession', 'with record growth', 'after a surprise loss',
+           'on optimistic forecasts', 'as costs rose', 'following the merger']
+# wording that only VADER's rules handle, in a share of the sentences
+MODIFIERS = ['', '', '', '', 'very ', 'not ', 'EXTREMELY ', 'barely ']
+ENDINGS = ['.', '.', '!', '!!', '?', ', but the outlook is bright.', ', yet risks remain.']
+LABEL_THRESHOLD = 0.05
+
+
+def make_corpus(count, seed=0):
+    """Return count synthetic articles of three to six news-like sentences."""
+    rng = random.Random(seed)
+    return [' '.join(f'{rng.choice(SUBJECTS)} {rng.choice(MODIFIERS)}{rng.choice(VERBS)} '
+                     f'{rng.choice(DETAILS)}{rng.choice(ENDINGS)}'
+                     for _ in range(rng.randint(3, 6)))
+            for _ in range(count)]
+
+
+def _labels(compound):
+    return np.sign(np.where(np.abs(compound) < LABEL_THRESHOLD, 0, compound))
+
+
+def accuracy_report(texts):
+    """
+    Score texts with both scorers and compare the lexicon scores to VADER's.
+
+    Returns:
+    pd.DataFrame: the mean absolute error of every score, the correlation of
+                  the compound scores and the share of matching labels.
+    """
+    analyzer = get_analyzer()
+    vader = np.array([[analyzer.polarity_scores(text)[column] for column in SCORE_COLUMNS]
+                      for text in texts])
+    lexicon = get_lexicon_scorer().score_matrix(texts)
+    rows = [{'Metric': f'mean absolute error, {column}',
+             'Value': np.abs(vader[:, position] - lexicon[:, position]).mean()}
+            for position, column in enumerate(SCORE_COLUMNS)]
+    rows.append({'Metric': 'correlation, compound',
+                 'Value': np.corrcoef(vader[:, 3], lexicon[:, 3])[0, 1]})
+    rows.append({'Metric': 'matching labels (share)',
+                 'Value': (_labels(vader[:, 3]) == _labels(lexicon[:, 3])).mean()})
+    return pd.DataFrame(rows)
+
+
+def throughput_report(texts):
+    """
+    Time both scorers on texts, in this process.
+
+    Returns:
+    pd.DataFrame: time in s, articles per second and speedup per scorer.
+    """
+    analyzer, scorer = get_analyzer(), get_lexicon_scorer()
+    results = []
+    for name, score in (('vader', lambda: [analyzer.polarity_scores(text) for text in texts]),
+                        ('lexicon', lambda: scorer.score(texts))):
+        start = time.perf_counter()
+        score()
+        seconds = time.perf_counter() - start
+        results.append({'Scorer': name, 'Time (s)': seconds,
+                        'Articles/s': len(texts) / seconds})
+    results = pd.DataFrame(results)
+    results['Speedup'] = results['Articles/s'] / results['Articles/s'].iloc[0]
+    return results
+
+
+def main(argv=None):
+    """Command line entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description='Compare the lexicon scorer with VADER.')
+    parser.add_argument('--articles', type=int, default=20_000, help='articles to score')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic corpus')
+    args = parser.parse_args(argv)
+
+    texts = make_corpus(args.articles, args.seed)
+    get_lexicon_scorer()  # build both scorers before timing them
+    print(accuracy_report(texts).to_string(index=False, float_format='%.4f'))
+    print(throughput_report(texts).to_string(index=False, float_format='%.2f'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+benchmark_screener.py
+=================
+Measure how backend.screener scales with the number of worker processes on a
+synthetic universe of random-walk tickers written to a temporary database.
+
+Worker processes inherit the temporary database path, which requires the
+'fork' start method (the default on Linux).
+
+Example Usage (from the dinero folder):
+    $ python -m benchmarks.benchmark_screener --tickers 800 --workers 1 2 4 8
+"""
+import argparse
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import backend.stock_data_manager as sdm
+from backend.screener import screen_tickers
+
+PREDICATES = ['RSI_14 < 30', 'BBP_20 > 1']
+
+
+def make_universe(tickers, rows, seed=0):
+    """Write tickers random-walk price tables shaped like yfinance data to the database."""
+    store = sdm.get_price_store()
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2000-01-03', periods=rows).strftime('%Y-%m-%d')
+    for position in range(tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+        spread = close * np.abs(rng.normal(0, 0.01, rows))
+        store.write(f'T{position:04d}', pd.DataFrame({
+            'Date': dates, 'Open': close, 'High': close + spread, 'Low': close - spread,
+            'Close': close, 'Adj Close': close,
+            'Volume': rng.integers(10_000, 1_000_000, rows)}))
+
+
+def run_benchmark(workers, repeat):
+    """
+    Time the screener with every number of workers.
+
+    Returns:
+    pd.DataFrame: best time in s, speedup and parallel efficiency per worker count.
+    """
+    results = []
+    for worker_count in workers:
+        seconds = min(timeit.repeat(lambda count=worker_count: screen_tickers(
+            PREDICATES, max_workers=count), number=1, repeat=repeat))
+        results.append({'Workers': worker_count, 'Time (s)': seconds})
+    results = pd.DataFrame(results)
+    results['Speedup'] = results['Time (s)'].iloc[0] / results['Time (s)']
+    results['Efficiency'] = results['Speedup'] / (results['Workers'] / workers[0])
+    return results
+
+
+def main(argv=None):
+    """Command line entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark the screener across cores.')
+    parser.add_argument('--tickers', type=int, default=800, help='size of the universe')
+    parser.add_argument('--rows', type=int, default=1250,
+                        help='rows per ticker (5 years of daily prices is 1250)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='numbers of worker processes to compare')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as database_path:
+        sdm.DEFAULT_DATABASE_PATH = database_path
+        make_universe(args.tickers, args.rows)
+        print(f'{args.tickers} tickers, {args.rows} rows, best of {args.repeat} runs')
+        print(run_benchmark(args.workers, args.repeat).to_string(index=False,
+                                                                 float_format='%.2f'))
+
+
+if __name__ == '__main__':
+    main()
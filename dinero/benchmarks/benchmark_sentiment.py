@@ -0,0 +1,119 @@
+"""
+benchmark_sentiment.py
+=================
+Measure the cold start of backend.sentiment_analysis (import, then first call
+loading the lexicon, in a fresh interpreter) and the cost of one
+get_sentiment_value call with the shared analyzer against building an analyzer
+per call, as every call did before the analyzer was shared; then the throughput
+of batch_sentiment_values with every number of worker processes.
+
+Example Usage (from the dinero folder):
+    $ python -m benchmarks.benchmark_sentiment --articles 20 --repeat 20
+    $ python -m benchmarks.benchmark_sentiment --batch-articles 50000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import subprocess
+import sys
+import timeit
+
+import pandas as pd
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+from backend.sentiment_analysis import (
+    batch_sentiment_values,
+    get_lexicon_path,
+    get_sentiment_value
+)
+
+COLD_START = '''
+import json, time
+start = time.perf_counter()
+import backend.sentiment_analysis as sentiment_analysis
+imported = time.perf_counter()
+sentiment_analysis.get_sentiment_value([{'title': 't', 'content': 'A great day.', 'link': ''}])
+print(json.dumps([imported - start, time.perf_counter() - imported]))
+'''
+
+SENTENCES = ['Shares rallied after the company beat earnings expectations.',
+             'The stock plunged on weak guidance and a surprise loss.',
+             'Analysts see the merger as neutral for the sector.']
+
+
+def make_articles(count):
+    """Return count distinct articles shaped like the output of transform.get_filter_dates."""
+    return [{'title': f'Title {position}', 'link': f'https://example.com/{position}',
+             'content': ' '.join(SENTENCES[position % 3:] + SENTENCES[:position % 3]) * 5
+                        + f' Update {position}.'}
+            for position in range(count)]
+
+
+def score_with_new_analyzer(articles):
+    """get_sentiment_value as it was: a new analyzer (and lexicon parse) per call."""
+    analyzer = SentimentIntensityAnalyzer(lexicon_file=get_lexicon_path())
+    return {article['title']: {'sentiment_score': analyzer.polarity_scores(article['content']),
+                               'link': article['link']} for article in articles}
+
+
+def run_benchmark(articles, repeat):
+    """
+    Time the cold start and both ways of scoring a call's articles.
+
+    Returns:
+    pd.DataFrame: one row per measurement, best of repeat runs.
+    """
+    cold = [json.loads(subprocess.run([sys.executable, '-c', COLD_START], check=True,
+                                      capture_output=True, text=True).stdout)
+            for _ in range(min(repeat, 5))]
+    batch = make_articles(articles)
+    get_sentiment_value(batch)  # load the lexicon before timing calls
+    shared = min(timeit.repeat(lambda: get_sentiment_value(batch), number=1, repeat=repeat))
+    per_call = min(timeit.repeat(lambda: score_with_new_analyzer(batch), number=1,
+                                 repeat=repeat))
+    return pd.DataFrame([
+        {'Measurement': 'import (ms)', 'Time': min(row[0] for row in cold) * 1000},
+        {'Measurement': 'first call, loading the lexicon (ms)',
+         'Time': min(row[1] for row in cold) * 1000},
+        {'Measurement': f'call of {articles} articles, new analyzer (ms)',
+         'Time': per_call * 1000},
+        {'Measurement': f'call of {articles} articles, shared analyzer (ms)',
+         'Time': shared * 1000}])
+
+
+def run_batch_benchmark(articles, workers):
+    """
+    Time batch_sentiment_values with every number of workers.
+
+    Returns:
+    pd.DataFrame: time in s, articles per second and speedup per worker count.
+    """
+    batch = make_articles(articles)
+    results = []
+    for worker_count in workers:
+        _, stats = batch_sentiment_values(batch, max_workers=worker_count)
+        results.append({'Workers': worker_count, 'Time (s)': stats['seconds'],
+                        'Articles/s': stats['articles_per_second']})
+    results = pd.DataFrame(results)
+    results['Speedup'] = results['Articles/s'] / results['Articles/s'].iloc[0]
+    return results
+
+
+def main(argv=None):
+    """Command line entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark the sentiment analyzer.')
+    parser.add_argument('--articles', type=int, default=20, help='articles per call')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per measurement')
+    parser.add_argument('--batch-articles', type=int, default=20_000,
+                        help='articles scored by the batch benchmark')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='numbers of worker processes to compare')
+    args = parser.parse_args(argv)
+
+    print(run_benchmark(args.articles, args.repeat).to_string(index=False,
+                                                              float_format='%.2f'))
+    print(run_batch_benchmark(args.batch_articles, args.workers).to_string(
+        index=False, float_format='%.2f'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+temp_database.py
+===========
+
+This module contains the shared fixture of the unit tests needing a database.
+
+Classes:
+    TempDatabaseTestCase: Base test case serving a temporary database.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from backend.stock_data_manager import invalidate_stock_data_cache
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """
+    Base test case serving an empty temporary folder as DEFAULT_DATABASE_PATH
+    for every test, so the tables, memory-mapped mirrors and caches
+    (`.cache/`) the tests write never reach the data folder of the repo.
+    """
+
+    def setUp(self):
+        """
+        Create the temporary database and clear the get_stock_data cache.
+        """
+        self.base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_path)
+        self.patch('backend.stock_data_manager.DEFAULT_DATABASE_PATH', self.base_path)
+        invalidate_stock_data_cache()
+        self.addCleanup(invalidate_stock_data_cache)
+
+    def patch(self, target, *args, **kwargs):
+        """
+        Patch target (see unittest.mock.patch) until the end of the test.
+
+        Returns:
+        the patched object.
+        """
+        patcher = mock.patch(target, *args, **kwargs)
+        patched = patcher.start()
+        self.addCleanup(patcher.stop)
+        return patched
+
+    def copy_tickers(self, *ticker_symbols):
+        """
+        Copy the tables of tickers (of every ticker if none is given) from the
+        data folder of the repo to the temporary database.
+        """
+        file_names = ([f'{ticker_symbol}.csv' for ticker_symbol in ticker_symbols]
+                      or [name for name in os.listdir(DATA_PATH) if name.endswith('.csv')])
+        for file_name in file_names:
+            shutil.copy(os.path.join(DATA_PATH, file_name), self.base_path)
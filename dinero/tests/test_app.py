@@ -14,11 +14,13 @@ from unittest import mock
 from streamlit.testing.v1 import AppTest
 import pandas as pd
 
+from tests.temp_database import TempDatabaseTestCase
+
 
 @mock.patch('backend.processing.get_sentiments')
 
 
-class TestStreamlitApp(unittest.TestCase):
+class TestStreamlitApp(TempDatabaseTestCase):
     """
     A unittest.TestCase class to test Streamlit UI
     application functionalities.
@@ -45,6 +47,8 @@ class TestStreamlitApp(unittest.TestCase):
                                 Streamlit application.
     - test_add_new_ticker_time_period_input: Test the input of time period for a new
                                 ticker in the Streamlit application.
+    - test_bulk_import_tickers_input: Test the bulk ticker import inputs in the
+                                Streamlit application.
     - update_data_for_new_ticker: Test the update of data for a newly added
                                 ticker in the Streamlit application.
     """
@@ -55,6 +59,14 @@ class TestStreamlitApp(unittest.TestCase):
                                                    "Positive Sentiment Score": [0.2],
                                                    "Negative Sentiment Score": [0.2],
                                                    "Neutral Sentiment Score": [0.2]})
+
+    def setUp(self):
+        """
+        Serve copies of the stored tables from a temporary database, where the
+        caches of the app are written.
+        """
+        super().setUp()
+        self.copy_tickers()
     def test_smoke_app(self,mock_get_sentiment):
         """
         Test the basic functionality of the Streamlit application.
@@ -106,7 +118,8 @@ class TestStreamlitApp(unittest.TestCase):
 
         app_test= AppTest.from_file("../app.py").run()
         assert app_test.tabs[1].selectbox[0].label == 'Select Technical Indicator'
-        assert app_test.tabs[1].selectbox[0].options == ["MA", "RSI", "ROC", "BBP"]
+        assert app_test.tabs[1].selectbox[0].options == ["MA", "RSI", "ROC", "BBP",
+                                                       "EMA", "MACD", "ATR", "STOCH", "VWAP"]
 
         app_test.tabs[1].selectbox[0].select_index(0).run()
         assert not app_test.exception
@@ -181,6 +194,19 @@ class TestStreamlitApp(unittest.TestCase):
         app_test.tabs[3].text_input[1].set_value('5d').run()
         assert not app_test.exception
 
+    def test_bulk_import_tickers_input(self,mock_get_sentiment):
+        """
+        Test the bulk ticker import inputs in the Streamlit application.
+        This test verifies the ticker list input and its import button exist and
+        that entering a list runs successfully in the application.
+        """
+        mock_get_sentiment.return_value = self.mocked_sentiment_dataframe
+        app_test= AppTest.from_file("../app.py").run()
+        assert app_test.tabs[3].text_area[0].label.startswith('📋 Bulk Import Tickers')
+        assert app_test.tabs[3].button[2].label == "📥 Import Ticker List"
+        app_test.tabs[3].text_area[0].set_value('AAPL, MSFT').run()
+        assert not app_test.exception
+
     def update_data_for_new_ticker(self,mock_get_sentiment):
         """
         Test the update of data for a newly added ticker in the Streamlit application.
@@ -0,0 +1,81 @@
+"""
+test_atomic_file.py
+===========
+
+This module contains unit tests for the atomic_file module.
+
+Classes:
+    TestAtomicFile: Test cases for the atomic_replace function.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.atomic_file import atomic_replace
+
+
+def write_repeatedly(file_path, content, times):
+    """Replace file_path with content times times (run in a worker process)."""
+    for _ in range(times):
+        atomic_replace(file_path, lambda path: _write_text(path, content))
+
+
+def _write_text(path, content):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+
+
+class TestAtomicFile(unittest.TestCase):
+    """
+    Test cases for atomic_replace, in a temporary folder.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.file_path = os.path.join(self.folder, 'table.csv')
+
+    def test_replace(self):
+        """The file is replaced, with the permissions of a new file, and no temporary is left."""
+        _write_text(self.file_path, 'old')
+        atomic_replace(self.file_path, lambda path: _write_text(path, 'new'))
+        with open(self.file_path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), 'new')
+        self.assertEqual(os.listdir(self.folder), ['table.csv'])
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o666 & ~umask)
+
+    def test_failed_write(self):
+        """A failing writer keeps the old file and removes its temporary file only."""
+        _write_text(self.file_path, 'old')
+        other_path = os.path.join(self.folder, '.table.csv.other.tmp')
+        _write_text(other_path, 'another writer')
+
+        def fail(path):
+            _write_text(path, 'partial')
+            raise ValueError('write failed')
+
+        with self.assertRaises(ValueError):
+            atomic_replace(self.file_path, fail)
+        with open(self.file_path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), 'old')
+        self.assertEqual(sorted(os.listdir(self.folder)), ['.table.csv.other.tmp', 'table.csv'])
+
+    def test_concurrent_writers(self):
+        """Processes replacing the same file at once all succeed, leaving one whole file."""
+        contents = [str(worker) * 100_000 for worker in range(8)]
+        with ProcessPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(write_repeatedly, self.file_path, content, 20)
+                           for content in contents]:
+                future.result()
+        with open(self.file_path, encoding='utf-8') as file:
+            self.assertIn(file.read(), contents)
+        self.assertEqual(os.listdir(self.folder), ['table.csv'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+test_backtest.py
+===========
+
+This module contains unit tests for the backtest module.
+
+Classes:
+    TestBacktest: Test cases for the backtest module.
+"""
+
+import unittest
+
+import numpy as np
+
+import backend.technical_indicators as ti
+from backend.backtest import (
+    compute_metrics,
+    run_backtest,
+    sweep_parameters,
+    threshold_positions
+)
+from backend.stock_data_manager import get_stock_data
+
+
+def loop_positions(signal, entry, exit_level, entry_when):
+    """Reference implementation of threshold_positions, one row at a time."""
+    position, positions = 0.0, []
+    for value in signal:
+        if entry_when == 'below':
+            enters, exits = value < entry, value > exit_level
+        else:
+            enters, exits = value > entry, value < exit_level
+        position = 1.0 if enters else 0.0 if exits else position
+        positions.append(position)
+    return np.array(positions)
+
+
+class TestBacktest(unittest.TestCase):
+    """Test cases for the backtest module."""
+
+    def test_threshold_positions(self):
+        """Positions are held from an entry until the next exit."""
+        signal = np.array([50, 25, 40, 75, 60, np.nan, 20, 80])
+        np.testing.assert_array_equal(threshold_positions(signal, 30, 70),
+                                      [0, 1, 1, 0, 0, 0, 1, 0])
+        np.testing.assert_array_equal(threshold_positions(signal, 70, 30, 'above'),
+                                      [0, 0, 0, 1, 1, 1, 0, 1])
+        with self.assertRaises(ValueError):
+            threshold_positions(signal, 30, 70, 'sideways')
+
+    def test_threshold_positions_grid(self):
+        """Every column of a 2D grid matches the row-by-row reference."""
+        rsi = ti.calculate_rsi(get_stock_data('AAPL'), 14)['RSI'].to_numpy()
+        entries = np.array([20, 30, 40, 55])
+        exits = np.array([60, 70, 80, 50])
+        signals = np.repeat(rsi.reshape(-1, 1), len(entries), axis=1)
+        for entry_when in ('below', 'above'):
+            positions = threshold_positions(signals, entries, exits, entry_when)
+            for column, (entry, exit_level) in enumerate(zip(entries, exits)):
+                np.testing.assert_array_equal(positions[:, column],
+                                              loop_positions(rsi, entry, exit_level, entry_when))
+
+    def test_compute_metrics(self):
+        """Metrics of a known price path and position vector."""
+        close = np.array([100, 110, 99, 99, 120])
+        positions = np.array([1, 1, 0, 1, 0])
+        metrics = compute_metrics(close, positions)
+        # held on days 1, 2 and 4: +10%, -10%, +21.2%
+        strategy = np.array([0, 0.1, -0.1, 0, 120 / 99 - 1])
+        self.assertAlmostEqual(metrics['Total Return'], 1.1 * 0.9 * 120 / 99 - 1)
+        self.assertAlmostEqual(metrics['Max Drawdown'], -0.1)
+        self.assertAlmostEqual(metrics['Sharpe'],
+                               strategy.mean() / strategy.std(ddof=1) * np.sqrt(252))
+        self.assertAlmostEqual(metrics['Hit Rate'], 2 / 3)
+        self.assertEqual(metrics['Trades'], 2)
+
+        with_costs = compute_metrics(close, positions, cost=0.01)
+        self.assertLess(with_costs['Total Return'], metrics['Total Return'])
+
+        flat = compute_metrics(close, np.zeros(5))
+        self.assertEqual(flat['Total Return'], 0)
+        self.assertTrue(np.isnan(flat['Sharpe']))
+        self.assertTrue(np.isnan(flat['Hit Rate']))
+
+    def test_run_backtest(self):
+        """A single backtest returns its metrics and daily history."""
+        metrics, history = run_backtest('msft', 'RSI', 14, 30, 70)
+        stock_data = get_stock_data('MSFT')
+        self.assertEqual(list(history.columns), ['Date', 'Close', 'Signal', 'Position', 'Equity'])
+        self.assertEqual(len(history), len(stock_data))
+        np.testing.assert_allclose(history['Signal'], ti.calculate_rsi(stock_data, 14)['RSI'])
+        self.assertAlmostEqual(history['Equity'].iloc[-1] - 1, metrics['Total Return'])
+
+    def test_sweep_matches_single_backtests(self):
+        """Every combination of a sweep matches its own backtest."""
+        result = sweep_parameters(['AAPL', 'MSFT'], 'RSI', [7, 14], [25, 30, 35], [65, 70],
+                                  cost=0.001, max_workers=1)
+        self.assertEqual(len(result), 2 * 2 * 3 * 2)
+        self.assertEqual(list(result.columns),
+                         ['Ticker', 'Length', 'Entry', 'Exit', 'Total Return', 'Max Drawdown',
+                          'Sharpe', 'Hit Rate', 'Trades'])
+        for _, row in result.iloc[::5].iterrows():
+            metrics, _ = run_backtest(row['Ticker'], 'RSI', row['Length'], row['Entry'],
+                                      row['Exit'], cost=0.001)
+            for name, value in metrics.items():
+                self.assertAlmostEqual(row[name], value, places=9, msg=name)
+
+    def test_sweep_overlay_and_registry_indicators(self):
+        """Overlay indicators are traded on the distance of the close from them."""
+        result = sweep_parameters(['MSFT'], 'EMA', [10, 20], [-2], [0], max_workers=1)
+        metrics, history = run_backtest('MSFT', 'EMA', 10, -2, 0)
+        self.assertAlmostEqual(result['Sharpe'].iloc[0], metrics['Sharpe'])
+        self.assertLess(history['Signal'].abs().max(), 100)
+
+    def test_sweep_process_pool(self):
+        """Sweeping in worker processes gives the same table as in this process."""
+        arguments = (['AAPL', 'GOOG', 'NVDA'], 'ROC', [5, 10], [0, 2], [-1, 0], 'above')
+        serial = sweep_parameters(*arguments, max_workers=1)
+        parallel = sweep_parameters(*arguments, max_workers=2)
+        self.assertTrue(serial.equals(parallel))
+
+    def test_sweep_invalid_arguments(self):
+        """Invalid indicators, lengths and directions raise ValueError."""
+        with self.assertRaises(ValueError):
+            sweep_parameters(['MSFT'], 'UNKNOWN', [14], [30], [70])
+        with self.assertRaises(ValueError):
+            sweep_parameters(['MSFT'], 'RSI', [0], [30], [70])
+        with self.assertRaises(ValueError):
+            sweep_parameters(['MSFT'], 'RSI', [14], [30], [70], entry_when='sideways')
+
+
+if __name__ == '__main__':
+    unittest.main()
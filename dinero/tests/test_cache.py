@@ -0,0 +1,90 @@
+"""
+test_cache.py
+===========
+
+This module contains unit tests for the cache module.
+
+Classes:
+    TestLRUCache: Test cases for the LRUCache class.
+"""
+
+import threading
+import unittest
+
+import numpy as np
+
+from backend.cache import LRUCache, estimate_size
+
+class TestLRUCache(unittest.TestCase):
+    """
+    Test cases for the size-bounded LRU cache.
+    """
+
+    def test_get_and_put(self):
+        """
+        Test cached values are returned and hits and misses are counted
+        """
+        cache = LRUCache(max_bytes=1024)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', np.zeros(8))
+        self.assertEqual(len(cache.get('a')), 8)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['bytes'], 64)
+
+    def test_eviction_by_bytes(self):
+        """
+        Test the least recently used entry is evicted once the byte budget is exceeded
+        """
+        cache = LRUCache(max_bytes=200)
+        cache.put('a', np.zeros(10))
+        cache.put('b', np.zeros(10))
+        cache.get('a')
+        cache.put('c', np.zeros(10))
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        cache.put('huge', np.zeros(100))
+        self.assertNotIn('huge', cache)
+
+    def test_invalidate(self):
+        """
+        Test entries matching a predicate are removed
+        """
+        cache = LRUCache(max_bytes=1024)
+        cache.put(('AAPL', 1), np.zeros(2))
+        cache.put(('MSFT', 1), np.zeros(2))
+        self.assertEqual(cache.invalidate(lambda key: key[0] == 'AAPL'), 1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats()['bytes'], estimate_size(np.zeros(2)))
+
+    def test_thread_safety(self):
+        """
+        Test concurrent puts and gets keep the byte accounting consistent
+        """
+        cache = LRUCache(max_bytes=800)
+
+        def worker(offset):
+            for i in range(200):
+                cache.put(offset + i % 20, np.zeros(5))
+                cache.get(offset + (i + 1) % 20)
+
+        threads = [threading.Thread(target=worker, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(cache.stats()['bytes'], len(cache) * 40)
+        self.assertLessEqual(cache.stats()['bytes'], 800)
+
+    def test_invalid_budget(self):
+        """
+        Test a negative budget raises ValueError
+        """
+        with self.assertRaises(ValueError):
+            LRUCache(max_bytes=-1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+test_indicator_cache.py
+===========
+
+This module contains unit tests for the indicator_cache module.
+
+Classes:
+    TestIndicatorCache: Test cases for the indicator_cache module.
+"""
+
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pandas as pd
+
+from backend.cache import LRUCache
+from backend.indicator_cache import (
+    _write_disk,
+    get_cached_technical_indicator,
+    get_indicator_cache_stats,
+    invalidate_indicator_cache
+)
+from backend.kpi_manager import get_technical_indicator
+from backend.stock_data_manager import get_price_store, invalidate_stock_data_cache
+from tests.temp_database import TempDatabaseTestCase
+
+class TestIndicatorCache(TempDatabaseTestCase):
+    """
+    Test cases for the in-memory and on-disk indicator cache.
+    """
+
+    def setUp(self):
+        """
+        Serve a copy of the MSFT table from a temporary database, with an empty cache.
+        """
+        super().setUp()
+        self.copy_tickers('MSFT')
+        self.patch('backend.indicator_cache._indicator_cache', LRUCache(2 ** 24))
+
+    def test_memory_and_disk_hits(self):
+        """
+        Test repeated requests are served from memory, then from disk after a restart
+        """
+        first = get_cached_technical_indicator('msft', 14, 'RSI')
+        pd.testing.assert_frame_equal(first, get_technical_indicator('MSFT', 14, 'RSI'))
+        disk_misses = get_indicator_cache_stats()['disk']['misses']
+
+        self.assertIs(get_cached_technical_indicator('MSFT', 14, 'RSI'), first)
+        self.assertEqual(get_indicator_cache_stats()['memory']['hits'], 1)
+
+        with mock.patch('backend.indicator_cache._indicator_cache', LRUCache(2 ** 24)):
+            with mock.patch('backend.indicator_cache.get_technical_indicator') as mock_compute:
+                reloaded = get_cached_technical_indicator('MSFT', 14, 'RSI')
+                mock_compute.assert_not_called()
+        pd.testing.assert_frame_equal(reloaded, first)
+        self.assertEqual(get_indicator_cache_stats()['disk']['misses'], disk_misses)
+
+    def test_concurrent_disk_writes(self):
+        """
+        Test parallel writes of the same series all succeed and leave no temporary file
+        """
+        series = get_technical_indicator('MSFT', 14, 'RSI')
+        file_path = os.path.join(self.base_path, 'RSI_14.parquet')
+        writes = get_indicator_cache_stats()['disk']['writes']
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: _write_disk(file_path, series, ('v', 1)), range(40)))
+        self.assertEqual(get_indicator_cache_stats()['disk']['writes'], writes + 40)
+        self.assertEqual([name for name in os.listdir(self.base_path) if 'RSI' in name],
+                         ['RSI_14.parquet'])
+
+    def test_new_prices_are_recomputed(self):
+        """
+        Test a series is recomputed once the stored prices change
+        """
+        before = get_cached_technical_indicator('MSFT', 10, 'MA')
+        store = get_price_store()
+        new_day = pd.DataFrame({'Open': [1.0], 'High': [1.0], 'Low': [1.0], 'Close': [1.0],
+                                'Adj Close': [1.0], 'Volume': [1]},
+                               index=pd.DatetimeIndex(['2030-01-02'], name='Date'))
+        store.append('MSFT', new_day)
+        os.utime(store.file_path('MSFT'), ns=(1, 1))
+
+        after = get_cached_technical_indicator('MSFT', 10, 'MA')
+        self.assertEqual(len(after), len(before) + 1)
+        self.assertEqual(after['Date'].iloc[-1], '2030-01-02')
+
+    def test_invalidation(self):
+        """
+        Test invalidating the stock data also drops the cached indicators on disk
+        """
+        get_cached_technical_indicator('MSFT', 20, 'BBP')
+        folder = os.path.join(self.base_path, '.cache', 'indicators', 'MSFT')
+        self.assertTrue(os.listdir(folder))
+        invalidate_stock_data_cache('msft')
+        self.assertFalse(os.path.exists(folder))
+        self.assertEqual(invalidate_indicator_cache(), 0)
+
+    def test_date_range_in_memory_only(self):
+        """
+        Test series of a date range are cached in memory but not written to disk
+        """
+        disk_writes = get_indicator_cache_stats()['disk']['writes']
+        first = get_cached_technical_indicator('MSFT', 14, 'RSI', '2024-01-01', '2024-02-01')
+        self.assertIs(get_cached_technical_indicator('MSFT', 14, 'RSI', '2024-01-01',
+                                                     '2024-02-01'), first)
+        self.assertEqual(get_indicator_cache_stats()['disk']['writes'], disk_writes)
+        self.assertFalse(os.path.exists(os.path.join(self.base_path, '.cache')))
+        self.assertEqual(first['Date'].iloc[0], '2024-01-02')
+
+    def test_invalid_ticker(self):
+        """
+        Test tickers that are not strings or not stored
+        """
+        with self.assertRaises(TypeError):
+            get_cached_technical_indicator(1, 10, 'MA')
+        with self.assertRaises(ValueError):
+            get_cached_technical_indicator('AAPL', 10, 'MA')
+
+if __name__ == '__main__':
+    unittest.main()
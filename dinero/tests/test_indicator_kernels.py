@@ -0,0 +1,92 @@
+"""
+test_indicator_kernels.py
+===========
+
+This module contains the equivalence tests of the NumPy indicator backend
+(indicator_kernels) against the pandas implementation of technical_indicators.
+
+Classes:
+    TestIndicatorKernels: Test cases for the indicator_kernels module.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import backend.indicator_kernels as kernels
+import backend.technical_indicators as ti
+from backend.stock_data_manager import get_existing_tickers, get_stock_data
+
+FUNCTIONS = {'MA': ti.calculate_simple_moving_average, 'RSI': ti.calculate_rsi,
+             'ROC': ti.calculate_roc, 'BBP': ti.calculate_bollinger_bands_percent}
+LENGTHS = (1, 2, 5, 14, 50, 200)
+
+class TestIndicatorKernels(unittest.TestCase):
+    """
+    Test cases comparing the 'numpy' and 'pandas' indicator backends.
+    """
+
+    def assert_backends_match(self, data, lengths=LENGTHS):
+        """
+        Assert every indicator gives the same frame with both backends.
+        """
+        for name, function in FUNCTIONS.items():
+            for length in lengths:
+                expected = function(data, length, backend='pandas')
+                result = function(data, length, backend='numpy')
+                self.assertEqual(list(result.columns), ['Date', name])
+                pd.testing.assert_index_equal(result.index, expected.index)
+                pd.testing.assert_series_equal(result['Date'], expected['Date'])
+                np.testing.assert_allclose(result[name], expected[name], rtol=1e-9, atol=1e-6,
+                                           err_msg=f'{name} {length}')
+
+    def test_stored_tickers(self):
+        """
+        Test both backends on every stored ticker
+        """
+        for ticker_symbol in get_existing_tickers():
+            self.assert_backends_match(get_stock_data(ticker_symbol))
+
+    def test_gaps_flat_prices_and_short_history(self):
+        """
+        Test missing prices, runs of equal prices and histories shorter than the window
+        """
+        close = 100 + np.cumsum(np.random.default_rng(0).normal(size=400))
+        close[50:60] = np.nan
+        close[100:130] = close[99]
+        data = pd.DataFrame({'Date': pd.date_range('2020-01-01', periods=400).astype(str),
+                             'Close': close})
+        self.assert_backends_match(data)
+        self.assert_backends_match(data.iloc[:3])
+        self.assert_backends_match(data.iloc[:0], lengths=(5,))
+
+    def test_panel_windows(self):
+        """
+        Test rolling windows of a 2D panel match the windows of each column
+        """
+        panel = np.column_stack([get_stock_data(ticker)['Close'] for ticker in ('MSFT', 'AAPL')])
+        windows = kernels.RollingWindows(panel)
+        for column in range(2):
+            single = kernels.RollingWindows(panel[:, column])
+            np.testing.assert_array_equal(windows.mean(20)[:, column], single.mean(20))
+            np.testing.assert_allclose(windows.std(20)[:, column], single.std(20), rtol=1e-12)
+
+    def test_backend_switch(self):
+        """
+        Test the default backend can be switched and invalid backends are rejected
+        """
+        data = get_stock_data('MSFT')
+        self.addCleanup(ti.set_indicator_backend, ti.INDICATOR_BACKEND)
+        ti.set_indicator_backend('numpy')
+        expected = ti.calculate_rsi(data, 14, backend='pandas')
+        np.testing.assert_allclose(ti.calculate_rsi(data, 14)['RSI'], expected['RSI'], rtol=1e-9)
+        with self.assertRaises(ValueError):
+            ti.set_indicator_backend('cuda')
+        with self.assertRaises(ValueError):
+            ti.calculate_roc(data, 14, backend='cuda')
+        with self.assertRaises(TypeError):
+            ti.calculate_roc([1.0, 2.0], 1, backend='numpy')
+
+if __name__ == '__main__':
+    unittest.main()
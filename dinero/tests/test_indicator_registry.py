@@ -0,0 +1,170 @@
+"""
+test_indicator_registry.py
+===========
+
+This module contains unit tests for the indicator_registry module.
+
+Classes:
+    TestIndicatorRegistry: Test cases for the indicator_registry module.
+"""
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import backend.technical_indicators as ti
+from backend.indicator_registry import (
+    Indicator,
+    Intermediates,
+    compute_indicators,
+    get_indicator,
+    list_indicators,
+    plan_indicators,
+    register_indicator
+)
+from backend.kpi_manager import get_indicator_view, get_technical_indicator
+from backend.stock_data_manager import get_stock_data
+
+
+class TestIndicatorRegistry(unittest.TestCase):
+    """Test cases for the indicator_registry module."""
+
+    def setUp(self):
+        self.stock_data = get_stock_data('MSFT')
+
+    def test_list_indicators(self):
+        """The legacy indicators come first, followed by the new ones."""
+        self.assertEqual(list_indicators(),
+                         ['MA', 'RSI', 'ROC', 'BBP', 'EMA', 'MACD', 'ATR', 'STOCH', 'VWAP'])
+
+    def test_unknown_indicator(self):
+        """Unregistered names raise ValueError."""
+        with self.assertRaises(ValueError):
+            get_indicator('UNKNOWN')
+        with self.assertRaises(ValueError):
+            plan_indicators([('MA', 10), ('UNKNOWN', 10)])
+
+    def test_plan_shares_intermediates(self):
+        """EMAs, true range and legacy indicators are planned once across indicators."""
+        plan = plan_indicators([('EMA', 12), ('EMA', 26), ('MACD', 12)])
+        self.assertEqual(plan.count(('ema', ('column', 'Close'), 12)), 1)
+        self.assertEqual(plan.count(('ema', ('column', 'Close'), 26)), 1)
+
+        plan = plan_indicators([('MA', 20), ('BBP', 20), ('MA', 20)])
+        self.assertEqual(plan, [('technical_indicator', 'calculate_simple_moving_average', 20),
+                                ('technical_indicator', 'calculate_bollinger_bands_percent', 20)])
+
+        plan = plan_indicators([('ATR', 14), ('ATR', 20)])
+        self.assertEqual(plan.count(('true_range',)), 1)
+
+    def test_legacy_indicators_use_backend(self):
+        """MA, RSI, ROC and BBP are computed by technical_indicators, with its backend."""
+        with patch('backend.technical_indicators.INDICATOR_BACKEND', 'numpy'), \
+                patch('backend.indicator_kernels.roc', wraps=ti.kernels.roc) as roc:
+            result = compute_indicators(self.stock_data, [('ROC', 10)])
+        roc.assert_called_once()
+        np.testing.assert_allclose(result['ROC_10'], ti.calculate_roc(self.stock_data, 10)['ROC'])
+
+    def test_intermediates_computed_once(self):
+        """An intermediate requested twice is computed once."""
+        values = Intermediates(self.stock_data)
+        first = values.get(('rolling_max', ('column', 'Close'), 10))
+        second = values.get(('rolling_max', ('column', 'Close'), 10))
+        self.assertIs(first, second)
+        self.assertEqual(values.computed, [('column', 'Close'),
+                                           ('rolling_max', ('column', 'Close'), 10)])
+
+    def test_legacy_indicators_match(self):
+        """Computed MA, RSI, ROC and BBP match the technical_indicators functions."""
+        functions = {'MA': ti.calculate_simple_moving_average, 'RSI': ti.calculate_rsi,
+                     'ROC': ti.calculate_roc, 'BBP': ti.calculate_bollinger_bands_percent}
+        result = compute_indicators(self.stock_data, [(name, 14) for name in functions])
+        for name, function in functions.items():
+            expected = function(self.stock_data, 14)[name]
+            np.testing.assert_allclose(result[f'{name}_14'], expected, rtol=1e-12)
+
+    def test_new_indicators(self):
+        """EMA, MACD, ATR, STOCH and VWAP follow their textbook formulas."""
+        data = self.stock_data
+        close = data['Close']
+        result = compute_indicators(data, [('EMA', 10), ('MACD', 12), ('ATR', 14),
+                                           ('STOCH', 14), ('VWAP', 20)])
+
+        ema = close.ewm(span=10, adjust=False).mean()
+        np.testing.assert_allclose(result['EMA_10'][9:], ema[9:])
+        self.assertTrue(result['EMA_10'][:9].isna().all())
+
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        np.testing.assert_allclose(result['MACD_12'][25:], macd[25:])
+        signal = macd[25:].ewm(span=9, adjust=False).mean()
+        np.testing.assert_allclose(result['MACD_SIGNAL_12'][33:], signal[8:])
+        np.testing.assert_allclose(result['MACD_HIST_12'][33:],
+                                   result['MACD_12'][33:] - result['MACD_SIGNAL_12'][33:])
+
+        # the first true range has no previous close and is the high-low range
+        true_range = np.fmax(data['High'] - data['Low'],
+                             np.fmax((data['High'] - close.shift(1)).abs(),
+                                     (data['Low'] - close.shift(1)).abs()))
+        atr = true_range.ewm(alpha=1 / 14, adjust=False).mean()
+        np.testing.assert_allclose(result['ATR_14'][13:], atr[13:])
+
+        lowest = data['Low'].rolling(14).min()
+        percent_k = 100 * (close - lowest) / (data['High'].rolling(14).max() - lowest)
+        np.testing.assert_allclose(result['STOCH_K_14'], percent_k)
+        np.testing.assert_allclose(result['STOCH_D_14'], percent_k.rolling(3).mean())
+
+        typical_price = (data['High'] + data['Low'] + close) / 3
+        vwap = ((typical_price * data['Volume']).rolling(20).sum()
+                / data['Volume'].rolling(20).sum())
+        np.testing.assert_allclose(result['VWAP_20'], vwap)
+
+    def test_warmup(self):
+        """Values computed from warmup rows before a date match the full history."""
+        for name, length in [('MA', 20), ('RSI', 14), ('ROC', 10), ('BBP', 20), ('EMA', 20),
+                             ('MACD', 12), ('ATR', 14), ('STOCH', 14), ('VWAP', 20)]:
+            column = f'{get_indicator(name).outputs[-1]}_{length}'
+            full = compute_indicators(self.stock_data, [(name, length)])[column]
+            start = 300
+            warmup = get_indicator(name).warmup(length)
+            tail = compute_indicators(self.stock_data.iloc[start - warmup:].reset_index(),
+                                      [(name, length)])[column]
+            np.testing.assert_allclose(tail.iloc[warmup:], full.iloc[start:], rtol=1e-5,
+                                       err_msg=name)
+
+    def test_register_indicator(self):
+        """A registered indicator is computed by name and can reuse intermediates."""
+        spread = Indicator('SPREAD', 'High Low Spread',
+                           lambda length: [('rolling_max', ('column', 'High'), length)],
+                           lambda values, length: {
+                               'SPREAD': values.get(('rolling_max', ('column', 'High'), length))
+                                         - values.get(('column', 'Low'))},
+                           inputs=('High', 'Low'))
+        with patch.dict('backend.indicator_registry._REGISTRY'):
+            register_indicator(spread)
+            result = get_technical_indicator('MSFT', 5, 'SPREAD')
+            self.assertIn('SPREAD', list_indicators())
+        self.assertNotIn('SPREAD', list_indicators())
+        self.assertEqual(list(result.columns), ['Date', 'SPREAD'])
+        self.assertEqual(len(result), len(self.stock_data) - 4)
+
+    def test_indicator_view(self):
+        """get_indicator_view returns every output column for the requested lengths."""
+        view = get_indicator_view('msft', [('MACD', 12), ('EMA', 26), ('RSI', 14)])
+        self.assertEqual(list(view.columns),
+                         ['Date', 'MACD_12', 'MACD_SIGNAL_12', 'MACD_HIST_12', 'EMA_26',
+                          'RSI_14'])
+        self.assertEqual(len(view), len(self.stock_data))
+        self.assertIsInstance(view, pd.DataFrame)
+
+    def test_get_technical_indicator_new(self):
+        """get_technical_indicator serves the new indicators without warm-up rows."""
+        result = get_technical_indicator('MSFT', 12, 'MACD')
+        self.assertEqual(list(result.columns),
+                         ['Date', 'MACD', 'MACD_SIGNAL', 'MACD_HIST'])
+        self.assertFalse(result.isna().any().any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+test_keyword_extraction.py
+===========
+
+This module contains unit tests for the keyword_extraction and keyword_cache modules.
+
+Classes:
+    TestKeywordExtraction: Test cases for the keyword_extraction module.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+import spacy
+
+from backend.keyword_cache import clear_keyword_cache, get_keyword_cache_stats
+from backend.keyword_extraction import (
+    KEYWORD_COLUMNS,
+    KEYWORD_KIND,
+    aggregate_keywords,
+    extract_keywords,
+    get_keyword_version,
+    get_nlp
+)
+from tests.temp_database import TempDatabaseTestCase
+
+
+class TestKeywordExtraction(TempDatabaseTestCase):
+    """
+    Test cases for the keyword extraction, with a small rule-based spaCy
+    pipeline saved to a temporary folder and a temporary cache.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model_path = tempfile.mkdtemp()
+        nlp = spacy.blank('en')
+        nlp.add_pipe('entity_ruler').add_patterns([
+            {'label': 'ORG', 'pattern': 'Apple'},
+            {'label': 'PERSON', 'pattern': [{'LOWER': 'tim'}, {'LOWER': 'cook'}]}])
+        nlp.add_pipe('sentencizer', name='senter')
+        nlp.to_disk(cls.model_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.model_path)
+
+    def setUp(self):
+        super().setUp()
+        self.patch('backend.keyword_extraction.KEYWORD_MODEL', self.model_path)
+        self.patch('backend.keyword_cache._cache._stats', {'hits': 0, 'misses': 0, 'writes': 0})
+
+    def test_extract_keywords(self):
+        """Terms are the words without stop words and the entities, most frequent first."""
+        terms = extract_keywords(['Apple shares rallied; Tim Cook said shares would rally.', ''])
+        self.assertEqual(terms[0][0], (KEYWORD_KIND, 'shares', 2))
+        self.assertIn(('ORG', 'Apple', 1), terms[0])
+        self.assertIn(('PERSON', 'Tim Cook', 1), terms[0])
+        self.assertNotIn((KEYWORD_KIND, 'would', 1), terms[0])
+        self.assertEqual(terms[1], [])
+        with self.assertRaises(ValueError):
+            extract_keywords(['text'], batch_size=0)
+
+    def test_disabled_components(self):
+        """The pipeline is loaded once without unused components, and its version names it."""
+        self.assertIs(get_nlp(), get_nlp())
+        self.assertEqual(get_nlp().pipe_names, ['entity_ruler'])
+        self.assertIn('senter', get_nlp().disabled)
+        self.assertIn('entity_ruler', get_keyword_version())
+
+    def test_cache_and_workers(self):
+        """Distinct texts are processed once, across worker processes, then served cached."""
+        texts = [f'Apple reports quarter {position % 5}' for position in range(20)]
+        expected = extract_keywords(texts, max_workers=1)
+        self.assertEqual(extract_keywords(texts, chunk_size=2, max_workers=2, cached=True),
+                         expected)
+        self.assertEqual(extract_keywords(texts, cached=True), expected)
+        stats = get_keyword_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['writes'], stats['entries']),
+                         (5, 5, 5, 5))
+        self.assertEqual(clear_keyword_cache(get_keyword_version()), 5)
+
+    def test_aggregate_keywords(self):
+        """Terms are counted per date, by articles then mentions, top_n per date."""
+        dates = {'2024-01-02': [{'content': 'Apple earnings beat. Apple rallies.'},
+                                {'content': 'Earnings season for Apple.'}],
+                 '2024-01-03': None,
+                 '2024-01-04': [{'content': 'Tim Cook sells stock.'}]}
+        ranked = aggregate_keywords(dates, 'AAPL', top_n=2, max_workers=1)
+        self.assertEqual(ranked.columns.tolist(), KEYWORD_COLUMNS)
+        self.assertEqual(ranked.values.tolist()[:2],
+                         [['AAPL', '2024-01-02', 'ORG', 'Apple', 2, 3],
+                          ['AAPL', '2024-01-02', KEYWORD_KIND, 'apple', 2, 3]])
+        self.assertEqual(ranked['Date'].value_counts().to_dict(),
+                         {'2024-01-02': 2, '2024-01-04': 2})
+        self.assertTrue(aggregate_keywords({'2024-01-03': []}, 'AAPL').empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
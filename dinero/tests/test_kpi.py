@@ -5,9 +5,13 @@ focusing on reading stock data and calculating various technical indicators.
 """
 import unittest
 from unittest.mock import patch
+import numpy as np
 import pandas as pd
+import backend.technical_indicators as ti
 from backend.technical_indicators import _formatted_dataframe
-from backend.kpi_manager import get_technical_indicator
+from backend.kpi_manager import get_technical_indicator, get_technical_indicators
+from backend.panel import get_panel
+from backend.stock_data_manager import get_stock_data
 
 class TestKPIManager(unittest.TestCase):
     """Tests for KPI manager and Technical indicators"""
@@ -64,6 +68,23 @@ class TestKPIManager(unittest.TestCase):
         self.assertIsInstance(result, pd.Series)
         self.assertEqual(list(result), [0.1, 0.5, 0.9])
 
+    def test_get_technical_indicator_date_range(self):
+        """A date range computes only the range and its warm-up, with full-history values."""
+        for indicator, length in [('MA', 50), ('RSI', 14), ('ROC', 10), ('BBP', 20),
+                                  ('EMA', 20), ('MACD', 12)]:
+            full = get_technical_indicator('MSFT', length, indicator)
+            expected = full[(full['Date'] >= '2023-06-01') & (full['Date'] <= '2023-06-30')]
+            with patch('backend.kpi_manager.get_stock_data') as mock_read_stock:
+                result = get_technical_indicator('MSFT', length, indicator,
+                                                 '2023-06-01', '2023-06-30')
+            mock_read_stock.assert_not_called()
+            self.assertEqual(list(result['Date']), list(expected['Date']))
+            np.testing.assert_allclose(result.iloc[:, 1:], expected.iloc[:, 1:], rtol=1e-6)
+
+        # the warm-up is cut at the first stored row
+        result = get_technical_indicator('MSFT', 20, 'MA', '1900-01-01', '')
+        self.assertEqual(len(result), len(get_stock_data('MSFT')) - 19)
+
     def test_get_technical_indicator_unsupported(self):
         """Ensure that an unsupported indicator type raises a ValueError."""
         with self.assertRaises(ValueError):
@@ -97,6 +118,60 @@ class TestKPIManager(unittest.TestCase):
             _formatted_dataframe(mock_data, mock_indicator, 123)
         self.assertTrue("name must be a string" in str(context.exception))
 
+    def test_compact_mode_precision(self):
+        """Test indicators on compact (float32) data stay within the documented bounds."""
+        full = get_stock_data('MSFT')
+        compact = get_stock_data('MSFT', compact=True)
+        self.assertEqual(compact['Close'].dtype, np.float32)
+        epsilon = 2.0 ** -24
+
+        for length in (5, 14, 50):
+            moving_avg = ti.calculate_simple_moving_average(full, length)['MA']
+            compact_avg = ti.calculate_simple_moving_average(compact, length)['MA']
+            np.testing.assert_allclose(compact_avg, moving_avg, rtol=epsilon)
+
+            rsi = ti.calculate_rsi(full, length)['RSI']
+            np.testing.assert_allclose(ti.calculate_rsi(compact, length)['RSI'], rsi, atol=1e-9)
+
+            roc = ti.calculate_roc(full, length)['ROC']
+            roc_error = (ti.calculate_roc(compact, length)['ROC'] - roc).abs()
+            self.assertTrue((roc_error <= 2e-7 * (100 + roc.abs())).iloc[length:].all())
+
+            bbp = ti.calculate_bollinger_bands_percent(full, length)['BBP']
+            np.testing.assert_allclose(ti.calculate_bollinger_bands_percent(compact, length)['BBP'],
+                                       bbp, atol=1e-9)
+
+    def test_get_technical_indicators_matches_single_indicators(self):
+        """Test the batch engine against the single indicator functions for several lengths."""
+        stock_data = get_stock_data('MSFT')
+        functions = {'MA': ti.calculate_simple_moving_average, 'RSI': ti.calculate_rsi,
+                     'ROC': ti.calculate_roc, 'BBP': ti.calculate_bollinger_bands_percent}
+        result = get_technical_indicators('MSFT', functions, [2, 14, 50])
+
+        self.assertEqual(list(result.columns[:4]), ['Date', 'MA_2', 'MA_14', 'MA_50'])
+        self.assertEqual(len(result), len(stock_data))
+        for indicator, function in functions.items():
+            for length in (2, 14, 50):
+                expected = function(stock_data, length)[indicator]
+                np.testing.assert_allclose(result[f'{indicator}_{length}'], expected,
+                                           rtol=1e-9, atol=1e-6)
+
+    def test_get_technical_indicators_panel(self):
+        """Test the batch engine on a panel gives one column per indicator, length and ticker."""
+        panel = get_panel(['MSFT', 'AAPL'])
+        result = get_technical_indicators(panel, ['MA', 'RSI'], 10)
+        self.assertEqual(list(result.columns), [('MA_10', 'MSFT'), ('MA_10', 'AAPL'),
+                                                ('RSI_10', 'MSFT'), ('RSI_10', 'AAPL')])
+        expected = ti.calculate_rsi(get_stock_data('AAPL'), 10)['RSI']
+        np.testing.assert_allclose(result[('RSI_10', 'AAPL')], expected, rtol=1e-9)
+
+    def test_get_technical_indicators_invalid(self):
+        """Test the batch engine rejects unsupported indicators and lengths."""
+        with self.assertRaises(ValueError):
+            get_technical_indicators('MSFT', ['MACD'], 10)
+        with self.assertRaises(ValueError):
+            get_technical_indicators('MSFT', ['MA'], 0)
+
 
 # This allows the test suite to be run from the command line
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+"""
+test_lexicon_scorer.py
+===========
+
+This module contains unit tests for the lexicon_scorer module.
+
+Classes:
+    TestLexiconScorer: Test cases for the LexiconScorer class.
+"""
+
+import unittest
+
+from backend.lexicon_scorer import SCORE_COLUMNS, LexiconScorer
+from backend.sentiment_analysis import get_analyzer
+
+
+class TestLexiconScorer(unittest.TestCase):
+    """
+    Test cases for the vectorized scores, against the VADER analyzer they stand in for.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = get_analyzer()
+        cls.scorer = LexiconScorer(cls.analyzer.lexicon)
+
+    def test_matches_vader(self):
+        """Texts without negations, boosters or capitals score as with VADER."""
+        texts = ['Shares rallied after the company beat earnings expectations.',
+                 'The stock plunged on weak guidance and a surprise loss.',
+                 'Analysts see the merger as neutral for the sector.',
+                 'What a great, great quarter!!',
+                 'Is this a crash??? a terrible, awful drop?!']
+        for text, score in zip(texts, self.scorer.score(texts)):
+            with self.subTest(text=text):
+                self.assertEqual(score, self.analyzer.polarity_scores(text))
+
+    def test_empty_texts(self):
+        """Texts without words are neutral, like with VADER."""
+        for score in self.scorer.score(['', '  ', '!']):
+            self.assertEqual(score, {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0})
+
+    def test_score_matrix(self):
+        """Unrounded scores come as one row per text, in SCORE_COLUMNS order."""
+        scores = self.scorer.score_matrix(['good', 'bad', 'the'])
+        self.assertEqual(scores.shape, (3, len(SCORE_COLUMNS)))
+        self.assertGreater(scores[0, 3], 0)
+        self.assertLess(scores[1, 3], 0)
+        self.assertEqual(scores[2].tolist(), [0.0, 1.0, 0.0, 0.0])
+
+    def test_no_negation_rule(self):
+        """Negations are not applied: the raw valence of the word is kept."""
+        self.assertGreater(self.scorer.score(['Not good'])[0]['compound'], 0)
+        self.assertLess(self.analyzer.polarity_scores('Not good')['compound'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
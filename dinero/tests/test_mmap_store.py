@@ -0,0 +1,162 @@
+"""
+test_mmap_store.py
+===========
+
+This module contains unit tests for the mmap_store module.
+
+Classes:
+    TestMmapStore: Test cases for the mmap_store module.
+"""
+
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import backend.stock_data_manager as sdm
+from backend.mmap_store import (
+    HEADER_FILE,
+    load_mmap_arrays,
+    load_price_frame,
+    write_mmap_arrays
+)
+from backend.stock_data_manager import get_price_store, get_stock_data
+from backend.technical_indicators import calculate_rsi
+from backend.transform import (
+    find_count_value_change,
+    find_stored_value_change,
+    find_value_change_dates
+)
+from tests.temp_database import TempDatabaseTestCase
+
+
+def rebuild_mirror(base_path, ticker_symbol, times):
+    """Rewrite the mirror of a ticker times times (run in a worker process)."""
+    sdm.DEFAULT_DATABASE_PATH = base_path
+    for _ in range(times):
+        write_mmap_arrays(ticker_symbol)
+
+class TestMmapStore(TempDatabaseTestCase):
+    """
+    Test cases for the memory-mapped mirror of the price tables.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary database holding a copy of the MSFT table.
+        """
+        super().setUp()
+        self.copy_tickers('MSFT')
+
+    def test_write_and_load(self):
+        """
+        Test the mapped arrays hold the stored prices and typed dates
+        """
+        header = write_mmap_arrays('msft')
+        stock_data = get_stock_data('MSFT')
+        self.assertEqual(header['rows'], len(stock_data))
+
+        prices = load_mmap_arrays('MSFT')
+        self.assertIsInstance(prices['Close'], np.memmap)
+        self.assertEqual(prices.dates.dtype, 'datetime64[ns]')
+        self.assertEqual(prices.columns, ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume'])
+        np.testing.assert_array_equal(prices['Close'], stock_data['Close'].to_numpy())
+        np.testing.assert_array_equal(prices['Volume'], stock_data['Volume'].to_numpy())
+
+    def test_concurrent_rebuilds(self):
+        """
+        Test processes rebuilding the same mirror at once all succeed and leave
+        a complete mirror without temporary files
+        """
+        with ProcessPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(rebuild_mirror, self.base_path, 'MSFT', 10)
+                           for _ in range(8)]:
+                future.result()
+        folder = os.path.join(self.base_path, 'mmap', 'MSFT')
+        self.assertEqual(sorted(os.listdir(folder)),
+                         sorted([HEADER_FILE, 'Date.npy', 'Open.npy', 'High.npy', 'Low.npy',
+                                 'Close.npy', 'Adj_Close.npy', 'Volume.npy']))
+        np.testing.assert_array_equal(load_mmap_arrays('MSFT')['Close'],
+                                      get_stock_data('MSFT')['Close'].to_numpy())
+
+    def test_zero_copy_frame(self):
+        """
+        Test the DataFrame view shares memory with the mapped arrays and
+        technical indicators run on it unchanged
+        """
+        prices = load_mmap_arrays('MSFT', ['Close'])
+        self.assertTrue(np.shares_memory(prices.to_frame()['Close'].to_numpy(),
+                                         prices['Close']))
+
+        frame = load_price_frame('MSFT', ['Close'])
+        # views of the read-only mapping, not private copies
+        self.assertFalse(frame['Close'].to_numpy().flags.writeable)
+
+        expected = calculate_rsi(get_stock_data('MSFT'), 14)
+        result = calculate_rsi(frame, 14)
+        np.testing.assert_allclose(result['RSI'], expected['RSI'])
+
+    def test_rebuilt_after_table_change(self):
+        """
+        Test the mirror is rewritten when the stored table changes
+        """
+        rows = load_mmap_arrays('MSFT').rows
+        new_row = pd.DataFrame({'Open': [1.0], 'High': [1.0], 'Low': [1.0], 'Close': [1.0],
+                                'Adj Close': [1.0], 'Volume': [1]},
+                               index=pd.DatetimeIndex(['2030-01-02'], name='Date'))
+        get_price_store().append('MSFT', new_row)
+        prices = load_mmap_arrays('MSFT')
+        self.assertEqual(prices.rows, rows + 1)
+        self.assertEqual(prices.dates[-1], np.datetime64('2030-01-02'))
+
+    def test_find_value_change_dates_on_arrays(self):
+        """
+        Test value change dates computed from mapped arrays match the CSV path
+        """
+        prices = load_mmap_arrays('MSFT', ['Open', 'Close'])
+        file_path = os.path.join(self.base_path, 'MSFT.csv')
+        for value_change in (3, -3):
+            self.assertEqual(find_value_change_dates(prices.dates, prices['Open'],
+                                                     prices['Close'], value_change),
+                             find_count_value_change(file_path, value_change))
+
+    def test_short_arrays_retried_once(self):
+        """
+        Test arrays that keep not matching their header are rewritten once, then reported
+        """
+        write_mmap_arrays('MSFT')
+        with mock.patch('backend.mmap_store.np.load', return_value=np.zeros(1)), \
+                mock.patch('backend.mmap_store.write_mmap_arrays',
+                           wraps=write_mmap_arrays) as rewrite:
+            with self.assertRaises(OSError):
+                load_mmap_arrays('MSFT', ['Close'])
+        self.assertEqual(rewrite.call_count, 1)
+
+    def test_stored_value_change_reads_mapped_arrays(self):
+        """
+        Test value change dates of a stored ticker come from the mapped arrays
+        """
+        file_path = os.path.join(self.base_path, 'MSFT.csv')
+        expected = find_count_value_change(file_path, 3)
+        with mock.patch('backend.transform.find_count_value_change') as read_file:
+            self.assertEqual(find_stored_value_change('msft', 3, file_path), expected)
+            self.assertEqual(find_stored_value_change('MSFT', 3), expected)
+        read_file.assert_not_called()
+        self.assertIsNone(find_stored_value_change('AAPL', 3))
+
+    def test_invalid_input(self):
+        """
+        Test invalid tickers and columns
+        """
+        with self.assertRaises(TypeError):
+            load_mmap_arrays(1)
+        with self.assertRaises(ValueError):
+            load_mmap_arrays('NON_EXISTENT_SYMBOL')
+        with self.assertRaises(ValueError):
+            load_mmap_arrays('MSFT', ['Dividends'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+test_news_cache.py
+===========
+
+This module contains unit tests for the news_cache module.
+
+Classes:
+    TestNewsCache: Test cases for the news_cache module.
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from backend.news_cache import (
+    NEWS_CACHE_TTL,
+    NEWS_EMPTY_TTL,
+    NEWS_ERROR_TTL,
+    clear_news_cache,
+    fetch_cached_news,
+    get_cached_news_articles,
+    get_news_cache_stats
+)
+from tests.temp_database import TempDatabaseTestCase
+
+ARTICLE = {'date': '2024-03-01T10:00:00+00:00', 'title': 'Title', 'content': 'Content',
+           'link': 'Link', 'symbols': ['AAPL.US']}
+
+
+def fake_fetch(ticker, dates, max_workers=None, session=None):  # pylint: disable=unused-argument
+    """Stand-in of req.fetch_news_by_date: articles, except empty or failed on marked dates."""
+    responses = {'2024-03-02': [], '2024-03-03': None}
+    return {date: responses.get(date, [dict(ARTICLE, date=f'{date}T10:00:00+00:00')])
+            for date in dates}
+
+
+class TestNewsCache(TempDatabaseTestCase):
+    """
+    Test cases for the SQLite news cache, in a temporary database.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.fetch = self.patch('backend.news_cache.fetch_news_by_date',
+                                mock.Mock(side_effect=fake_fetch))
+        self.now = time.time()
+        self.patch('backend.news_cache._cache._stats',
+                   dict.fromkeys(['hits', 'negative_hits', 'misses', 'expired', 'writes'], 0))
+
+    def later(self, seconds):
+        """Patch the clock of the cache to seconds after the start of the test."""
+        self.patch('backend.news_cache.time.time', return_value=self.now + seconds)
+
+    def requested_dates(self):
+        """Return the dates requested from the API, in order."""
+        return [date for call in self.fetch.call_args_list for date in call.args[1]]
+
+    def test_hits_after_first_request(self):
+        """Only the dates missing from the cache are requested."""
+        first = fetch_cached_news('aapl', ['2024-03-01', '2024-03-04'])
+        self.assertEqual(first['2024-03-01'][0]['title'], 'Title')
+        second = fetch_cached_news('AAPL', ['2024-03-04', '2024-03-05', '2024-03-01'])
+        self.assertEqual(list(second), ['2024-03-04', '2024-03-05', '2024-03-01'])
+        self.assertEqual(second['2024-03-01'], first['2024-03-01'])
+        self.assertEqual(self.requested_dates(), ['2024-03-01', '2024-03-04', '2024-03-05'])
+        self.assertEqual(get_cached_news_articles('AAPL', '2024-03-05'), second['2024-03-05'])
+
+        stats = get_news_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['writes'], stats['entries']),
+                         (3, 3, 3, 3))
+
+    def test_historical_dates_never_expire(self):
+        """News fetched after its date settled is served forever."""
+        fetch_cached_news('AAPL', ['2024-03-01'])
+        self.later(10 * 365 * 24 * 60 * 60)
+        fetch_cached_news('AAPL', ['2024-03-01'])
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_recent_dates_expire(self):
+        """News of a recent date is requested again after NEWS_CACHE_TTL."""
+        today = time.strftime('%Y-%m-%d', time.gmtime(self.now))
+        fetch_cached_news('AAPL', [today])
+        fetch_cached_news('AAPL', [today])
+        self.assertEqual(self.fetch.call_count, 1)
+        self.later(NEWS_CACHE_TTL + 1)
+        fetch_cached_news('AAPL', [today])
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(get_news_cache_stats()['expired'], 1)
+
+    def test_negative_caching(self):
+        """Empty and failed responses are served from the cache until their TTL."""
+        dates = ['2024-03-02', '2024-03-03']
+        self.assertEqual(fetch_cached_news('AAPL', dates), {'2024-03-02': [], '2024-03-03': None})
+        self.assertEqual(fetch_cached_news('AAPL', dates), {'2024-03-02': [], '2024-03-03': None})
+        self.assertEqual(self.fetch.call_count, 1)
+        self.assertEqual(get_news_cache_stats()['negative_hits'], 2)
+
+        self.later(NEWS_ERROR_TTL + 1)
+        fetch_cached_news('AAPL', dates)
+        self.assertEqual(self.requested_dates()[2:], ['2024-03-03'])
+
+        self.later(max(NEWS_EMPTY_TTL, NEWS_ERROR_TTL) + 1)
+        fetch_cached_news('AAPL', dates)
+        self.assertEqual(self.requested_dates()[3:], dates)
+
+    def test_range_mode(self):
+        """Range mode requests the missing dates with fetch_news_by_range."""
+        with mock.patch('backend.news_cache.fetch_news_by_range',
+                        mock.Mock(side_effect=fake_fetch)) as fetch_range:
+            fetch_cached_news('AAPL', ['2024-03-01', '2024-03-04'], mode='range')
+            fetch_cached_news('AAPL', ['2024-03-01', '2024-03-04'], mode='range')
+        fetch_range.assert_called_once()
+        self.fetch.assert_not_called()
+        with self.assertRaises(ValueError):
+            fetch_cached_news('AAPL', ['2024-03-01'], mode='weekly')
+
+    def test_range_mode_requests_single_pages(self):
+        """Range mode requests again the articles cached by date mode, not the reverse."""
+        dates = ['2024-03-01', '2024-03-02']
+        fetch_cached_news('AAPL', dates)
+        with mock.patch('backend.news_cache.fetch_news_by_range',
+                        mock.Mock(side_effect=fake_fetch)) as fetch_range:
+            fetch_cached_news('AAPL', dates, mode='range')
+            fetch_cached_news('AAPL', dates, mode='range')
+        self.assertEqual(fetch_range.call_args_list[0].args[1], ['2024-03-01'])
+        fetch_range.assert_called_once()
+        fetch_cached_news('AAPL', dates + ['2024-03-04'])
+        self.assertEqual(self.requested_dates(), dates + ['2024-03-04'])
+
+    def test_clear(self):
+        """Cleared entries are requested again."""
+        fetch_cached_news('AAPL', ['2024-03-01'])
+        fetch_cached_news('MSFT', ['2024-03-01'])
+        self.assertEqual(clear_news_cache('aapl'), 1)
+        fetch_cached_news('AAPL', ['2024-03-01'])
+        fetch_cached_news('MSFT', ['2024-03-01'])
+        self.assertEqual(self.fetch.call_count, 3)
+        self.assertEqual(clear_news_cache(), 2)
+        self.assertEqual(get_news_cache_stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+test_panel.py
+===========
+
+This module contains unit tests for the panel module.
+
+Classes:
+    TestPanel: Test cases for the panel module.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.panel import get_panel
+from backend.stock_data_manager import get_price_store, get_filtered_stock_data
+from tests.temp_database import TempDatabaseTestCase
+
+class TestPanel(TempDatabaseTestCase):
+    """
+    Test cases for get_panel with tickers trading on different dates.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary database with two tickers sharing only two dates.
+        """
+        super().setUp()
+        store = get_price_store()
+        store.write('AAA', pd.DataFrame(
+            {'Close': [1.0, 2.0, 3.0], 'Volume': [10, 20, 30]},
+            index=pd.DatetimeIndex(['2024-01-02', '2024-01-03', '2024-01-04'], name='Date')))
+        store.write('BBB', pd.DataFrame(
+            {'Close': [5.0, 6.0, 7.0], 'Volume': [50, 60, 70]},
+            index=pd.DatetimeIndex(['2024-01-03', '2024-01-04', '2024-01-05'], name='Date')))
+
+    def test_outer_panel(self):
+        """
+        Test the union of dates with NaN where a ticker has no data
+        """
+        panel = get_panel(['aaa', 'BBB'])
+        self.assertEqual(list(panel.index.strftime('%Y-%m-%d')),
+                         ['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05'])
+        self.assertEqual(list(panel.columns), [('Close', 'AAA'), ('Close', 'BBB')])
+        np.testing.assert_array_equal(panel['Close']['AAA'], [1.0, 2.0, 3.0, np.nan])
+        np.testing.assert_array_equal(panel['Close']['BBB'], [np.nan, 5.0, 6.0, 7.0])
+
+    def test_inner_panel_as_array(self):
+        """
+        Test the intersection of dates returned as a date vector and a 2D block
+        """
+        dates, block = get_panel(['AAA', 'BBB'], columns=['Close', 'Volume'],
+                                 how='inner', as_array=True)
+        np.testing.assert_array_equal(dates, np.array(['2024-01-03', '2024-01-04'],
+                                                      dtype='datetime64[ns]'))
+        self.assertEqual(block.shape, (2, 4))
+        np.testing.assert_array_equal(block, [[2.0, 5.0, 20.0, 50.0],
+                                              [3.0, 6.0, 30.0, 60.0]])
+
+    def test_date_range(self):
+        """
+        Test the panel only covers the requested dates
+        """
+        panel = get_panel(['AAA', 'BBB'], start_date='2024-01-04', end_date='2024-01-04')
+        self.assertEqual(len(panel), 1)
+        self.assertEqual(list(panel.iloc[0]), [3.0, 6.0])
+
+    def test_filtered_stock_data_columns(self):
+        """
+        Test the column projection of get_filtered_stock_data used by the panel
+        """
+        data = get_filtered_stock_data('AAA', '2024-01-03', '', columns=['Volume'])
+        self.assertEqual(list(data.columns), ['Date', 'Volume'])
+        self.assertEqual(list(data['Volume']), [20, 30])
+
+    def test_invalid_input(self):
+        """
+        Test invalid tickers and alignment
+        """
+        with self.assertRaises(ValueError):
+            get_panel(['AAA', 'CCC'])
+        with self.assertRaises(ValueError):
+            get_panel(['AAA'], how='left')
+        with self.assertRaises(TypeError):
+            get_panel(['AAA', 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+test_price_store.py
+===========
+
+This module contains unit tests for the price_store module.
+
+Classes:
+    TestPriceStore: Test cases for the price_store module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from backend.price_store import (
+    CsvPriceStore,
+    ParquetPriceStore,
+    get_price_store,
+    migrate_csv_to_parquet
+)
+
+class TestPriceStore(unittest.TestCase):
+    """
+    Test cases for the CSV and Parquet price stores and the CSV to Parquet migration.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary database folder holding a yfinance-style table.
+        """
+        self.base_path = tempfile.mkdtemp()
+        self.data = pd.DataFrame({'Open': [1.0, 2.0, 3.0],
+                                  'Close': [1.5, 2.5, 3.5],
+                                  'Volume': [10, 20, 30]},
+                                 index=pd.DatetimeIndex(['2024-01-02', '2024-01-03',
+                                                         '2024-01-04'], name='Date'))
+
+    def tearDown(self):
+        """
+        Remove the temporary database folder.
+        """
+        shutil.rmtree(self.base_path)
+
+    def test_get_price_store(self):
+        """
+        Test the store factory with valid and invalid formats
+        """
+        self.assertIsInstance(get_price_store('csv', self.base_path), CsvPriceStore)
+        self.assertIsInstance(get_price_store('parquet', self.base_path), ParquetPriceStore)
+        with self.assertRaises(ValueError):
+            get_price_store('xlsx', self.base_path)
+
+    def test_csv_round_trip(self):
+        """
+        Test writing, appending and reading back a CSV table
+        """
+        store = CsvPriceStore(self.base_path)
+        store.write('AAA', self.data)
+        store.append('AAA', self.data.iloc[-1:])
+        table = store.read('AAA')
+        self.assertEqual(list(table.columns), ['Date', 'Open', 'Close', 'Volume'])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(store.list_tickers(), ['AAA'])
+
+    def test_parquet_round_trip(self):
+        """
+        Test writing, appending and reading back a Parquet table with typed dates
+        """
+        store = ParquetPriceStore(self.base_path)
+        store.write('AAA', self.data)
+        store.append('AAA', self.data.iloc[-1:])
+        table = store.read('AAA')
+        self.assertEqual(list(table.columns), ['Date', 'Open', 'Close', 'Volume'])
+        self.assertEqual(len(table), 4)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(table['Date']))
+        self.assertEqual(store.list_tickers(), ['AAA'])
+
+    def test_column_projection(self):
+        """
+        Test that only the requested columns (plus Date) are loaded
+        """
+        for store in (CsvPriceStore(self.base_path), ParquetPriceStore(self.base_path)):
+            store.write('AAA', self.data)
+            table = store.read('AAA', columns=['Close'])
+            self.assertEqual(list(table.columns), ['Date', 'Close'])
+
+    def test_read_rows(self):
+        """
+        Test reading a row range keeps the original row positions as index
+        """
+        for store in (CsvPriceStore(self.base_path), ParquetPriceStore(self.base_path)):
+            store.write('AAA', self.data)
+            rows = store.read_rows('AAA', 1, 3, columns=['Close'])
+            self.assertEqual(list(rows.index), [1, 2])
+            self.assertEqual(list(rows['Close']), [2.5, 3.5])
+            self.assertEqual(len(store.read_rows('AAA', 2, 2)), 0)
+
+    def test_parquet_read_rows_across_row_groups(self):
+        """
+        Test a row range spanning several Parquet row groups
+        """
+        store = ParquetPriceStore(self.base_path)
+        dates = pd.date_range('2000-01-01', periods=3000, name='Date')
+        store.write('BBB', pd.DataFrame({'Close': range(3000)}, index=dates))
+        rows = store.read_rows('BBB', 1000, 2100)
+        self.assertEqual(list(rows['Close']), list(range(1000, 2100)))
+
+    def test_last_date(self):
+        """
+        Test the last stored date is found from the end of the table
+        """
+        for store in (CsvPriceStore(self.base_path), ParquetPriceStore(self.base_path)):
+            store.write('AAA', self.data)
+            self.assertEqual(store.last_date('AAA'), pd.Timestamp('2024-01-04'))
+            store.write('EMPTY', self.data.iloc[:0])
+            self.assertIsNone(store.last_date('EMPTY'))
+
+        store = CsvPriceStore(self.base_path)
+        dates = pd.date_range('2000-01-01', periods=3000, name='Date')
+        store.write('LONG', pd.DataFrame({'Close': range(3000)}, index=dates))
+        self.assertEqual(store.last_date('LONG'), dates[-1])
+
+    def test_migrate_csv_to_parquet(self):
+        """
+        Test the one-shot migration keeps the prices and removes CSV files on request
+        """
+        CsvPriceStore(self.base_path).write('AAA', self.data)
+        migrated = migrate_csv_to_parquet(self.base_path, remove_csv=True)
+        self.assertEqual(migrated, ['AAA'])
+        self.assertFalse(os.path.exists(os.path.join(self.base_path, 'AAA.csv')))
+        table = ParquetPriceStore(self.base_path).read('AAA')
+        self.assertListEqual(list(table['Close']), list(self.data['Close']))
+
+if __name__ == '__main__':
+    unittest.main()
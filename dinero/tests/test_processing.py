@@ -7,18 +7,33 @@ This module contains unit tests for the processing module
 Classes:
     TestDineroAnalysis: Test cases for the processing module.
 """
+import io
 import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
 import pandas as pd
-from backend.processing import process_dict_to_df, get_sentiments
+from backend.processing import (
+    get_keywords,
+    get_sentiments,
+    main,
+    process_dict_to_df,
+    warm_news_cache
+)
+from tests.temp_database import TempDatabaseTestCase
 
-class TestDineroAnalysis(unittest.TestCase):
+class TestDineroAnalysis(TempDatabaseTestCase):
     """
     Test cases for the dinero_analysis module functions.
     """
     def setUp(self):
         """
-        Set up any data or variables needed for the test cases.
+        Set up any data or variables needed for the test cases, and a temporary
+        database holding a copy of the AAPL table (the memory-mapped mirror and the
+        news cache get_sentiments writes stay there).
         """
+        super().setUp()
+        self.copy_tickers('AAPL')
         self.sentiment_data = {
             '2024-01-01': {
                 'Article 1': {'link': 'link1', 'sentiment_score':
@@ -61,5 +76,37 @@ class TestDineroAnalysis(unittest.TestCase):
         self.assertIsNone(df_none_symbol)  # Check if None stock symbol returns None
         self.assertIsNone(df_none_change)  # Check if None percent change returns None
 
+    @mock.patch('backend.processing.aggregate_keywords')
+    @mock.patch('backend.processing.get_filter_dates')
+    def test_get_keywords(self, mock_get_filter_dates, mock_aggregate_keywords):
+        """
+        Test get_keywords ranks the terms of the news of the filtered dates.
+        """
+        mock_get_filter_dates.return_value = {'2024-01-01': [{'content': 'Apple rallies.'}]}
+        self.assertIs(get_keywords('AAPL', 5, top_n=3), mock_aggregate_keywords.return_value)
+        mock_aggregate_keywords.assert_called_once_with(mock_get_filter_dates.return_value,
+                                                        'AAPL', 3, cached=True)
+        self.assertEqual(mock_get_filter_dates.call_args.kwargs, {'mode': 'range', 'cached': True})
+        self.assertIsNone(get_keywords(None, 5))
+        self.assertIsNone(get_keywords('AAPL', None))
+
+    @mock.patch('backend.processing.get_news_cache_stats', return_value={'entries': 2})
+    @mock.patch('backend.processing.get_filter_dates')
+    def test_warm_news_cache(self, mock_get_filter_dates, _):
+        """
+        Test warm_news_cache fetches the news of every stock through the cache.
+        """
+        mock_get_filter_dates.return_value = {'2024-01-01': [{'title': 'Title'}],
+                                              '2024-01-02': []}
+        self.assertEqual(warm_news_cache(['AAPL', 'MSFT'], 5), {'AAPL': 1, 'MSFT': 1})
+        self.assertEqual(mock_get_filter_dates.call_count, 2)
+        self.assertEqual(mock_get_filter_dates.call_args.kwargs, {'mode': 'range', 'cached': True})
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['msft', '--percent-change', '3', '--mode', 'date'])
+        self.assertEqual(mock_get_filter_dates.call_args.args[1:], (3.0, 'MSFT'))
+        self.assertIn('MSFT: 1 dates with articles', output.getvalue())
+
 if __name__ == '__main__':
     unittest.main()
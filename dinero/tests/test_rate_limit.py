@@ -0,0 +1,107 @@
+"""
+test_rate_limit.py
+===========
+
+This module contains unit tests for the rate_limit module.
+
+Classes:
+    TestTokenBucket: Test cases for the TokenBucket class.
+    TestCircuitBreaker: Test cases for the CircuitBreaker class.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
+from backend.rate_limit import CircuitBreaker, TokenBucket
+
+
+def acquire_many(state_path, count):
+    """Take count tokens from a bucket shared through state_path, one at a time."""
+    bucket = TokenBucket(rate=20, capacity=1, state_path=state_path)
+    for _ in range(count):
+        bucket.acquire()
+    return count
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the TokenBucket class."""
+
+    def test_burst_then_rate(self):
+        """A full bucket serves a burst at once, then tokens come at the rate."""
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.perf_counter()
+        for _ in range(5):
+            self.assertTrue(bucket.acquire(timeout=0))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertLess(bucket.available(), 1)
+        self.assertFalse(bucket.acquire(timeout=0))
+        for _ in range(10):
+            bucket.acquire()
+        self.assertGreater(time.perf_counter() - start, 10 / 50 * 0.9)
+
+    def test_shared_by_threads(self):
+        """Threads taking from one bucket are limited together."""
+        bucket = TokenBucket(rate=100, capacity=1)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: bucket.acquire(), range(40)))
+        self.assertGreater(time.perf_counter() - start, 39 / 100 * 0.9)
+
+    @unittest.skipIf(os.name != 'posix', 'the state file is only shared on POSIX systems')
+    def test_shared_by_processes(self):
+        """Processes using the same state file are limited together."""
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        state_path = os.path.join(folder, 'bucket')
+        acquire_many(state_path, 1)  # drain the burst
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(sum(executor.map(acquire_many, [state_path] * 2, [5, 5])), 10)
+        self.assertGreater(time.perf_counter() - start, 10 / 20 * 0.9)
+
+    def test_invalid_arguments(self):
+        """Non-positive rates and empty buckets raise ValueError."""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, capacity=0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for the CircuitBreaker class."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Only consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for success in (False, False, True, False, False):
+            self.assertTrue(breaker.allow_request())
+            breaker.record(success)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.record(False)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+    def test_half_open_trial(self):
+        """After the reset timeout a single trial decides the state of the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record(False)
+        with mock.patch('backend.rate_limit.time.monotonic', return_value=time.monotonic() + 11):
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+            breaker.record(False)
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with mock.patch('backend.rate_limit.time.monotonic', return_value=time.monotonic() + 22):
+            self.assertTrue(breaker.allow_request())
+            breaker.record(True)
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+            self.assertTrue(breaker.allow_request())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,16 +6,46 @@ This module contains unit tests for the request module
 
 Classes:
     TestGetNewsArticles: Test cases for the module.
+    TestNewsServer: Test cases against a local stand-in of the news API.
+    TestGroupDates: Test cases for grouping dates into request windows.
 """
+import json
+import threading
+import time
 import unittest
+from datetime import date as calendar_date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
-from backend.req import get_news_articles
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from backend.rate_limit import CircuitBreaker
+from backend.req import (
+    CircuitOpenError,
+    NewsAPIError,
+    NewsRequestError,
+    RateLimitedError,
+    configure_news_limits,
+    create_session,
+    fetch_news_by_date,
+    fetch_news_by_range,
+    get_news_articles,
+    get_news_range,
+    group_dates,
+    is_retryable
+)
 
 class TestGetNewsArticles(unittest.TestCase):
     """Test case for the get_news_articles function."""
 
-    @patch('backend.req.requests.get')
-    def test_get_news_articles_success(self, mock_get):
+    def setUp(self):
+        """Start from a closed circuit, whatever earlier requests of the process did."""
+        configure_news_limits(state_path=None)
+        self.addCleanup(configure_news_limits)
+
+    @patch('backend.req.get_session')
+    def test_get_news_articles_success(self, mock_session):
         """Test get_news_articles function for successful API response."""
         # Arrange
         mock_response = {
@@ -25,7 +55,7 @@ class TestGetNewsArticles(unittest.TestCase):
                 {"title": "Article 2", "content": "Content 2"}
             ]
         }
-        mock_get.return_value.json.return_value = mock_response
+        mock_session.return_value.get.return_value.json.return_value = mock_response
         ticker = 'AAPL'
         date = '2024-03-09'
 
@@ -40,12 +70,12 @@ class TestGetNewsArticles(unittest.TestCase):
         self.assertEqual(result['articles'][1]['title'], 'Article 2')
         self.assertEqual(result['articles'][1]['content'], 'Content 2')
 
-    @patch('backend.req.requests.get')
-    def test_get_news_articles_api_failure(self, mock_get):
+    @patch('backend.req.get_session')
+    def test_get_news_articles_api_failure(self, mock_session):
         """Test get_news_articles function for API failure response."""
         # Arrange
         mock_response = {"status": "error", "message": "API error"}
-        mock_get.return_value.json.return_value = mock_response
+        mock_session.return_value.get.return_value.json.return_value = mock_response
         ticker = 'AAPL'
         date = '2024-03-09'
 
@@ -56,5 +86,276 @@ class TestGetNewsArticles(unittest.TestCase):
         self.assertEqual(result['status'], 'error')
         self.assertEqual(result['message'], 'API error')
 
+
+class NewsHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in of the news API: answers the server's articles_per_day articles per
+    day from 'from' to 'to' for each of the comma-separated symbols, sliced by
+    'offset' and 'limit' (50 by default), after DELAY seconds. Dates listed in the
+    server's failures fail with a 503 that many times first, dates listed in its
+    statuses always answer that status.
+    """
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a news request."""
+        query = parse_qs(urlparse(self.path).query)
+        date = query['from'][0]
+        with self.server.lock:
+            self.server.requests.append(date)
+            self.server.queries.append({key: values[0] for key, values in query.items()})
+            failing = self.server.failures.get(date, 0) > 0
+            if failing:
+                self.server.failures[date] -= 1
+        time.sleep(self.server.delay)
+        day, last_day = (calendar_date.fromisoformat(query[key][0]) for key in ('from', 'to'))
+        articles = []
+        while day <= last_day:
+            for symbol in query['s'][0].split(','):
+                articles.extend({'date': f'{day.isoformat()}T{hour:02d}:00:00+00:00',
+                                 'title': f'News of {day.isoformat()}', 'content': '',
+                                 'link': '', 'symbols': [symbol]}
+                                for hour in range(self.server.articles_per_day))
+            day += timedelta(days=1)
+        offset = int(query.get('offset', ['0'])[0])
+        body = json.dumps(articles[offset:offset + int(query.get('limit', ['50'])[0])]).encode()
+        try:
+            status = self.server.statuses.get(date, 503 if failing else 200)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', '0' if status != 200 else str(len(body)))
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.end_headers()
+            if status == 200:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up waiting (timeout test)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep the test output quiet."""
+
+
+class TestNewsServer(unittest.TestCase):
+    """Test cases for pooled, concurrent and retried requests to a local server."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), NewsHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.queries = []
+        self.server.failures = {}
+        self.server.statuses = {}
+        self.server.articles_per_day = 1
+        self.server.delay = 0.0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        url_patcher = patch('backend.req.NEWS_API_URL',
+                            f'http://127.0.0.1:{self.server.server_port}/api/news')
+        url_patcher.start()
+        self.addCleanup(url_patcher.stop)
+        self.session = create_session(backoff=0.01)
+        self.addCleanup(self.session.close)
+        configure_news_limits(rate=1000, burst=1000, state_path=None)
+        self.addCleanup(configure_news_limits)
+
+    def test_results_keyed_by_date(self):
+        """Responses come back keyed by date, in the order of the dates."""
+        dates = [f'2024-01-{day:02d}' for day in range(1, 21)]
+        result = fetch_news_by_date('AAPL', dates, session=self.session)
+        self.assertEqual(list(result), dates)
+        for date, articles in result.items():
+            self.assertEqual(articles[0]['title'], f'News of {date}')
+            self.assertEqual(articles[0]['symbols'], ['AAPL'])
+
+    def test_concurrent_throughput(self):
+        """Concurrent requests overlap their latency instead of adding it up."""
+        self.server.delay = 0.1
+        dates = [f'2024-02-{day:02d}' for day in range(1, 17)]
+        start = time.perf_counter()
+        fetch_news_by_date('AAPL', dates[:4], max_workers=1, session=self.session)
+        serial_rate = 4 / (time.perf_counter() - start)
+        start = time.perf_counter()
+        result = fetch_news_by_date('AAPL', dates, max_workers=8, session=self.session)
+        concurrent_rate = len(dates) / (time.perf_counter() - start)
+        self.assertTrue(all(result.values()))
+        self.assertGreater(concurrent_rate, 3 * serial_rate)
+
+    def test_retries_with_backoff(self):
+        """Failed requests are retried until they succeed or run out of retries."""
+        self.server.failures = {'2024-03-01': 2, '2024-03-02': 10}
+        result = fetch_news_by_date('AAPL', ['2024-03-01', '2024-03-02'], session=self.session)
+        self.assertEqual(result['2024-03-01'][0]['title'], 'News of 2024-03-01')
+        self.assertIsNone(result['2024-03-02'])
+        self.assertEqual(self.server.requests.count('2024-03-01'), 3)
+        self.assertEqual(self.server.requests.count('2024-03-02'), 4)
+
+    def test_timeout(self):
+        """Requests slower than the read timeout fail after the retries."""
+        self.server.delay = 0.5
+        with patch('backend.req.REQUEST_TIMEOUT', (1, 0.1)), \
+                self.assertRaises(NewsAPIError) as context:
+            get_news_articles('AAPL', '2024-04-01', session=create_session(retries=1, backoff=0))
+        self.assertTrue(context.exception.retryable)
+        self.assertEqual(self.server.requests, ['2024-04-01'] * 2)
+
+    def test_rate_limit(self):
+        """Requests are spaced out to the configured rate, even when sent concurrently."""
+        configure_news_limits(rate=40, burst=1, state_path=None)
+        dates = [f'2024-09-{day:02d}' for day in range(1, 21)]
+        start = time.perf_counter()
+        result = fetch_news_by_date('AAPL', dates, session=self.session)
+        self.assertGreater(time.perf_counter() - start, 19 / 40 * 0.9)
+        self.assertTrue(all(result.values()))
+
+        configure_news_limits(rate=0.1, burst=1, state_path=None)
+        get_news_articles('AAPL', '2024-09-21', session=self.session)
+        with patch('backend.req.NEWS_RATE_LIMIT_TIMEOUT', 0.1), \
+                self.assertRaises(RateLimitedError):
+            get_news_articles('AAPL', '2024-09-22', session=self.session)
+        self.assertNotIn('2024-09-22', self.server.requests)
+
+    def test_circuit_breaker(self):
+        """Once the provider keeps failing, requests fail fast without reaching it."""
+        _, breaker = configure_news_limits(rate=1000, burst=1000, state_path=None,
+                                           failure_threshold=2, reset_timeout=60)
+        session = create_session(retries=0)
+        self.server.statuses = {'2024-10-01': 500, '2024-10-02': 500}
+        for date in ('2024-10-01', '2024-10-02'):
+            with self.assertRaises(NewsAPIError):
+                get_news_articles('AAPL', date, session=session)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        start = time.perf_counter()
+        with self.assertRaises(CircuitOpenError):
+            get_news_articles('AAPL', '2024-10-03', session=session)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        with self.assertLogs('backend.req', 'WARNING') as logs:
+            self.assertEqual(fetch_news_by_date('AAPL', ['2024-10-04'], session=session),
+                             {'2024-10-04': None})
+        self.assertIn('CircuitOpenError', logs.output[0])
+        self.assertEqual(self.server.requests, ['2024-10-01', '2024-10-02'])
+
+    def test_fatal_errors_keep_circuit_closed(self):
+        """Errors the provider will repeat (e.g. exhausted quota) do not open the circuit."""
+        _, breaker = configure_news_limits(rate=1000, burst=1000, state_path=None,
+                                           failure_threshold=1, reset_timeout=60)
+        self.server.statuses = {'2024-10-01': 402}
+        with self.assertRaises(NewsAPIError) as context:
+            get_news_articles('AAPL', '2024-10-01', session=self.session)
+        self.assertEqual((context.exception.status_code, context.exception.retryable),
+                         (402, False))
+        self.assertEqual(self.server.requests, ['2024-10-01'])
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_too_many_requests(self):
+        """429 responses are retried through the rate limiter, not by the session."""
+        limiter, _ = configure_news_limits(rate=1000, burst=1000, state_path=None,
+                                           failure_threshold=10)
+        self.server.statuses = {'2024-10-05': 429}
+        with patch('backend.req.RETRY_BACKOFF', 0.01), \
+                patch.object(limiter, 'acquire', wraps=limiter.acquire) as acquire, \
+                self.assertRaises(NewsAPIError) as context:
+            get_news_articles('AAPL', '2024-10-05', session=self.session)
+        self.assertEqual(context.exception.status_code, 429)
+        self.assertEqual(self.server.requests, ['2024-10-05'] * 4)
+        self.assertEqual(acquire.call_count, 4)
+
+    def test_trial_request_always_recorded(self):
+        """An unexpected error of the trial request still closes the half-open trial."""
+        _, breaker = configure_news_limits(rate=1000, burst=1000, state_path=None,
+                                           failure_threshold=1, reset_timeout=0)
+        breaker.record(False)
+        with patch.object(self.session, 'get', side_effect=KeyError('boom')), \
+                self.assertRaises(KeyError):
+            get_news_articles('AAPL', '2024-10-06', session=self.session)
+        self.assertTrue(breaker.allow_request())
+
+    def test_is_retryable(self):
+        """Connection errors, timeouts, 429 and 5xx are retryable, other errors are not."""
+        def http_error(status_code):
+            response = requests.Response()
+            response.status_code = status_code
+            return requests.HTTPError(response=response)
+
+        for error in (requests.ConnectionError(), requests.Timeout(), http_error(429),
+                      http_error(503)):
+            self.assertTrue(is_retryable(error), error)
+        for error in (http_error(401), http_error(402), http_error(404), ValueError()):
+            self.assertFalse(is_retryable(error), error)
+
+    def test_range_paging(self):
+        """A range request pages through offset until a short page."""
+        self.server.articles_per_day = 3
+        with patch('backend.req.NEWS_PAGE_LIMIT', 4):
+            articles = get_news_range(['AAPL', 'MSFT'], '2024-05-01', '2024-05-03',
+                                      session=self.session)
+        self.assertEqual(len(articles), 3 * 3 * 2)
+        self.assertEqual([query['offset'] for query in self.server.queries],
+                         ['0', '4', '8', '12', '16'])
+        self.assertTrue(all(query['s'] == 'AAPL,MSFT' for query in self.server.queries))
+
+    def test_range_page_cap(self):
+        """Ranges beyond NEWS_MAX_PAGES pages are split, a single date beyond it fails."""
+        self.server.articles_per_day = 4
+        with patch('backend.req.NEWS_PAGE_LIMIT', 4), patch('backend.req.NEWS_MAX_PAGES', 2):
+            articles = get_news_range('AAPL', '2024-05-01', '2024-05-04', session=self.session)
+            self.assertEqual(len(articles), 4 * 4)
+            self.assertEqual(len({article['title'] for article in articles}), 4)
+            self.server.articles_per_day = 9
+            with self.assertRaises(NewsRequestError):
+                get_news_range('AAPL', '2024-05-01', '2024-05-02', session=self.session)
+
+    def test_range_matches_by_date(self):
+        """Range mode buckets the articles like one request per date, in fewer requests."""
+        dates = ['2024-06-03', '2024-06-01', '2024-06-05', '2024-06-20', '2024-06-21']
+        by_date = fetch_news_by_date('AAPL', dates, session=self.session)
+        requests_by_date = len(self.server.queries)
+        self.server.queries.clear()
+        by_range = fetch_news_by_range('AAPL', dates, session=self.session)
+        self.assertEqual(list(by_range), dates)
+        for date in dates:
+            self.assertEqual([article['title'] for article in by_range[date]],
+                             [article['title'] for article in by_date[date]])
+        self.assertEqual(requests_by_date, 5)
+        self.assertEqual(len(self.server.queries), 2)
+
+    def test_range_multiple_tickers(self):
+        """Several tickers share one request, each finding its articles by symbol."""
+        result = fetch_news_by_range(['AAPL', 'MSFT'], ['2024-07-01', '2024-07-02'],
+                                     session=self.session)
+        self.assertEqual(len(self.server.queries), 1)
+        for articles in result.values():
+            self.assertEqual(sorted(article['symbols'][0] for article in articles),
+                             ['AAPL', 'MSFT'])
+
+    def test_range_failure(self):
+        """The dates of a failed window are None, other windows are kept."""
+        self.server.failures = {'2024-08-01': 10}
+        result = fetch_news_by_range('AAPL', ['2024-08-01', '2024-08-02', '2024-08-30'],
+                                     session=self.session)
+        self.assertIsNone(result['2024-08-01'])
+        self.assertIsNone(result['2024-08-02'])
+        self.assertEqual(len(result['2024-08-30']), 1)
+
+
+class TestGroupDates(unittest.TestCase):
+    """Test cases for the group_dates function."""
+
+    def test_group_dates(self):
+        """Nearby dates share a window, distant dates start a new one."""
+        dates = ['2024-01-20', '2024-01-01', '2024-01-05', '2024-01-12', '2024-01-05']
+        self.assertEqual(group_dates(dates), [('2024-01-01', '2024-01-12'),
+                                              ('2024-01-20', '2024-01-20')])
+        self.assertEqual(group_dates(dates, max_gap_days=10),
+                         [('2024-01-01', '2024-01-20')])
+        self.assertEqual(group_dates([]), [])
+
+    def test_window_span(self):
+        """Windows never cover more than max_span_days days."""
+        dates = [f'2024-03-{day:02d}' for day in range(1, 32)]
+        self.assertEqual(group_dates(dates, max_span_days=10),
+                         [('2024-03-01', '2024-03-10'), ('2024-03-11', '2024-03-20'),
+                          ('2024-03-21', '2024-03-30'), ('2024-03-31', '2024-03-31')])
+
 if __name__ == '__main__':
     unittest.main()
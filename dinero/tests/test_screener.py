@@ -0,0 +1,100 @@
+"""
+test_screener.py
+===========
+
+This module contains unit tests for the screener module.
+
+Classes:
+    TestScreener: Test cases for the screener module.
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from backend.kpi_manager import get_technical_indicator
+from backend.screener import Predicate, main, parse_predicate, screen_tickers
+from backend.stock_data_manager import get_existing_tickers
+
+TICKERS = ['AAPL', 'GOOG', 'MSFT', 'NVDA', 'TSLA']
+
+
+class TestScreener(unittest.TestCase):
+    """Test cases for the screener module."""
+
+    def test_parse_predicate(self):
+        """Predicates are parsed into column, indicator, length, operator and threshold."""
+        self.assertEqual(parse_predicate('RSI_14 < 30'),
+                         Predicate('RSI_14', 'RSI', 14, '<', 30.0))
+        self.assertEqual(parse_predicate(' macd_hist_12>=-0.5 '),
+                         Predicate('MACD_HIST_12', 'MACD', 12, '>=', -0.5))
+        self.assertEqual(parse_predicate('BBP_20 > 1e0').threshold, 1.0)
+
+    def test_parse_invalid_predicate(self):
+        """Malformed predicates and unknown outputs raise errors."""
+        for text in ['RSI < 30', 'RSI_14 30', 'RSI_14 < abc', 'RSI_0 < 30', 'FOO_14 < 1']:
+            with self.assertRaises(ValueError):
+                parse_predicate(text)
+        with self.assertRaises(TypeError):
+            parse_predicate(30)
+
+    def test_matches_full_history(self):
+        """Values computed from the trailing rows match the full-history indicators."""
+        result = screen_tickers(['RSI_14 > 0', 'BBP_20 > -100', 'MACD_HIST_12 > -100'],
+                                TICKERS, max_workers=1)
+        self.assertEqual(sorted(result['Ticker']), TICKERS)
+        for _, row in result.iterrows():
+            for column, indicator, length in [('RSI_14', 'RSI', 14), ('BBP_20', 'BBP', 20),
+                                              ('MACD_HIST_12', 'MACD', 12)]:
+                expected = get_technical_indicator(row['Ticker'], length, indicator)
+                output = column.rsplit('_', 1)[0]
+                self.assertTrue(np.isclose(row[column], expected[output].iloc[-1], rtol=1e-6))
+                self.assertEqual(row['Date'], expected['Date'].iloc[-1])
+
+    def test_filter_and_rank(self):
+        """Only tickers satisfying every predicate are returned, ranked."""
+        everything = screen_tickers(['RSI_14 > 0', 'ROC_10 > -100'], TICKERS, max_workers=1)
+        self.assertEqual(list(everything['RSI_14']),
+                         sorted(everything['RSI_14'], reverse=True))
+        self.assertEqual(list(everything['Rank']), list(range(1, len(TICKERS) + 1)))
+
+        threshold = everything['RSI_14'].median()
+        result = screen_tickers([f'RSI_14 < {threshold}', 'ROC_10 > -100'], TICKERS,
+                                rank_by='ROC_10', max_workers=1)
+        expected = everything[everything['RSI_14'] < threshold]
+        self.assertEqual(sorted(result['Ticker']), sorted(expected['Ticker']))
+        self.assertEqual(list(result['ROC_10']), sorted(result['ROC_10'], reverse=True))
+
+        result = screen_tickers(['RSI_14 > 0'], TICKERS, ascending=True, max_workers=1)
+        self.assertEqual(list(result['RSI_14']), sorted(result['RSI_14']))
+
+    def test_invalid_arguments(self):
+        """Missing predicates and unknown rank columns raise ValueError."""
+        with self.assertRaises(ValueError):
+            screen_tickers([], TICKERS)
+        with self.assertRaises(ValueError):
+            screen_tickers(['RSI_14 < 30'], TICKERS, rank_by='BBP_20')
+
+    def test_process_pool(self):
+        """Screening in worker processes gives the same table as in this process."""
+        predicates = ['RSI_14 > 0', 'ATR_14 > 0']
+        serial = screen_tickers(predicates, max_workers=1)
+        parallel = screen_tickers(predicates, max_workers=2)
+        self.assertEqual(len(serial), len(get_existing_tickers()))
+        self.assertTrue(serial.equals(parallel))
+
+    def test_main(self):
+        """The command line prints the ranked matches."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['RSI_14 > 0', '--tickers', 'msft', 'aapl', '--order', 'asc', '--workers', '1'])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], '2 matching tickers')
+        self.assertIn('MSFT', output.getvalue())
+        self.assertIn('AAPL', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
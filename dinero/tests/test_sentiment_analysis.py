@@ -7,8 +7,23 @@ This module contains unit tests for the request module
 Classes:
     TestGetNewsArticles: Test cases for the module.
 """
+import os
+import shutil
+import tempfile
 import unittest
-from backend.sentiment_analysis import get_sentiment_value
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from backend.sentiment_analysis import (
+    BUNDLED_LEXICON,
+    batch_sentiment_values,
+    get_analyzer,
+    get_lexicon_path,
+    get_model_version,
+    get_sentiment_value,
+    iter_sentiment_values,
+    score_texts
+)
 
 class TestSentimentAnalysis(unittest.TestCase):
     """Test case for sentiment analysis module."""
@@ -48,5 +63,74 @@ class TestSentimentAnalysis(unittest.TestCase):
         result = get_sentiment_value([])
         self.assertEqual(result, {})
 
+    def test_shared_analyzer(self):
+        """Test one analyzer is built per process and shared across threads."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            analyzers = list(executor.map(lambda _: get_analyzer(), range(8)))
+        self.assertTrue(all(analyzer is analyzers[0] for analyzer in analyzers))
+        with mock.patch('backend.sentiment_analysis.SentimentIntensityAnalyzer') as analyzer:
+            get_sentiment_value(self.titles)
+            get_sentiment_value(self.titles)
+        analyzer.assert_not_called()
+
+    def test_lexicon_path(self):
+        """Test the lexicon is found locally, or where DINERO_VADER_LEXICON points."""
+        with mock.patch('nltk.download') as download:
+            self.assertTrue(get_lexicon_path())
+        download.assert_not_called()
+        with mock.patch.dict(os.environ, {'DINERO_VADER_LEXICON': BUNDLED_LEXICON}):
+            self.assertEqual(get_lexicon_path(), f'file:{os.path.abspath(BUNDLED_LEXICON)}')
+        with mock.patch.dict(os.environ, {'DINERO_VADER_LEXICON': 'missing.txt'}):
+            with self.assertRaises(LookupError):
+                get_lexicon_path()
+
+    def test_cached_scores(self):
+        """Test cached scoring analyzes every distinct text once, across calls."""
+        base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_path)
+        expected = get_sentiment_value(self.titles)
+        with mock.patch('backend.stock_data_manager.DEFAULT_DATABASE_PATH', base_path), \
+                mock.patch.object(get_analyzer(), 'polarity_scores',
+                                  wraps=get_analyzer().polarity_scores) as polarity_scores:
+            self.assertEqual(get_sentiment_value(self.titles, cached=True), expected)
+            self.assertEqual(get_sentiment_value(self.titles, cached=True), expected)
+            texts = ['Stocks rally.', 'Stocks  rally.\n', 'Stocks slump.', 'This is a great day!']
+            scores = score_texts(texts, cached=True)
+        self.assertEqual(polarity_scores.call_count, 3 + 2)
+        self.assertEqual(scores[0], scores[1])
+        self.assertEqual(scores[3], expected['Positive title']['sentiment_score'])
+        self.assertTrue(get_model_version().startswith('vader-nltk-'))
+
+    def test_batch_matches_single_process(self):
+        """Test batch scoring in worker processes streams get_sentiment_value's entries in order."""
+        articles = [{'title': f'Title {position}', 'link': f'link {position}',
+                     'content': f"{self.titles[position % 3]['content']} Day {position % 7}."}
+                    for position in range(40)]
+        expected = get_sentiment_value(articles)
+        streamed = list(iter_sentiment_values(articles, chunk_size=4, max_workers=2))
+        self.assertEqual([title for title, _ in streamed], [a['title'] for a in articles])
+        self.assertEqual(dict(streamed), expected)
+
+        result, stats = batch_sentiment_values(articles, chunk_size=8, max_workers=1)
+        self.assertEqual(result, expected)
+        self.assertEqual(stats['articles'], 40)
+        self.assertGreater(stats['articles_per_second'], 0)
+        self.assertEqual(batch_sentiment_values([])[0], {})
+        with self.assertRaises(ValueError):
+            list(iter_sentiment_values(articles, chunk_size=0))
+
+    def test_lexicon_scorer(self):
+        """Test the vectorized lexicon scorer is selectable and versioned on its own."""
+        # no negation, booster or capitals: both scorers agree
+        expected = get_sentiment_value(self.titles)
+        self.assertEqual(get_sentiment_value(self.titles, scorer='lexicon'), expected)
+        articles = self.titles * 10
+        self.assertEqual(dict(iter_sentiment_values(articles, chunk_size=1, max_workers=2,
+                                                    scorer='lexicon')), expected)
+        self.assertNotEqual(get_model_version('lexicon'), get_model_version())
+        self.assertTrue(get_model_version('lexicon').startswith('lexicon-sparse-'))
+        with self.assertRaises(ValueError):
+            get_sentiment_value(self.titles, scorer='textblob')
+
 if __name__ == '__main__':
     unittest.main()
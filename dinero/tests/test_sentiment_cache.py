@@ -0,0 +1,67 @@
+"""
+test_sentiment_cache.py
+===========
+
+This module contains unit tests for the sentiment_cache module.
+
+Classes:
+    TestSentimentCache: Test cases for the sentiment_cache module.
+"""
+
+import unittest
+
+from backend.sentiment_cache import (
+    clear_sentiment_cache,
+    get_cached_scores,
+    get_sentiment_cache_stats,
+    normalize_text,
+    put_scores,
+    text_key
+)
+from tests.temp_database import TempDatabaseTestCase
+
+SCORE = {'neg': 0.1, 'neu': 0.6, 'pos': 0.3, 'compound': 0.4}
+
+
+class TestSentimentCache(TempDatabaseTestCase):
+    """
+    Test cases for the SQLite sentiment cache, in a temporary database.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.patch('backend.sentiment_cache._cache._stats', {'hits': 0, 'misses': 0, 'writes': 0})
+
+    def test_text_key(self):
+        """Texts differing only in whitespace or Unicode form share a key."""
+        self.assertEqual(normalize_text('  Stocks\n rally\ttoday '), 'Stocks rally today')
+        self.assertEqual(text_key('Café  opens'), text_key('Café opens\n'))
+        self.assertNotEqual(text_key('GREAT day'), text_key('great day'))
+        self.assertEqual(len(text_key('')), 64)
+
+    def test_lookup_by_version(self):
+        """Scores are served for the version that computed them only."""
+        keys = [text_key('first'), text_key('second')]
+        put_scores({keys[0]: SCORE}, 'v1')
+        self.assertEqual(get_cached_scores(keys, 'v1'), {keys[0]: SCORE})
+        self.assertEqual(get_cached_scores(keys, 'v2'), {})
+        self.assertEqual(get_sentiment_cache_stats(),
+                         {'hits': 1, 'misses': 3, 'writes': 1, 'entries': 1})
+
+    def test_large_batches(self):
+        """Lookups of more keys than SQLite accepts in one query are split."""
+        scores = {text_key(str(position)): SCORE for position in range(1200)}
+        put_scores(scores, 'v1')
+        self.assertEqual(len(get_cached_scores(list(scores), 'v1')), 1200)
+
+    def test_clear(self):
+        """Scores can be dropped per version or altogether."""
+        put_scores({text_key('text'): SCORE}, 'v1')
+        put_scores({text_key('text'): SCORE}, 'v2')
+        self.assertEqual(clear_sentiment_cache('v1'), 1)
+        self.assertEqual(clear_sentiment_cache(), 1)
+        self.assertEqual(get_sentiment_cache_stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+test_sqlite_cache.py
+===========
+
+This module contains unit tests for the sqlite_cache module.
+
+Classes:
+    TestSQLiteCache: Test cases for the SQLiteCache class.
+"""
+
+import os
+import unittest
+
+from backend.sqlite_cache import SQLiteCache
+from tests.temp_database import TempDatabaseTestCase
+
+SCHEMA = '''CREATE TABLE IF NOT EXISTS entries (
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (key, version)
+) WITHOUT ROWID'''
+
+
+class TestSQLiteCache(TempDatabaseTestCase):
+    """
+    Test cases for a cache table in a temporary database.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cache = SQLiteCache('Test', os.path.join('.cache', 'test.sqlite3'), 'entries',
+                                 SCHEMA, ['hits', 'writes'])
+
+    def test_lookup_in_batches(self):
+        """Keys are looked up in batches, among the entries matching the filters."""
+        self.cache.store([(f'key{number}', 'v1', number) for number in range(1200)]
+                         + [('key0', 'v2', -1)])
+        keys = [f'key{number}' for number in range(0, 2000, 2)]
+        rows = self.cache.lookup(['key', 'value'], 'key', keys, version='v1')
+        self.assertEqual(sorted(value for _, value in rows), list(range(0, 1200, 2)))
+        self.assertEqual(self.cache.lookup(['value'], 'key', ['key0'], version='v2'), [(-1,)])
+
+    def test_stats_and_clear(self):
+        """Writes are counted, entries are dropped by filter or all at once."""
+        self.cache.store([('a', 'v1', 1), ('b', 'v1', 2), ('a', 'v2', 3)])
+        self.cache.store([])
+        self.cache.count('hits', 2)
+        self.assertEqual(self.cache.stats(), {'hits': 2, 'writes': 3, 'entries': 3})
+        self.assertEqual(self.cache.clear(version='v1'), 2)
+        self.assertEqual(self.cache.clear(), 1)
+        self.cache.reset_stats()
+        self.assertEqual(self.cache.stats(), {'hits': 0, 'writes': 0, 'entries': 0})
+
+    def test_unavailable_database(self):
+        """A database that cannot be opened is logged, read as empty and not written."""
+        self.patch('backend.stock_data_manager.DEFAULT_DATABASE_PATH',
+                   os.path.join(self.base_path, 'file'))
+        with open(os.path.join(self.base_path, 'file'), 'w', encoding='utf-8'):
+            pass
+        with self.assertLogs('backend.sqlite_cache', 'WARNING') as logs:
+            self.assertEqual(self.cache.lookup(['value'], 'key', ['a']), [])
+            self.cache.store([('a', 'v1', 1)])
+        self.assertIn('Test cache unavailable', logs.output[0])
+        self.assertIn('Test cache not written', logs.output[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
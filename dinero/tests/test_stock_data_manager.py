@@ -11,6 +11,9 @@ Classes:
 import unittest
 from unittest import mock
 import os
+import shutil
+import tempfile
+import threading
 from datetime import datetime
 import pandas as pd
 
@@ -20,6 +23,12 @@ from backend.stock_data_manager import (
     get_stock_data,
     get_filtered_stock_data,
     get_last_n_days,
+    get_stock_data_cache_stats,
+    get_date_index,
+    get_price_store,
+    bulk_download_stock_data,
+    parse_ticker_symbols,
+    invalidate_stock_data_cache,
     DEFAULT_DATABASE_PATH
 )
 
@@ -38,6 +47,14 @@ class TestStockDataManager(unittest.TestCase):
     so it has no explicit testing.
     """
 
+    def setUp(self):
+        """
+        Start every test with an empty get_stock_data cache, and drop anything
+        cached from mocked reads afterwards.
+        """
+        invalidate_stock_data_cache()
+        self.addCleanup(invalidate_stock_data_cache)
+
     @mock.patch('backend.stock_data_manager.yf.download')
     def test_default_download_stock_data(self, mock_download):
         """
@@ -100,6 +117,60 @@ class TestStockDataManager(unittest.TestCase):
             file_path = f'{DEFAULT_DATABASE_PATH}/{ticker}.csv'
             self.assertTrue(os.path.exists(file_path))
 
+    def test_update_stock_data_with_provider(self):
+        """
+        Test incremental update with an injected provider: tickers sharing a
+        missing range are batched, overlapping dates are dropped
+        """
+        base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_path)
+        history = pd.DataFrame({'Close': [1.0, 2.0, 3.0]},
+                               index=pd.DatetimeIndex(['2024-01-02', '2024-01-03',
+                                                       '2024-01-04'], name='Date'))
+        calls = []
+        lock = threading.Lock()
+
+        def fake_provider(ticker_symbols, start=None, end=None, period=None):
+            with lock:
+                calls.append((tuple(ticker_symbols), start, end, period))
+            # overlaps the last stored day and repeats a date
+            dates = pd.DatetimeIndex(['2024-01-04', '2024-01-05', '2024-01-05'], name='Date')
+            return {ticker: pd.DataFrame({'Close': [3.0, 4.0, 4.5]}, index=dates)
+                    for ticker in ticker_symbols}
+
+        with mock.patch('backend.stock_data_manager.DEFAULT_DATABASE_PATH', base_path):
+            store = get_price_store()
+            for ticker in ('AAA', 'BBB', 'CCC'):
+                store.write(ticker, history)
+            tickers = update_stock_data(provider=fake_provider, batch_size=2)
+
+            self.assertCountEqual(tickers, ['AAA', 'BBB', 'CCC'])
+            self.assertEqual(sorted(len(call[0]) for call in calls), [1, 2])
+            self.assertTrue(all(call[1] == '2024-01-05' for call in calls))
+            for ticker in ('AAA', 'BBB', 'CCC'):
+                data = get_stock_data(ticker)
+                self.assertEqual(list(data['Date']), ['2024-01-02', '2024-01-03',
+                                                      '2024-01-04', '2024-01-05'])
+                self.assertEqual(data['Close'].iloc[-1], 4.5)
+
+    def test_update_stock_data_provider_failure(self):
+        """
+        Test a failing provider leaves the stored tables untouched
+        """
+        base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_path)
+        history = pd.DataFrame({'Close': [1.0]},
+                               index=pd.DatetimeIndex(['2024-01-02'], name='Date'))
+
+        def failing_provider(ticker_symbols, start=None, end=None, period=None):
+            raise ConnectionError("provider down")
+
+        with mock.patch('backend.stock_data_manager.DEFAULT_DATABASE_PATH', base_path):
+            get_price_store().write('AAA', history)
+            update_stock_data(provider=failing_provider)
+            self.assertEqual(len(get_stock_data('AAA')), 1)
+            self.assertEqual(os.listdir(base_path), ['AAA.csv'])
+
     @mock.patch("backend.stock_data_manager.pd.read_csv")
     def test_get_stock_data(self, mock_read_csv):
         """
@@ -112,6 +183,40 @@ class TestStockDataManager(unittest.TestCase):
         self.assertIsInstance(data, pd.DataFrame)
         self.assertEqual(len(data), 3)
 
+    @mock.patch("backend.stock_data_manager.pd.read_csv")
+    def test_get_stock_data_cache(self, mock_read_csv):
+        """
+        Test repeated fetches are served from the cache until invalidated
+        (using mock to count file reads)
+        """
+        mock_read_csv.return_value = pd.DataFrame({"Close": [100, 200, 300]})
+        hits_before = get_stock_data_cache_stats()['hits']
+        get_stock_data('MSFT')
+        get_stock_data('msft')
+        self.assertEqual(mock_read_csv.call_count, 1)
+        self.assertEqual(get_stock_data_cache_stats()['hits'], hits_before + 1)
+
+        self.assertEqual(invalidate_stock_data_cache('MSFT'), 1)
+        get_stock_data('MSFT')
+        self.assertEqual(mock_read_csv.call_count, 2)
+
+    def test_get_stock_data_compact(self):
+        """
+        Test compact mode dtypes, dropped 'Adj Close' and memory footprint
+        """
+        full = get_stock_data('MSFT')
+        compact = get_stock_data('MSFT', compact=True)
+        self.assertEqual(list(compact.columns), ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        self.assertEqual(compact['Date'].dtype, 'datetime64[ns]')
+        self.assertEqual(compact['Close'].dtype, 'float32')
+        self.assertEqual(compact['Volume'].dtype, 'uint32')
+        self.assertListEqual(list(compact['Volume']), list(full['Volume']))
+        self.assertLess(compact.memory_usage(deep=True).sum(),
+                        full.memory_usage(deep=True).sum() / 3)
+
+        with_adj = get_stock_data('MSFT', columns=['Adj Close'], compact=True)
+        self.assertEqual(list(with_adj.columns), ['Date', 'Adj Close'])
+
     def test_get_stock_data_invalid_ticker(self):
         """
         Test fetch non-existing stock data from database
@@ -137,6 +242,41 @@ class TestStockDataManager(unittest.TestCase):
         data = get_filtered_stock_data('MSFT', test_date, test_date)
         self.assertIsInstance(data, pd.DataFrame)
 
+    def test_get_filtered_stock_data_range(self):
+        """
+        Test the binary-searched range matches a row-by-row date comparison,
+        both from the cache and from the price store
+        """
+        full_data = get_stock_data('MSFT')
+        dates = pd.to_datetime(full_data['Date'])
+        expected = full_data[(dates >= '2023-01-03') & (dates <= '2023-02-01')]
+
+        cached = get_filtered_stock_data('MSFT', '2023-01-03', '2023-02-01')
+        self.assertTrue(cached.equals(expected))
+        invalidate_stock_data_cache('MSFT')
+        from_store = get_filtered_stock_data('MSFT', '2023-01-03', '2023-02-01')
+        self.assertTrue(from_store.equals(expected))
+        self.assertEqual(len(get_filtered_stock_data('MSFT', '1900-01-01', '1900-01-02')), 0)
+
+    def test_get_filtered_stock_data_warmup_rows(self):
+        """
+        Test warmup_rows adds the stored rows preceding the start date
+        """
+        full_data = get_stock_data('MSFT')
+        data = get_filtered_stock_data('MSFT', '2023-01-03', '2023-02-01', warmup_rows=5)
+        first_row = int((pd.to_datetime(full_data['Date']) < '2023-01-03').sum())
+        self.assertTrue(data.equals(full_data.iloc[first_row - 5:first_row + len(data) - 5]))
+        self.assertTrue(get_filtered_stock_data('MSFT', warmup_rows=10).equals(full_data))
+
+    def test_get_date_index(self):
+        """
+        Test the date index is sorted datetime64 with one entry per stored row
+        """
+        dates = get_date_index('MSFT')
+        self.assertEqual(dates.dtype, 'datetime64[ns]')
+        self.assertEqual(len(dates), len(get_stock_data('MSFT')))
+        self.assertTrue((dates[1:] > dates[:-1]).all())
+
     def test_get_filtered_stock_data_with_invalid_input(self):
         """
         Test fetch filtered stock data from database with invalid input
@@ -170,5 +310,78 @@ class TestStockDataManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             get_last_n_days(test_df,-1)
 
+class TestBulkDownload(unittest.TestCase):
+    """
+    Test cases for importing a universe of tickers:
+        1. parse_ticker_symbols(text)
+        2. bulk_download_stock_data(ticker_symbols, period_str='5y', provider=None)
+    """
+
+    def setUp(self):
+        """
+        Drop anything cached from the temporary databases afterwards.
+        """
+        self.addCleanup(invalidate_stock_data_cache)
+
+    def test_parse_ticker_symbols(self):
+        """
+        Test parsing ticker lists from free text and CSV-like file content
+        """
+        text = "# my universe\nSymbol\naapl, MSFT;nvda\n\n  brk-b aapl"
+        self.assertEqual(parse_ticker_symbols(text), ['AAPL', 'MSFT', 'NVDA', 'BRK-B'])
+
+    def test_parse_ticker_symbols_csv(self):
+        """
+        Test parsing a CSV file: only the first column is read, without its header
+        """
+        text = ('Symbol,Name,Sector\nAAPL,Apple Inc.,Technology\n'
+                '"BRK-B","Berkshire Hathaway, Inc.",Financials\n\n# delisted\naapl,Apple Inc.,\n')
+        self.assertEqual(parse_ticker_symbols(text, csv_format=True), ['AAPL', 'BRK-B'])
+        self.assertEqual(parse_ticker_symbols('Ticker Symbol,Name\nmsft,Microsoft\n',
+                                              csv_format=True), ['MSFT'])
+        self.assertEqual(parse_ticker_symbols('nvda\n^gspc\n', csv_format=True),
+                         ['NVDA', '^GSPC'])
+
+    def test_bulk_download_stock_data(self):
+        """
+        Test bulk import with an injected provider: symbols are chunked into
+        multi-symbol requests and failures are reported per symbol
+        """
+        base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_path)
+        dates = pd.DatetimeIndex(['2024-01-02', '2024-01-03'], name='Date')
+        calls = []
+        lock = threading.Lock()
+
+        def fake_provider(ticker_symbols, period=None, **_):
+            with lock:
+                calls.append((tuple(ticker_symbols), period))
+            if 'BAD' in ticker_symbols:
+                raise ConnectionError("provider down")
+            return {ticker: pd.DataFrame({'Close': [1.0, 2.0]}, index=dates)
+                    for ticker in ticker_symbols if ticker != 'DLST'}
+
+        with mock.patch('backend.stock_data_manager.DEFAULT_DATABASE_PATH', base_path):
+            report = bulk_download_stock_data(['aaa', 'BBB', 'DLST', 'CCC', 'BAD'],
+                                              '1Y', provider=fake_provider, batch_size=2)
+            self.assertEqual(list(report['Ticker']), ['AAA', 'BBB', 'DLST', 'CCC', 'BAD'])
+            self.assertEqual(list(report['Status']),
+                             ['success', 'success', 'failed', 'success', 'failed'])
+            self.assertEqual(list(report['Rows']), [2, 2, 0, 2, 0])
+            self.assertIn('delisted', report['Error'].iloc[2])
+            self.assertEqual(report['Error'].iloc[4], 'provider down')
+            self.assertEqual(len(calls), 3)
+            self.assertTrue(all(period == '1y' for _, period in calls))
+            self.assertCountEqual(get_price_store().list_tickers(), ['AAA', 'BBB', 'CCC'])
+
+    def test_bulk_download_stock_data_invalid_input(self):
+        """
+        Test bulk import with invalid period and symbol types
+        """
+        with self.assertRaises(ValueError):
+            bulk_download_stock_data(['AAA'], '1')
+        with self.assertRaises(TypeError):
+            bulk_download_stock_data(['AAA', 1])
+
 if __name__ == '__main__':
     unittest.main()
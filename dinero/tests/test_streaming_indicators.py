@@ -0,0 +1,112 @@
+"""
+test_streaming_indicators.py
+===========
+
+This module contains unit tests for the streaming_indicators module.
+
+Classes:
+    TestStreamingIndicators: Test cases for the streaming_indicators module.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import backend.technical_indicators as ti
+from backend.stock_data_manager import get_stock_data
+from backend.streaming_indicators import (
+    STREAMING_INDICATORS,
+    StreamingIndicator,
+    StreamingRSI,
+    StreamingSMA,
+    create_streaming_indicator,
+    extend_indicator_series,
+    load_streaming_indicator
+)
+
+BATCH_FUNCTIONS = {'MA': ti.calculate_simple_moving_average, 'RSI': ti.calculate_rsi,
+                   'ROC': ti.calculate_roc, 'BBP': ti.calculate_bollinger_bands_percent}
+
+class TestStreamingIndicators(unittest.TestCase):
+    """
+    Test cases comparing streaming updates with the batch technical indicators.
+    """
+
+    def setUp(self):
+        """
+        Load the price history used by every test.
+        """
+        self.stock_data = get_stock_data('TSLA')
+
+    def test_matches_batch_indicators(self):
+        """
+        Test indicators seeded from a short or long history then updated bar by bar
+        """
+        for name, function in BATCH_FUNCTIONS.items():
+            for length in (2, 14, 50):
+                expected = function(self.stock_data, length)[name]
+                for seed_rows in (5, 300):
+                    indicator = STREAMING_INDICATORS[name].from_history(
+                        self.stock_data.iloc[:seed_rows], length)
+                    result = indicator.update_frame(self.stock_data.iloc[seed_rows:])
+                    np.testing.assert_allclose(result[name], expected.iloc[seed_rows:],
+                                               rtol=1e-9, atol=1e-6)
+
+    def test_save_and_load(self):
+        """
+        Test a saved state continues exactly like the original indicator
+        """
+        indicator = StreamingRSI.from_history(self.stock_data.iloc[:-10], 14)
+        file_path = os.path.join(tempfile.mkdtemp(), 'TSLA_RSI_14.json')
+        indicator.save(file_path)
+        loaded = load_streaming_indicator(file_path)
+        os.remove(file_path)
+
+        self.assertIsInstance(loaded, StreamingRSI)
+        self.assertEqual(loaded.last_date, indicator.last_date)
+        new_rows = self.stock_data.iloc[-10:]
+        np.testing.assert_allclose(loaded.update_frame(new_rows)['RSI'],
+                                   indicator.update_frame(new_rows)['RSI'], rtol=1e-12)
+
+    def test_extend_indicator_series(self):
+        """
+        Test a stored series is extended with the new days only
+        """
+        history = self.stock_data.iloc[:-5]
+        series = ti.calculate_simple_moving_average(history, 20)
+        indicator = StreamingSMA.from_history(history, 20)
+        extended = extend_indicator_series(series, indicator, self.stock_data)
+
+        expected = ti.calculate_simple_moving_average(self.stock_data, 20)
+        self.assertEqual(len(extended), len(self.stock_data))
+        np.testing.assert_allclose(extended['MA'], expected['MA'], rtol=1e-12)
+
+    def test_invalid_updates(self):
+        """
+        Test invalid lengths, indicators and out of order bars
+        """
+        with self.assertRaises(ValueError):
+            StreamingSMA(0)
+        with self.assertRaises(ValueError):
+            create_streaming_indicator('MACD', 10)
+        indicator = create_streaming_indicator('MA', 2)
+        indicator.update(10.0, '2024-01-03')
+        with self.assertRaises(ValueError):
+            indicator.update(11.0, '2024-01-03')
+
+    def test_incomplete_subclass(self):
+        """
+        Test a subclass missing a required method cannot be instantiated
+        """
+        class PushOnly(StreamingIndicator):  # pylint: disable=abstract-method
+            """Indicator without value or state."""
+            def _push(self, close):
+                pass
+
+        with self.assertRaises(TypeError):
+            PushOnly(3)  # pylint: disable=abstract-class-instantiated
+
+if __name__ == '__main__':
+    unittest.main()
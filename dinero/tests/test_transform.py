@@ -42,7 +42,7 @@ class TestStockAnalysis(unittest.TestCase):
         self.assertEqual(result_negative, ['2024-03-02'])
 
     @patch('backend.transform.pd.read_csv')
-    @patch('backend.transform.get_news_articles')
+    @patch('backend.req.get_news_articles')
     def test_get_filter_dates(self, mock_get_news_articles, mock_read_csv):
         """
         Test the get_filter_dates function.
@@ -82,5 +82,42 @@ class TestStockAnalysis(unittest.TestCase):
         expected_result_aapl ={'2024-03-01': []}
         self.assertDictEqual(result_aapl, expected_result_aapl)
 
+    @patch('backend.transform.pd.read_csv')
+    @patch('backend.req.get_news_range')
+    def test_get_filter_dates_range(self, mock_get_news_range, mock_read_csv):
+        """
+        Test the get_filter_dates function in range mode.
+
+        Parameters:
+        - mock_get_news_range (MagicMock): A mock object for get_news_range.
+        - mock_read_csv (MagicMock): A mock object for pd.read_csv.
+
+        Returns:
+        None
+        """
+        mock_get_news_range.return_value = [
+            {'date': '2024-03-01T09:30:00+00:00', 'content': 'Content 1', 'title': 'Title 1',
+             'link': 'Link 1', 'symbols': ['AAPL']},
+            {'date': '2024-03-02T10:00:00+00:00', 'content': 'Content 2', 'title': 'Title 2',
+             'link': 'Link 2', 'symbols': ['AAPL']},
+            {'date': '2024-03-03T11:00:00+00:00', 'content': 'Content 3', 'title': 'Title 3',
+             'link': 'Link 3', 'symbols': ['XYZ']}
+        ]
+        mock_read_csv.return_value = pd.DataFrame({
+            'Date': ['2024-03-01', '2024-03-02', '2024-03-03'],
+            'Open': [100, 110, 120],
+            'Close': [120, 100, 125]
+        })
+
+        result = get_filter_dates('../data/AAPL.csv', 0, 'AAPL', mode='range')
+        self.assertDictEqual(result, {'2024-03-01': [{'content': 'Content 1', 'link': 'Link 1',
+                                                      'title': 'Title 1'}],
+                                      '2024-03-03': []})
+        mock_get_news_range.assert_called_once()
+        self.assertEqual(mock_get_news_range.call_args.args[1:3], ('2024-03-01', '2024-03-03'))
+
+        with self.assertRaises(ValueError):
+            get_filter_dates('../data/AAPL.csv', 0, 'AAPL', mode='weekly')
+
 if __name__ == '__main__':
     unittest.main()
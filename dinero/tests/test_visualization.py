@@ -14,16 +14,27 @@ import plotly.graph_objects as go
 from backend.visualization import (
     plot_stock_price,
     plot_kpis,
+    get_view_start_date,
     TIME_BUTTONS
 )
+from tests.temp_database import TempDatabaseTestCase
 
-class TestVisualization(unittest.TestCase):
+class TestVisualization(TempDatabaseTestCase):
     """
     Test cases for functions in the visualization module:
         1. plot_stock_price(ticker_symbol)
-        2. plot_kpis(stock_fig, ticker_symbol, length, kpi_name)
+        2. plot_kpis(stock_fig, ticker_symbol, length, kpi_name, start_date, end_date)
+        3. get_view_start_date(ticker_symbol, view)
     """
 
+    def setUp(self):
+        """
+        Serve a copy of the MSFT table from a temporary database, where the
+        indicator cache of plot_kpis is written.
+        """
+        super().setUp()
+        self.copy_tickers('MSFT')
+
     def test_plot_stock_price_layout(self):
         """
         Test the layout of the stock price candlestick chart.
@@ -88,5 +99,33 @@ class TestVisualization(unittest.TestCase):
         self.assertEqual(kpi_fig.data[1].type, 'scatter')
         self.assertEqual(kpi_fig.data[1].name, 'ROC')
 
+    def test_plot_kpis_date_range(self):
+        """
+        Test plotting a technical indicator over a date range only.
+
+        Checks the indicator and the close price cover the range, and that
+        overlays zoom the stock price chart on it.
+        """
+        stock_price_fig = plot_stock_price('MSFT')
+        kpi_fig = plot_kpis(stock_price_fig, 'MSFT', 14, 'RSI', '2024-02-01', '2024-02-29')
+        self.assertEqual(len(kpi_fig.data[0].x), 20)
+        self.assertEqual(len(kpi_fig.data[1].x), 20)
+        self.assertEqual(kpi_fig.data[1].x[0], '2024-02-01')
+
+        self.assertIsNone(plot_kpis(stock_price_fig, 'MSFT', 50, 'MA', '2024-02-01'))
+        self.assertEqual(stock_price_fig.data[1].x[0], '2024-02-01')
+        self.assertEqual(stock_price_fig.layout.xaxis.range[0], '2024-02-01')
+
+    def test_get_view_start_date(self):
+        """
+        Test the first dates of the time buttons, counted from the last stored date.
+        """
+        self.assertEqual(get_view_start_date('MSFT', 'All'), '')
+        self.assertEqual(get_view_start_date('MSFT', '1 Month'), '2024-02-05')
+        self.assertEqual(get_view_start_date('MSFT', '3 Year'), '2021-03-05')
+        self.assertEqual(get_view_start_date('MSFT', '1 Year To Date'), '2024-01-01')
+        with self.assertRaises(ValueError):
+            get_view_start_date('MSFT', '2 Weeks')
+
 if __name__ == '__main__':
     unittest.main()